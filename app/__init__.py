@@ -30,16 +30,40 @@ def create_app(test_config=None):
     except OSError:
         pass
     
+    # Pool class and options must be in SQLALCHEMY_ENGINE_OPTIONS before the engine is created
+    from app.utils import pool_telemetry
+    pool_telemetry.configure(app)
+
     db.init_app(app)
     migrate.init_app(app, db)
+
+    from app.utils import sqlite_profile
+    sqlite_profile.init_app(app)
     
     # Import models so Flask-Migrate can detect them
     with app.app_context():
         # training app models
         from app.models import progress  # noqa: F401
     
+    # Load the precompiled content snapshot (if fresh) before the first request
+    from app.content import loader
+    loader.init_app(app)
+
+    from app.utils import page_cache
+    page_cache.init_app(app)
+
+    from app.utils import dimensions, learner_sessions
+    dimensions.init_app(app)
+    learner_sessions.init_app(app)
+
+    from app.utils import event_buffer
+    event_buffer.init_app(app)
+
     # register blueprints
     from app.routes.main import main as main_bp
     app.register_blueprint(main_bp)
+
+    from app.cli import register_cli
+    register_cli(app)
     
     return app
@@ -0,0 +1,255 @@
+# app/cli.py
+"""Flask CLI commands for the C-TRAN AI Learning App."""
+import click
+from flask.cli import AppGroup, with_appcontext
+
+from app.content import loader
+from app.models.queries import EXPORTS
+from app.utils.exports import FORMATS
+
+content_cli = AppGroup("content", help="Course content maintenance commands.")
+queries_cli = AppGroup("queries", help="Database query maintenance commands.")
+sqlite_cli = AppGroup("sqlite", help="SQLite maintenance commands.")
+events_cli = AppGroup("events", help="Progress event rollup and retention commands.")
+archive_cli = AppGroup("archive", help="Cold archive of old quiz attempts and progress events.")
+analytics_cli = AppGroup("analytics", help="Course analytics counter commands.")
+
+
+@content_cli.command("build")
+@click.option("--output", "-o", default=None, help="Snapshot path (defaults to CONTENT_SNAPSHOT_PATH).")
+def build_content_snapshot(output):
+    """Serialize all discovered courses into the content snapshot."""
+    info = loader.build_snapshot(output)
+    click.echo(
+        f"Wrote {info['courses']} courses / {info['modules']} modules "
+        f"({info['bytes']} bytes) to {info['path']}"
+    )
+
+
+@queries_cli.command("check")
+@click.option("--verbose", "-v", is_flag=True, help="Print every plan, not only the failing ones.")
+def check_query_plans(verbose):
+    """EXPLAIN the hot API queries; exit non-zero if any scans a table or sorts.
+
+    Run against a migrated database (`flask db upgrade`) so the plans reflect
+    the indexes production has.
+    """
+    from app import db
+    from app.models.queries import HOT_QUERIES
+    from app.utils.query_plans import check_plans
+
+    with db.engine.connect() as conn:
+        results = check_plans(conn, HOT_QUERIES)
+        conn.rollback()
+    for result in results:
+        click.echo(f"{'ok' if result.ok else 'FAIL':>4}  {result.name}")
+        if verbose or not result.ok:
+            for line in result.plan:
+                click.echo(f"        {line}")
+    failed = [result.name for result in results if not result.ok]
+    if failed:
+        raise click.ClickException(f"{len(failed)} of {len(results)} queries need a full scan or temp sort: "
+                                   + ", ".join(failed))
+    click.echo(f"All {len(results)} query plans use indexes.")
+
+
+@sqlite_cli.command("checkpoint")
+@click.option("--mode", type=click.Choice(["PASSIVE", "FULL", "RESTART", "TRUNCATE"], case_sensitive=False),
+              default="TRUNCATE", show_default=True)
+def sqlite_checkpoint(mode):
+    """Checkpoint the WAL into the database file (e.g. from cron, or before a backup)."""
+    from app.utils.sqlite_profile import get_checkpointer
+
+    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        raise click.ClickException("No WAL checkpointer: the database is not file-backed SQLite in WAL mode")
+    busy, frames, checkpointed = checkpointer.checkpoint(mode)
+    click.echo(f"{mode.upper()} checkpoint: {checkpointed}/{frames} WAL frames copied"
+               f"{' (blocked by active readers/writers)' if busy else ''}; WAL now {checkpointer.wal_bytes()} bytes")
+
+
+@events_cli.command("rollup")
+@click.option("--batch-size", type=int, default=None, help="Events per transaction (defaults to ROLLUP_BATCH_SIZE).")
+def events_rollup(batch_size):
+    """Count new progress events into event_daily_counts (incremental; run from cron)."""
+    from flask import current_app
+
+    from app.utils.rollups import roll_up_events, rolled_up_until
+
+    config = current_app.config
+    counted = roll_up_events(batch_size=batch_size or int(config.get("ROLLUP_BATCH_SIZE", 5000)),
+                             settle_seconds=int(config.get("ROLLUP_SETTLE_SECONDS", 300)))
+    click.echo(f"Counted {counted} events; rolled up to {rolled_up_until()}")
+
+
+@events_cli.command("prune")
+@click.option("--days", type=int, default=None, help="Retention in days (defaults to EVENT_RETENTION_DAYS).")
+@click.option("--batch-size", type=int, default=None, help="Rows per delete (defaults to EVENT_PRUNE_BATCH_SIZE).")
+def events_prune(days, batch_size):
+    """Delete raw progress events past the retention window that the rollup has counted."""
+    from flask import current_app
+
+    from app.utils.rollups import prune_events
+
+    config = current_app.config
+    days = days if days is not None else config.get("EVENT_RETENTION_DAYS")
+    if days is None:
+        raise click.ClickException("No retention set: pass --days or set EVENT_RETENTION_DAYS")
+    if days < 1:
+        raise click.BadParameter("must be at least 1", param_hint="--days")
+    deleted = prune_events(days, batch_size=batch_size or int(config.get("EVENT_PRUNE_BATCH_SIZE", 1000)),
+                           pause=float(config.get("EVENT_PRUNE_PAUSE", 0.05)))
+    click.echo(f"Deleted {deleted} progress events older than {days} days")
+
+
+@archive_cli.command("run")
+@click.option("--days", type=int, default=None, help="Archive days older than this (defaults to ARCHIVE_AFTER_DAYS).")
+@click.option("--before", default=None, help="Archive days before this ISO date instead.")
+@click.option("--dataset", type=click.Choice(["attempts", "events"]), multiple=True,
+              help="Limit to one dataset (repeatable; default both).")
+@click.option("--codec", type=click.Choice(["zstd", "gzip"]), default=None,
+              help="Compression (default zstd if the zstandard package is installed, else gzip).")
+def archive_run(days, before, dataset, codec):
+    """Move whole days of old rows into compressed partitions, then delete them in batches."""
+    from datetime import date, datetime, timedelta
+
+    from flask import current_app
+
+    from app.utils import archive
+
+    config = current_app.config
+    if before is not None:
+        try:
+            cutoff = date.fromisoformat(before)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--before") from None
+    else:
+        days = days if days is not None else config.get("ARCHIVE_AFTER_DAYS")
+        if days is None:
+            raise click.ClickException("No cutoff: pass --days or --before, or set ARCHIVE_AFTER_DAYS")
+        if days < 1:
+            raise click.BadParameter("must be at least 1", param_hint="--days")
+        cutoff = datetime.utcnow().date() - timedelta(days=days)
+    if codec == "zstd" and archive.zstandard is None:
+        raise click.ClickException("zstd needs the zstandard package")
+    archived = archive.archive(
+        archive.archive_dir(), cutoff, datasets=dataset or archive.DATASETS, codec=codec,
+        batch_size=int(config.get("EXPORT_BATCH_SIZE", 5000)),
+        delete_batch_size=int(config.get("EVENT_PRUNE_BATCH_SIZE", 1000)),
+        pause=float(config.get("EVENT_PRUNE_PAUSE", 0.05)),
+    )
+    for name, rows in archived.items():
+        click.echo(f"Archived {rows} {name} rows from before {cutoff}")
+
+
+@archive_cli.command("list")
+def archive_list():
+    """Summarize the archive manifest per dataset."""
+    from app.utils.archive import archive_dir, load_manifest
+
+    partitions = load_manifest(archive_dir())["partitions"]
+    for name in sorted({entry["dataset"] for entry in partitions}):
+        entries = [entry for entry in partitions if entry["dataset"] == name]
+        pending = sum(1 for entry in entries if entry["state"] != "deleted")
+        click.echo(f"{name}: {len(entries)} partitions, {min(e['day'] for e in entries)} .. "
+                   f"{max(e['day'] for e in entries)}, {sum(e['rows'] for e in entries)} rows, "
+                   f"{sum(e['bytes'] for e in entries)} bytes" + (f", {pending} awaiting deletes" if pending else ""))
+
+
+@archive_cli.command("verify")
+def archive_verify():
+    """Check every archived partition's checksum and row count against the manifest."""
+    from app.utils.archive import archive_dir, load_manifest, verify
+
+    problems = verify(archive_dir())
+    for problem in problems:
+        click.echo(problem)
+    if problems:
+        raise click.ClickException(f"{len(problems)} archive partitions failed verification")
+    click.echo(f"{len(load_manifest(archive_dir())['partitions'])} partitions OK")
+
+
+@analytics_cli.command("rebuild")
+@click.option("--check", is_flag=True, help="Only compare the stored counters with a fresh count; exit 1 on any difference.")
+def analytics_rebuild(check):
+    """Recompute the module_stats counters from module_progress, quiz attempts (live and archived) and quiz_states."""
+    from app import db
+    from app.utils import analytics
+    from app.utils.archive import archive_dir
+
+    with db.session.begin():
+        before = analytics.stored_stats()
+    if check:
+        with db.session.begin():
+            after = analytics.compute_stats(archive_dir())
+    else:
+        after = analytics.rebuild(archive_dir())
+    differences = 0
+    for module_key_id in sorted(before.keys() | after.keys()):
+        old, new = before.get(module_key_id, {}), after.get(module_key_id, {})
+        changed = {name: (old.get(name, 0), new.get(name, 0)) for name in old.keys() | new.keys()
+                   if old.get(name, 0) != new.get(name, 0)}
+        if changed:
+            differences += 1
+            click.echo(f"module_key {module_key_id}: " + ", ".join(
+                f"{name} {was} -> {now}" for name, (was, now) in sorted(changed.items())))
+    if check and differences:
+        raise click.ClickException(f"{differences} modules' counters differ from a fresh count")
+    click.echo(f"{len(after)} modules {'checked' if check else 'rebuilt'}, {differences} differed")
+
+
+@click.command("export")
+@click.argument("dataset", type=click.Choice(list(EXPORTS)))
+@click.option("--format", "fmt", type=click.Choice(list(FORMATS)), default="ndjson", show_default=True)
+@click.option("--since", default=None, help="ISO date/datetime, inclusive (UTC unless an offset is given).")
+@click.option("--until", default=None, help="ISO date/datetime, exclusive.")
+@click.option("--course", default=None, help="Only rows for this course slug's modules.")
+@click.option("--output", "-o", default="-", show_default=True, help="File to write; - for stdout.")
+@click.option("--batch-size", type=int, default=None, help="Rows per keyset page (defaults to EXPORT_BATCH_SIZE).")
+@click.option("--archive", "from_archive", is_flag=True, help="Read archived partitions instead of the live table.")
+@with_appcontext
+def export_rows(dataset, fmt, since, until, course, output, batch_size, from_archive):
+    """Stream quiz attempts, progress events or module progress as NDJSON or CSV.
+
+    Reads in short keyset pages, so it is safe to run against a live database.
+    """
+    from flask import current_app
+
+    from app import db
+    from app.utils import exports
+
+    try:
+        since, until = exports.parse_timestamp(since), exports.parse_timestamp(until)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from None
+    count = 0
+
+    def counted(pages):
+        nonlocal count
+        for rows in pages:
+            count += len(rows)
+            yield rows
+
+    if from_archive:
+        from app.utils import archive
+
+        if dataset not in archive.DATASETS:
+            raise click.BadParameter(f"only {', '.join(archive.DATASETS)} are archived", param_hint="DATASET")
+        pages = archive.iter_pages(archive.archive_dir(), dataset, since=since, until=until, course=course)
+    else:
+        pages = exports.iter_pages(db.engine, dataset, since=since, until=until, course=course,
+                                   batch_size=batch_size or int(current_app.config.get("EXPORT_BATCH_SIZE", 5000)))
+    with click.open_file(output, "w", encoding="utf-8") as f:
+        for chunk in exports.encode(counted(pages), dataset, fmt):
+            f.write(chunk)
+    click.echo(f"Exported {count} {dataset} rows", err=True)
+
+
+def register_cli(app):
+    app.cli.add_command(content_cli)
+    app.cli.add_command(queries_cli)
+    app.cli.add_command(sqlite_cli)
+    app.cli.add_command(events_cli)
+    app.cli.add_command(archive_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(export_rows)
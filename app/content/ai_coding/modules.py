@@ -1,34 +1,9 @@
 # app/content/modules2.py
 # Course 3: Coding with AI — updated to focus on Claude Code in VS Code and template-first delivery
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Optional
 
-@dataclass
-class ModuleSection:
-    title: str
-    content: str
-
-@dataclass
-class Module:
-    slug: str
-    title: str
-    summary: str
-    sections: List[ModuleSection]
-    resources: List[Dict[str, str]] = field(default_factory=list)
-    guardrails: List[str] = field(default_factory=list)
-
-@dataclass
-class CourseMeta:
-    slug: str
-    title: str
-    summary: str
-    duration: str
-    level: str
-    hero_image: str
-    thumbnail: str
-    og_image: str
-    tags: List[str] = field(default_factory=list)
+from app.content.types import CourseMeta, Module, ModuleSection
 
 
 def get_modules() -> List[Module]:
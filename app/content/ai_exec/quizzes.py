@@ -1,15 +1,8 @@
 # app/content/quizzes.py
 # Quiz content stored in code for easy editing. Anonymous attempts stored in DB.
-from dataclasses import dataclass
 from typing import Dict, List, Optional
 
-@dataclass
-class QuizQuestion:
-    id: str
-    prompt: str
-    options: Dict[str, str]  # key -> label (e.g., 'a' -> 'Answer text')
-    correct: str             # key of the correct option
-    help: Optional[str] = None
+from app.content.types import QuizQuestion
 
 # Map module slug -> list of QuizQuestion
 QUIZZES: Dict[str, List[QuizQuestion]] = {
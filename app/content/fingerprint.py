@@ -0,0 +1,51 @@
+# app/content/fingerprint.py
+"""
+Content fingerprints used as HTTP validators (ETag / Last-Modified).
+
+A fingerprint is a sha256 over a canonical JSON encoding of the loaded content
+objects, so it only changes when what a page renders from changes.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+
+def _canonical(obj: Any) -> Any:
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: _canonical(getattr(obj, f.name)) for f in dataclasses.fields(obj)}
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if hasattr(obj, "__dict__"):
+        return {k: _canonical(v) for k, v in vars(obj).items()}
+    return repr(obj)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Return a stable hex digest for any mix of content objects and plain values."""
+    encoded = json.dumps([_canonical(p) for p in parts], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def source_mtime(source: str) -> Optional[float]:
+    """Latest mtime of the source files of the course behind 'app.content.<course>.modules'."""
+    from app import content
+    from app.content.snapshot import iter_source_files
+
+    name = source.rsplit(".", 2)[-2] if source.count(".") >= 2 else ""
+    pkg_dir = os.path.join(os.path.dirname(content.__file__), name)
+    latest = None
+    try:
+        for fname in iter_source_files(pkg_dir):
+            mtime = os.stat(os.path.join(pkg_dir, fname)).st_mtime
+            latest = mtime if latest is None else max(latest, mtime)
+    except OSError:
+        return None
+    return latest
@@ -7,19 +7,134 @@ Discovers any course package under app.content that exposes:
 - modules.py with get_modules() -> list of Module-like objects
 - quizzes.py (optional) with QUIZZES mapping
 
-Returns simple Python dicts so we don't depend on identical dataclass types
-across course files.
+or any directory with a course.yaml, modules/*.md and an optional
+quizzes.yaml (see app.content.markdown_course), compiled to the same types.
+
+Returns simple Python dicts holding the shared content types from
+app.content.types; objects from course packages that still define their own
+dataclasses are coerced to those types on load.
+
+Discovery is metadata-only (get_course_meta()); a course's modules and
+quizzes are loaded the first time that course is requested and kept in a
+bounded LRU, so resident memory follows the hot courses rather than the whole
+catalog.
+
+When a content snapshot (see app.content.snapshot) has been built with
+`flask content build`, it is read at boot instead of importing every course;
+live discovery is only used when the snapshot is missing or stale.
+
+With preload() (used by gunicorn.conf.py under preload_app), every course is
+loaded once in the master process and LRU bookkeeping stops, so forked workers
+share the content pages copy-on-write instead of each building a copy.
+
+With CONTENT_WATCH enabled, course packages are polled for edits (see
+app.content.watcher) and only the changed course is re-imported and swapped
+into the catalog, so editors see updates without a worker restart.
 """
 from __future__ import annotations
 
 import importlib
-import pkgutil
-from typing import Any, Dict, List, Optional
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.content import markdown_course, snapshot
+from app.content.fingerprint import fingerprint, source_mtime
+from app.content.types import CourseMeta, Module, QuizQuestion, coerce
+from app.content.watcher import SourceWatcher
 
 PACKAGE = "app.content"
+# Pseudo module path suffix marking file-based (Markdown/YAML) courses in entry["source"]
+FILE_SOURCE_SUFFIX = ".course"
+
+logger = logging.getLogger(__name__)
 
-# In-memory cache to avoid re-importing on every request
+# Metadata-only discovery results (slug, meta, source); no module bodies
 _DISCOVERY_CACHE: Optional[List[Dict[str, Any]]] = None
+_CATALOG: Dict[str, Dict[str, Any]] = {}
+# (fingerprint, last_modified) over all course metadata; validators for the landing page
+_CATALOG_VERSION: Tuple[str, Optional[float]] = ("", None)
+
+# Fully loaded courses, most recently used last
+_COURSE_CACHE: "OrderedDict[str, LoadedCourse]" = OrderedDict()
+_COURSE_CACHE_SIZE = 16
+_COURSE_CACHE_LOCK = threading.Lock()
+# Set by preload(): every course is resident, so no eviction or LRU reordering
+_PRELOADED = False
+
+# Where `flask content build` writes the snapshot; set from config in init_app()
+_SNAPSHOT_PATH: Optional[str] = None
+
+# Compiled Markdown/YAML course files, keyed by file hash; directory set in init_app()
+_COMPILE_CACHE = markdown_course.CompileCache()
+
+# Hot reload: poll interval in seconds, or None when watching is disabled
+_WATCHER = SourceWatcher(PACKAGE)
+_WATCH_INTERVAL: Optional[float] = None
+_LAST_POLL = 0.0
+_RELOAD_LOCK = threading.Lock()
+
+# Callbacks notified when content changes: fn(slugs) with a set of course
+# slugs, or None when the whole catalog was replaced
+_CHANGE_LISTENERS: List[Callable[[Optional[Set[str]]], None]] = []
+
+
+class ModuleEntry(NamedTuple):
+    """A module with its position and neighbours inside its course.
+
+    `fingerprint` covers everything the module page renders from: the course
+    meta, the module, its next module and its questions.
+    """
+    module: Any
+    position: int
+    prev_module: Optional[Any]
+    next_module: Optional[Any]
+    fingerprint: str
+
+
+class LoadedCourse:
+    """A course with its module bodies and quizzes, plus constant-time lookups.
+
+      - course: dict with slug, meta, modules, quizzes, source (what templates get),
+        plus fingerprint/last_modified validators for the course page
+      - modules: module_slug -> ModuleEntry
+      - questions: (module_slug, question_id) -> question
+    """
+
+    __slots__ = ("course", "modules", "questions")
+
+    def __init__(self, course: Dict[str, Any]):
+        meta = course.get("meta")
+        modules = course.get("modules") or []
+        quizzes = course.get("quizzes") or {}
+        course.setdefault("fingerprint", fingerprint(course.get("slug"), meta, modules, quizzes))
+        course.setdefault("last_modified", source_mtime(str(course.get("source", ""))))
+        self.course = course
+        self.modules: Dict[str, ModuleEntry] = {}
+        self.questions: Dict[Tuple[str, str], Any] = {}
+        for i, m in enumerate(modules):
+            module_slug = _safe_get_attr(m, "slug")
+            # First module wins on duplicate slugs, matching the old linear scan
+            if module_slug in self.modules:
+                continue
+            next_module = modules[i + 1] if i + 1 < len(modules) else None
+            self.modules[module_slug] = ModuleEntry(
+                module=m,
+                position=i,
+                prev_module=modules[i - 1] if i > 0 else None,
+                next_module=next_module,
+                fingerprint=fingerprint(
+                    course.get("slug"), meta, m,
+                    _safe_get_attr(next_module, "slug"), quizzes.get(module_slug),
+                ),
+            )
+        for module_slug, questions in (course.get("quizzes") or {}).items():
+            for q in questions:
+                self.questions.setdefault((module_slug, _safe_get_attr(q, "id")), q)
 
 
 def _is_course_module(mod: Any) -> bool:
@@ -33,6 +148,288 @@ def _safe_get_attr(obj: Any, attr: str, default: Any = None) -> Any:
         return default
 
 
+def init_app(app) -> None:
+    """Configure the snapshot path, cache size and watcher; load the snapshot at boot if fresh."""
+    global _SNAPSHOT_PATH, _COURSE_CACHE_SIZE, _WATCH_INTERVAL
+    _SNAPSHOT_PATH = app.config.get("CONTENT_SNAPSHOT_PATH") or os.path.join(
+        app.instance_path, "content.snapshot"
+    )
+    _COURSE_CACHE_SIZE = max(1, int(app.config.get("CONTENT_COURSE_CACHE_SIZE", _COURSE_CACHE_SIZE)))
+    _COMPILE_CACHE.directory = app.config.get("CONTENT_COMPILE_CACHE_DIR") or os.path.join(
+        app.instance_path, "content_cache"
+    )
+    if app.config.get("CONTENT_WATCH", False):
+        _WATCH_INTERVAL = float(app.config.get("CONTENT_WATCH_INTERVAL", 2.0))
+        app.before_request(maybe_reload)
+    if app.config.get("CONTENT_SNAPSHOT_ENABLED", True):
+        load_snapshot()
+
+
+def load_snapshot() -> bool:
+    """Populate the discovery cache from the snapshot's metadata table.
+
+    Course bodies stay on disk until requested and are read from a mapping of
+    the file the table came from, so rebuilding the snapshot under a running
+    worker doesn't break its lazy loads. Returns False (leaving the
+    cache untouched) when there is no snapshot or it was built from different
+    sources than the ones on disk.
+    """
+    if not _SNAPSHOT_PATH:
+        return False
+    entries = snapshot.read_snapshot_table(_SNAPSHOT_PATH, digest=snapshot.source_digest(PACKAGE))
+    if entries is None:
+        return False
+    _install(entries)
+    return True
+
+
+def build_snapshot(path: Optional[str] = None) -> Dict[str, Any]:
+    """Run live discovery, load every course and write the result to the snapshot file.
+
+    Compile cache entries that no course used in this build are pruned.
+    """
+    path = path or _SNAPSHOT_PATH
+    if not path:
+        raise RuntimeError("No snapshot path configured; call init_app() or pass a path")
+    courses = [_load_live_course(entry) for entry in _discover_live()]
+    size = snapshot.write_snapshot(path, courses, snapshot.source_digest(PACKAGE))
+    _COMPILE_CACHE.prune()
+    return {
+        "path": path,
+        "bytes": size,
+        "courses": len(courses),
+        "modules": sum(len(c.get("modules") or []) for c in courses),
+    }
+
+
+def preload() -> int:
+    """Load every course into the cache and pin it there. Returns the number of courses.
+
+    Meant to run once in a pre-fork master (see gunicorn.conf.py). While
+    preloaded, lookups don't reorder or evict the cache, so serving a page
+    doesn't write to the shared dict. A full catalog replacement (_install)
+    ends preload mode; hot reloads of single courses keep it.
+    """
+    global _PRELOADED
+    if _DISCOVERY_CACHE is None:
+        discover_courses()
+    catalog = _CATALOG
+    loaded = {slug: _load_course(slug, cache=False) for slug in catalog}
+    with _COURSE_CACHE_LOCK:
+        if _CATALOG is not catalog:
+            return 0
+        _COURSE_CACHE.clear()
+        for slug, course in loaded.items():
+            if course is not None:
+                _COURSE_CACHE[slug] = course
+        _PRELOADED = True
+    return len(_COURSE_CACHE)
+
+
+def add_change_listener(fn: Callable[[Optional[Set[str]]], None]) -> None:
+    """Register a callback for catalog changes (e.g. to drop derived caches)."""
+    if fn not in _CHANGE_LISTENERS:
+        _CHANGE_LISTENERS.append(fn)
+
+
+def _notify(slugs: Optional[Set[str]]) -> None:
+    for fn in list(_CHANGE_LISTENERS):
+        try:
+            fn(slugs)
+        except Exception:
+            logger.exception("Content change listener %r failed", fn)
+
+
+def _catalog_version(entries: List[Dict[str, Any]]) -> Tuple[str, Optional[float]]:
+    mtimes = [m for m in (source_mtime(str(e.get("source", ""))) for e in entries) if m is not None]
+    return (
+        fingerprint([(e.get("slug"), e.get("meta")) for e in entries]),
+        max(mtimes) if mtimes else None,
+    )
+
+
+def _install(entries: List[Dict[str, Any]]) -> None:
+    """Publish a new catalog version and drop any courses loaded from the old one."""
+    global _DISCOVERY_CACHE, _CATALOG, _CATALOG_VERSION, _PRELOADED
+    catalog: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        # First discovered course wins on duplicate slugs
+        catalog.setdefault(str(entry.get("slug")), entry)
+    version = _catalog_version(entries)
+    with _COURSE_CACHE_LOCK:
+        _CATALOG = catalog
+        _CATALOG_VERSION = version
+        _DISCOVERY_CACHE = entries
+        _COURSE_CACHE.clear()
+        _PRELOADED = False
+    if _WATCH_INTERVAL is not None:
+        _WATCHER.reset()
+    _notify(None)
+
+
+def _import_fresh(mod_path: str, reload: bool):
+    """Import a module, re-executing it from source if it was already imported and `reload` is set."""
+    if reload and mod_path in sys.modules:
+        return importlib.reload(sys.modules[mod_path])
+    return importlib.import_module(mod_path)
+
+
+def _discover_package(name: str, reload: bool = False) -> Optional[Dict[str, Any]]:
+    """Return the metadata entry for one course package, or None if it is not a course.
+
+    With `reload`, the package's modules.py and quizzes.py are re-executed so
+    edits on disk are picked up; import errors are raised to the caller.
+    File-based courses are always read from disk (through the compile cache).
+    """
+    course_dir = _package_dir(name)
+    if markdown_course.is_course_dir(course_dir):
+        meta = markdown_course.read_course_meta(course_dir, _COMPILE_CACHE)
+        return {
+            "slug": _safe_get_attr(meta, "slug", name),
+            "meta": meta,
+            "source": f"{PACKAGE}.{name}{FILE_SOURCE_SUFFIX}",
+        }
+
+    mod_path = f"{PACKAGE}.{name}.modules"
+    mod = _import_fresh(mod_path, reload)
+    if reload:
+        qpath = _quizzes_module_path_from_source(mod_path)
+        if qpath in sys.modules:
+            _import_fresh(qpath, reload)
+    if not _is_course_module(mod):
+        return None
+    meta = coerce(CourseMeta, mod.get_course_meta())
+    return {
+        "slug": _safe_get_attr(meta, "slug", name),
+        "meta": meta,
+        "source": mod_path,
+    }
+
+
+def _package_name(entry: Dict[str, Any]) -> str:
+    # 'app.content.<name>.modules' (or '.course') -> '<name>'
+    return str(entry.get("source", "")).rsplit(".", 2)[-2]
+
+
+def _package_dir(name: str) -> str:
+    pkg = importlib.import_module(PACKAGE)
+    return os.path.join(list(pkg.__path__)[0], name)
+
+
+def _discover_live(reload: bool = False) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+
+    importlib.invalidate_caches()
+    for course_dir in snapshot.course_package_dirs(PACKAGE):
+        name = os.path.basename(course_dir)
+        try:
+            entry = _discover_package(name, reload=reload)
+        except Exception:
+            # Skip folders without a modules.py, with import errors, or whose accessors raise
+            continue
+        if entry is not None:
+            results.append(entry)
+    return results
+
+
+def maybe_reload() -> None:
+    """Throttled reload_changed(); registered as a before_request hook when watching."""
+    global _LAST_POLL
+    if _WATCH_INTERVAL is None or _DISCOVERY_CACHE is None:
+        return
+    now = time.monotonic()
+    if now - _LAST_POLL < _WATCH_INTERVAL:
+        return
+    # Only one request per worker pays for the poll; the others keep serving
+    if not _RELOAD_LOCK.acquire(blocking=False):
+        return
+    try:
+        _LAST_POLL = now
+        reload_changed()
+    finally:
+        _RELOAD_LOCK.release()
+
+
+def reload_changed() -> List[str]:
+    """Re-import course packages whose sources changed and swap them into the catalog.
+
+    Only the affected courses are rebuilt. Each replacement is fully built
+    before being published, so in-flight requests keep the old course objects
+    and never see a half-built catalog. A package that fails to import or
+    compile keeps serving its previous version and is retried on the next
+    poll. Returns the slugs that were swapped.
+    """
+    changes = _WATCHER.poll()
+    if not changes:
+        return []
+
+    importlib.invalidate_caches()
+    with _COURSE_CACHE_LOCK:
+        hot = set(_COURSE_CACHE)
+    updates: Dict[str, Optional[Dict[str, Any]]] = {name: None for name in changes.removed}
+    # Build every changed course before publishing anything, so a broken edit fails here
+    # rather than on a later request; only replacements for loaded courses are kept
+    prepared: Dict[str, LoadedCourse] = {}
+    failed: Set[str] = set()
+    for name in sorted(changes.changed | changes.added):
+        try:
+            entry = _discover_package(name, reload=True)
+            loaded = LoadedCourse(_load_live_course(entry)) if entry is not None else None
+        except Exception:
+            logger.exception("Content reload failed for package %s; keeping previous version", name)
+            failed.add(name)
+            continue
+        updates[name] = entry
+        if loaded is not None and str(entry["slug"]) in hot:
+            prepared[str(entry["slug"])] = loaded
+    if failed:
+        _WATCHER.forget(failed)
+    if not updates:
+        return []
+
+    _notify(_swap_packages(updates, prepared))
+    swapped = sorted(str(e["slug"]) for e in updates.values() if e is not None)
+    logger.info("Reloaded course content: %s", ", ".join(sorted(updates)))
+    return swapped
+
+
+def _swap_packages(updates: Dict[str, Optional[Dict[str, Any]]], prepared: Dict[str, "LoadedCourse"]) -> Set[str]:
+    """Replace (or drop, when mapped to None) the entries of the given packages in one step.
+
+    Returns the slugs whose content changed (old and new slugs of the packages).
+    """
+    global _DISCOVERY_CACHE, _CATALOG, _CATALOG_VERSION
+    with _COURSE_CACHE_LOCK:
+        entries: List[Dict[str, Any]] = []
+        stale_slugs = set()
+        seen = set()
+        for entry in _DISCOVERY_CACHE or []:
+            name = _package_name(entry)
+            if name in updates:
+                seen.add(name)
+                stale_slugs.add(str(entry["slug"]))
+                if updates[name] is not None:
+                    entries.append(updates[name])
+            else:
+                entries.append(entry)
+        for name, entry in updates.items():
+            if name not in seen and entry is not None:
+                entries.append(entry)
+
+        catalog: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            catalog.setdefault(str(entry.get("slug")), entry)
+        for slug in stale_slugs | set(prepared):
+            _COURSE_CACHE.pop(slug, None)
+        for slug, loaded in prepared.items():
+            if slug in catalog:
+                _COURSE_CACHE[slug] = loaded
+        _CATALOG = catalog
+        _CATALOG_VERSION = _catalog_version(entries)
+        _DISCOVERY_CACHE = entries
+    return stale_slugs | {str(e["slug"]) for e in updates.values() if e is not None}
+
+
 def discover_courses(force_reload: bool = False) -> List[Dict[str, Any]]:
     """Discover courses under app.content using a package-per-course layout.
 
@@ -42,55 +439,126 @@ def discover_courses(force_reload: bool = False) -> List[Dict[str, Any]]:
         modules.py  -> defines get_course_meta(), get_modules()
         quizzes.py  -> defines QUIZZES (optional)
 
+    or the file-based layout described in app.content.markdown_course.
+
+    This is the cheap metadata pass: only get_course_meta() is called. Use
+    get_course_by_slug() for a course's modules and quizzes.
+
     Returns a list of dicts with keys:
       - slug: str
       - meta: Any (object returned by get_course_meta())
-      - modules: list[Any] (objects returned by get_modules())
-      - source: str (python module path to the course modules, e.g., app.content.ai_intro.modules)
+      - source: str (python module path to the course modules, e.g., app.content.ai_intro.modules,
+        or app.content.<course>.course for file-based courses)
     """
-    global _DISCOVERY_CACHE
     if _DISCOVERY_CACHE is not None and not force_reload:
         return _DISCOVERY_CACHE
 
-    results: List[Dict[str, Any]] = []
+    results = _discover_live(reload=force_reload)
+    _install(results)
+    return results
 
-    pkg = importlib.import_module(PACKAGE)
-    for _, name, ispkg in pkgutil.iter_modules(pkg.__path__):
-        # Only consider packages as courses
-        if not ispkg:
-            continue
-        mod_path = f"{PACKAGE}.{name}.modules"
-        try:
-            mod = importlib.import_module(mod_path)
-        except Exception:
-            # Skip folders without a modules.py or with import errors
-            continue
-        if not _is_course_module(mod):
-            continue
-        try:
-            meta = mod.get_course_meta()
-            modules = mod.get_modules()
-            slug = _safe_get_attr(meta, "slug", name)
-            results.append({
-                "slug": slug,
-                "meta": meta,
-                "modules": modules,
-                "source": mod_path,
-            })
-        except Exception:
-            # Skip courses that raise during accessors
-            continue
 
-    _DISCOVERY_CACHE = results
-    return results
+def _load_live_course(entry: Dict[str, Any]) -> Dict[str, Any]:
+    if entry["source"].endswith(FILE_SOURCE_SUFFIX):
+        modules, quizzes = markdown_course.read_course_body(_package_dir(_package_name(entry)), _COMPILE_CACHE)
+        return {
+            "slug": entry["slug"],
+            "meta": entry["meta"],
+            "modules": modules,
+            "quizzes": quizzes,
+            "source": entry["source"],
+        }
+
+    mod = importlib.import_module(entry["source"])
+    try:
+        modules = [coerce(Module, m) for m in mod.get_modules()]
+    except Exception:
+        modules = []
+    return {
+        "slug": entry["slug"],
+        "meta": entry["meta"],
+        "modules": modules,
+        "quizzes": _load_quizzes(entry["source"]),
+        "source": entry["source"],
+    }
+
+
+def _load_quizzes(source: str) -> Dict[str, Any]:
+    qpath = _quizzes_module_path_from_source(source)
+    if not qpath:
+        return {}
+    try:
+        qmod = importlib.import_module(qpath)
+    except Exception:
+        return {}
+    quizzes = getattr(qmod, "QUIZZES", {}) or {}
+    return {
+        module_slug: tuple(coerce(QuizQuestion, q) for q in questions)
+        for module_slug, questions in quizzes.items()
+    }
+
+
+def _load_course(slug: str, cache: bool = True) -> Optional[LoadedCourse]:
+    """Return a fully loaded course, loading it into the LRU on first use.
+
+    With cache=False a course that isn't already resident is loaded without
+    being inserted, so bulk passes don't evict the hot courses.
+    """
+    with _COURSE_CACHE_LOCK:
+        loaded = _COURSE_CACHE.get(slug)
+        if loaded is not None:
+            if cache and not _PRELOADED:
+                _COURSE_CACHE.move_to_end(slug)
+            return loaded
+
+    if _DISCOVERY_CACHE is None:
+        discover_courses()
+    catalog = _CATALOG
+    entry = catalog.get(slug)
+    if entry is None:
+        return None
+    if "blob" in entry:
+        body = snapshot.read_course_body(entry["data"], entry["blob"])
+        course = {"slug": entry["slug"], "meta": entry["meta"], "source": entry["source"], **body}
+    else:
+        course = _load_live_course(entry)
+    loaded = LoadedCourse(course)
+    if not cache:
+        return loaded
+
+    with _COURSE_CACHE_LOCK:
+        # Don't cache a course from a catalog version that was replaced meanwhile
+        if _CATALOG is catalog:
+            _COURSE_CACHE[slug] = loaded
+            _COURSE_CACHE.move_to_end(slug)
+            while len(_COURSE_CACHE) > _COURSE_CACHE_SIZE and not _PRELOADED:
+                _COURSE_CACHE.popitem(last=False)
+    return loaded
+
+
+def get_catalog_version() -> Tuple[str, Optional[float]]:
+    """Return (fingerprint, last_modified) of the course listing shown on the landing page."""
+    if _DISCOVERY_CACHE is None:
+        discover_courses()
+    return _CATALOG_VERSION
 
 
 def get_course_by_slug(slug: str) -> Optional[Dict[str, Any]]:
-    """Return a single discovered course by its meta.slug."""
-    for c in discover_courses():
-        if str(c.get("slug")) == slug:
-            return c
-    return None
+    """Return a single course by its meta.slug, with modules and quizzes loaded."""
+    loaded = _load_course(slug)
+    return loaded.course if loaded else None
+
+
+def read_course(slug: str) -> Optional[Dict[str, Any]]:
+    """Like get_course_by_slug() but without promoting the course into the LRU (for indexing)."""
+    loaded = _load_course(slug, cache=False)
+    return loaded.course if loaded else None
+
+
+def get_module_entry(course_slug: str, module_slug: str) -> Optional[ModuleEntry]:
+    """Return a module with its prev/next neighbours within a course, or None."""
+    loaded = _load_course(course_slug)
+    return loaded.modules.get(module_slug) if loaded else None
 
 
 def list_course_summaries() -> List[Dict[str, Any]]:
@@ -163,37 +631,21 @@ def _quizzes_module_path_from_source(source: str) -> Optional[str]:
     return None
 
 
-def import_course_quizzes_module_by_slug(course_slug: str):
-    """Import the quizzes module for a given course slug, or return None if missing."""
+def get_course_quizzes(course_slug: str) -> Dict[str, Tuple[QuizQuestion, ...]]:
+    """Return {module_slug: questions} for a course, or {} if it has no quizzes."""
     course = get_course_by_slug(course_slug)
     if not course:
-        return None
-    qpath = _quizzes_module_path_from_source(course.get("source", ""))
-    if not qpath:
-        return None
-    try:
-        return importlib.import_module(qpath)
-    except Exception:
-        return None
-
-
-def get_course_quizzes(course_slug: str) -> Dict[str, Any]:
-    """Return the QUIZZES dict for a course, or {} if not present."""
-    qmod = import_course_quizzes_module_by_slug(course_slug)
-    if not qmod:
         return {}
-    return getattr(qmod, "QUIZZES", {}) or {}
+    return course.get("quizzes") or {}
 
 
-def get_module_quiz(course_slug: str, module_slug: str) -> List[Any]:
-    """Return the list of questions for a module within a course (raw objects from quizzes.py)."""
+def get_module_quiz(course_slug: str, module_slug: str) -> Tuple[QuizQuestion, ...]:
+    """Return a module's quiz questions as QuizQuestion objects (coerced when the course loads), or ()."""
     quizzes = get_course_quizzes(course_slug)
-    return quizzes.get(module_slug, [])
+    return quizzes.get(module_slug, ())
 
 
 def get_module_question(course_slug: str, module_slug: str, question_id: str) -> Optional[Any]:
     """Return a single question object for a module within a course by id, or None."""
-    for q in get_module_quiz(course_slug, module_slug):
-        if getattr(q, "id", None) == question_id:
-            return q
-    return None
+    loaded = _load_course(course_slug)
+    return loaded.questions.get((module_slug, question_id)) if loaded else None
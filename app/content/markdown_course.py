@@ -0,0 +1,231 @@
+# app/content/markdown_course.py
+"""
+File-based course source: YAML metadata plus one Markdown file per module.
+
+A directory under app/content is a file-based course when it contains
+course.yaml (and no __init__.py is needed):
+
+  app/content/<course>/
+    course.yaml          -> CourseMeta fields (slug, title, summary, ...)
+    modules/*.md         -> one module per file, in filename order
+    quizzes.yaml         -> optional; {module_slug: [question, ...]}
+
+A module file starts with YAML front matter (slug, title, summary, resources,
+guardrails) between `---` lines. Each `## Heading` in the body starts a
+section; the Markdown under it is rendered to the section's HTML, raw HTML is
+passed through. Without a slug in the front matter, the filename is used with
+any numeric ordering prefix dropped (`02-prompting.md` -> `prompting`).
+
+Compiled objects are cached on disk keyed by a hash of the file's bytes, so
+rebuilding a catalog only renders the Markdown files that actually changed.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import markdown
+import yaml
+
+from app.content.types import CourseMeta, Module, ModuleSection, QuizQuestion
+
+COURSE_FILE = "course.yaml"
+QUIZZES_FILE = "quizzes.yaml"
+MODULES_DIR = "modules"
+
+# Bump when the compiled shape changes so old cache entries are ignored
+COMPILER_VERSION = "1"
+
+_MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+_FRONT_MATTER = re.compile(r"\A---[ \t]*\n(.*?)\n---[ \t]*(?:\n|\Z)", re.DOTALL)
+_SECTION_HEADING = re.compile(r"^##[ \t]+(.+?)[ \t#]*$", re.MULTILINE)
+_ORDER_PREFIX = re.compile(r"^\d+[-_.]")
+
+logger = logging.getLogger(__name__)
+
+_RENDERER = threading.local()
+
+
+class CompileCache:
+    """On-disk cache of compiled course files, keyed by a hash of their bytes.
+
+    With no directory, every lookup compiles. Write failures (e.g. a
+    read-only instance folder) are logged and otherwise ignored.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.used: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, kind: str, data: bytes) -> str:
+        h = hashlib.sha256()
+        h.update(f"{COMPILER_VERSION}:{markdown.__version__}:{kind}:".encode())
+        h.update(data)
+        return h.hexdigest()
+
+    def get_or_compile(self, path: str, kind: str, compile_fn: Callable[[str, bytes], Any]) -> Any:
+        """Return compile_fn(path, data) for the file at `path`, from the cache when possible."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if not self.directory:
+            self.misses += 1
+            return compile_fn(path, data)
+
+        key = self._key(kind, data)
+        self.used.add(key)
+        entry = os.path.join(self.directory, f"{key}.pickle")
+        try:
+            with open(entry, "rb") as f:
+                value = pickle.load(f)
+            self.hits += 1
+            return value
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+
+        self.misses += 1
+        value = compile_fn(path, data)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{entry}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except OSError:
+            logger.warning("Could not write content compile cache entry %s", entry, exc_info=True)
+        return value
+
+    def prune(self) -> int:
+        """Delete entries not used since this cache was created. Returns the number removed."""
+        if not self.directory:
+            return 0
+        removed = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+        for fname in names:
+            if fname.endswith(".pickle") and fname[: -len(".pickle")] not in self.used:
+                try:
+                    os.remove(os.path.join(self.directory, fname))
+                    removed += 1
+                except OSError:
+                    continue
+        return removed
+
+
+def is_course_dir(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, COURSE_FILE))
+
+
+def _load_yaml(path: str, data: bytes) -> Any:
+    try:
+        return yaml.safe_load(data) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"{path}: invalid YAML: {e}") from e
+
+
+def _compile_meta(path: str, data: bytes) -> CourseMeta:
+    raw = _load_yaml(path, data)
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: expected a mapping of course fields")
+    try:
+        return CourseMeta(**raw)
+    except TypeError as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+def _render(text: str) -> str:
+    # Building a Markdown instance (extension registration) costs more than
+    # converting a typical section, so one is kept per thread and reset
+    md = getattr(_RENDERER, "md", None)
+    if md is None:
+        md = _RENDERER.md = markdown.Markdown(extensions=_MARKDOWN_EXTENSIONS)
+    return md.reset().convert(text).strip()
+
+
+def split_front_matter(text: str) -> Tuple[Dict[str, Any], str]:
+    """Return (front matter mapping, body) for a Markdown file."""
+    match = _FRONT_MATTER.match(text)
+    if not match:
+        return {}, text
+    front = yaml.safe_load(match.group(1)) or {}
+    if not isinstance(front, dict):
+        raise ValueError("front matter must be a mapping")
+    return front, text[match.end():]
+
+
+def _compile_module(path: str, data: bytes) -> Module:
+    try:
+        front, body = split_front_matter(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError, yaml.YAMLError) as e:
+        raise ValueError(f"{path}: {e}") from e
+
+    headings = list(_SECTION_HEADING.finditer(body))
+    sections: List[ModuleSection] = []
+    # Text before the first heading is kept as an untitled lead-in section
+    lead = body[: headings[0].start() if headings else len(body)].strip()
+    if lead:
+        sections.append(ModuleSection(title="", content=_render(lead)))
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(body)
+        sections.append(ModuleSection(
+            title=heading.group(1).strip(),
+            content=_render(body[heading.end():end].strip()),
+        ))
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    slug = str(front.get("slug") or _ORDER_PREFIX.sub("", stem))
+    try:
+        return Module(
+            slug=slug,
+            title=str(front.get("title") or slug),
+            summary=str(front.get("summary") or ""),
+            sections=sections,
+            resources=front.get("resources") or (),
+            guardrails=front.get("guardrails") or (),
+        )
+    except TypeError as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+def _compile_quizzes(path: str, data: bytes) -> Dict[str, Tuple[QuizQuestion, ...]]:
+    raw = _load_yaml(path, data)
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: expected a mapping of module slug -> questions")
+    try:
+        return {
+            str(module_slug): tuple(QuizQuestion(**q) for q in (questions or []))
+            for module_slug, questions in raw.items()
+        }
+    except TypeError as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+def read_course_meta(course_dir: str, cache: CompileCache) -> CourseMeta:
+    """Return the CourseMeta declared in `course_dir`/course.yaml."""
+    return cache.get_or_compile(os.path.join(course_dir, COURSE_FILE), "meta", _compile_meta)
+
+
+def module_files(course_dir: str) -> List[str]:
+    """Return the course's module files in display order (sorted by filename)."""
+    modules_dir = os.path.join(course_dir, MODULES_DIR)
+    try:
+        names = sorted(n for n in os.listdir(modules_dir) if n.endswith(".md"))
+    except OSError:
+        return []
+    return [os.path.join(modules_dir, n) for n in names]
+
+
+def read_course_body(course_dir: str, cache: CompileCache) -> Tuple[List[Module], Dict[str, Tuple[QuizQuestion, ...]]]:
+    """Compile (or fetch from `cache`) every module and the quizzes of a course."""
+    modules = [cache.get_or_compile(p, "module", _compile_module) for p in module_files(course_dir)]
+    quizzes_path = os.path.join(course_dir, QUIZZES_FILE)
+    quizzes = cache.get_or_compile(quizzes_path, "quizzes", _compile_quizzes) if os.path.isfile(quizzes_path) else {}
+    return modules, quizzes
@@ -0,0 +1,330 @@
+# app/content/search.py
+"""
+In-memory full-text search over course content.
+
+One global inverted index covers, for every course:
+- module titles and summaries
+- section titles and HTML-stripped section bodies
+- quiz prompts from the course's QUIZZES
+
+It is built on first search. When the loader reports that a course changed,
+only that course's documents are removed and re-added, so a hot reload never
+reindexes the catalog.
+
+Ranking is BM25 over weighted term frequencies (titles count more than body
+text). Postings keep the raw frequencies, and each query normalizes them
+against the average document length of the whole index, so scores from
+different courses are comparable and a reindex of one course moves every
+score consistently. Documents containing every query term are found by
+walking the rarest term's postings; single-term queries and partial-match
+fill-ins read pre-sorted impact lists, so query cost does not grow with the
+size of the catalog's most common terms. Snippets are cut around the first
+matching term.
+"""
+from __future__ import annotations
+
+import heapq
+import html
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.content import loader
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how in is it its of on or that the this to was "
+    "what when where which who why will with you your".split()
+)
+
+# Field weights applied to term frequencies
+_TITLE_WEIGHT = 3
+_SUMMARY_WEIGHT = 2
+_BODY_WEIGHT = 1
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+_SNIPPET_RADIUS = 90
+
+
+def strip_html(markup: str) -> str:
+    text = _TAG_RE.sub(" ", markup or "")
+    return _SPACE_RE.sub(" ", html.unescape(text)).strip()
+
+
+def _normalize(token: str) -> str:
+    # Cheap plural folding so "prompt" also finds "prompts"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        _normalize(t) for t in _TOKEN_RE.findall((text or "").lower())
+        if len(t) > 1 and t not in _STOPWORDS
+    ]
+
+
+class SearchDoc(NamedTuple):
+    course_slug: str
+    course_title: str
+    module_slug: str
+    module_title: str
+    kind: str  # "module", "section" or "quiz"
+    section: Optional[str]
+    text: str
+
+
+def _course_docs(course: Dict[str, Any]) -> List[Tuple[SearchDoc, Counter]]:
+    """Return (doc, weighted term frequencies) for every searchable unit of a course."""
+    out: List[Tuple[SearchDoc, Counter]] = []
+    course_slug = str(course.get("slug"))
+    course_title = getattr(course.get("meta"), "title", None) or course_slug
+    quizzes = course.get("quizzes") or {}
+
+    def add(where, kind, section, weighted_fields, text):
+        tf: Counter = Counter()
+        for field_text, weight in weighted_fields:
+            for token in tokenize(field_text):
+                tf[token] += weight
+        if tf:
+            out.append((SearchDoc(*where, kind, section, text), tf))
+
+    for m in course.get("modules") or []:
+        module_slug = getattr(m, "slug", "")
+        module_title = getattr(m, "title", "") or module_slug
+        summary = getattr(m, "summary", "") or ""
+        where = (course_slug, course_title, module_slug, module_title)
+
+        add(where, "module", None, [(module_title, _TITLE_WEIGHT), (summary, _SUMMARY_WEIGHT)], summary)
+        for s in getattr(m, "sections", None) or []:
+            section_title = getattr(s, "title", "") or ""
+            body = strip_html(getattr(s, "content", "") or "")
+            add(where, "section", section_title, [(section_title, _TITLE_WEIGHT), (body, _BODY_WEIGHT)], body)
+        for q in quizzes.get(module_slug) or []:
+            prompt = getattr(q, "prompt", "") or ""
+            add(where, "quiz", None, [(prompt, _BODY_WEIGHT)], prompt)
+    return out
+
+
+def _snippet(text: str, terms: Set[str]) -> str:
+    lowered = text.lower()
+    pos = -1
+    for m in _TOKEN_RE.finditer(lowered):
+        if _normalize(m.group(0)) in terms:
+            pos = m.start()
+            break
+    if pos < 0:
+        pos = 0
+    start = max(0, pos - _SNIPPET_RADIUS)
+    end = min(len(text), pos + _SNIPPET_RADIUS)
+    snippet = text[start:end].strip()
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(text):
+        snippet += "…"
+    return snippet
+
+
+class SearchIndex:
+    """Global inverted index: term -> {doc id: weighted term frequency}."""
+
+    def __init__(self):
+        self._docs: Dict[int, SearchDoc] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        # Weighted document lengths, and their sum for the index-wide average
+        self._lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+        # term -> [(BM25 weight, doc id)] sorted by weight desc; built lazily, dropped when the
+        # average length changes
+        self._impact: Dict[str, List[Tuple[float, int]]] = {}
+        self._course_docs: Dict[str, List[int]] = {}
+        self._course_terms: Dict[str, Set[str]] = {}
+        self._next_id = 0
+        self._dirty: Optional[Set[str]] = None  # None = rebuild everything
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+
+    def invalidate(self, slugs: Optional[Set[str]] = None) -> None:
+        """Loader change listener: mark courses (or everything) for reindexing."""
+        with self._lock:
+            if slugs is None or self._dirty is None:
+                self._dirty = None
+            else:
+                self._dirty |= set(slugs)
+
+    # --- maintenance ---
+
+    def _remove_course(self, slug: str) -> None:
+        doc_ids = self._course_docs.pop(slug, [])
+        for term in self._course_terms.pop(slug, set()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            for doc_id in doc_ids:
+                postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        for doc_id in doc_ids:
+            self._docs.pop(doc_id, None)
+            self._total_length -= self._lengths.pop(doc_id, 0.0)
+        if doc_ids:
+            self._impact.clear()
+
+    def _add_course(self, slug: str, docs: List[Tuple[SearchDoc, Counter]]) -> None:
+        doc_ids: List[int] = []
+        terms: Set[str] = set()
+        for doc, tf in docs:
+            doc_id = self._next_id
+            self._next_id += 1
+            self._docs[doc_id] = doc
+            self._lengths[doc_id] = length = float(sum(tf.values()))
+            self._total_length += length
+            doc_ids.append(doc_id)
+            for term, freq in tf.items():
+                self._postings.setdefault(term, {})[doc_id] = float(freq)
+                terms.add(term)
+        if doc_ids:
+            self._impact.clear()
+        self._course_docs[slug] = doc_ids
+        self._course_terms[slug] = terms
+
+    def _refresh(self) -> None:
+        with self._lock:
+            if self._dirty is not None and not self._dirty:
+                return
+        with self._build_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+            catalog = {str(c.get("slug")) for c in loader.discover_courses()}
+            if dirty is None:
+                remove = set(self._course_docs)
+                targets = catalog
+            else:
+                remove = dirty
+                targets = dirty & catalog
+            # Tokenize outside the lock; only the merge blocks searches
+            built = {}
+            for slug in targets:
+                course = loader.read_course(slug)
+                if course is not None:
+                    built[slug] = _course_docs(course)
+            with self._lock:
+                for slug in remove:
+                    self._remove_course(slug)
+                for slug, docs in built.items():
+                    self._add_course(slug, docs)
+
+    # --- queries ---
+
+    def _length_norm(self) -> Tuple[float, float]:
+        """(c0, c1) such that a document's BM25 length norm is c0 + c1 * its length."""
+        avg_length = (self._total_length / len(self._docs)) if self._docs and self._total_length else 1.0
+        return _K1 * (1 - _B), _K1 * _B / avg_length
+
+    def _weight(self, freq: float, doc_id: int, norm: Tuple[float, float]) -> float:
+        return freq * (_K1 + 1) / (freq + norm[0] + norm[1] * self._lengths[doc_id])
+
+    def _impact_list(self, term: str, norm: Tuple[float, float]) -> List[Tuple[float, int]]:
+        impact = self._impact.get(term)
+        if impact is None:
+            impact = sorted(((self._weight(f, d, norm), d) for d, f in self._postings[term].items()), reverse=True)
+            self._impact[term] = impact
+        return impact
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        self._refresh()
+        with self._lock:
+            hits = self._rank(terms, limit)
+            docs = [(score, self._docs[doc_id]) for score, doc_id in hits]
+
+        term_set = set(terms)
+        return [
+            {
+                "course_slug": doc.course_slug,
+                "course_title": doc.course_title,
+                "module_slug": doc.module_slug,
+                "module_title": doc.module_title,
+                "kind": doc.kind,
+                "section": doc.section,
+                "snippet": _snippet(doc.text, term_set),
+                "score": round(score, 4),
+            }
+            for score, doc in docs
+        ]
+
+    def _rank(self, terms: List[str], limit: int) -> List[Tuple[float, int]]:
+        total_docs = len(self._docs)
+        known = [t for t in terms if t in self._postings]
+        if not known or not total_docs:
+            return []
+        idf = {
+            t: math.log(1 + (total_docs - len(self._postings[t]) + 0.5) / (len(self._postings[t]) + 0.5))
+            for t in known
+        }
+        norm = self._length_norm()
+
+        if len(known) == 1:
+            term = known[0]
+            return [(idf[term] * w, d) for w, d in self._impact_list(term, norm)[:limit]]
+
+        # Docs containing every term: walk the rarest term, probe the others
+        known.sort(key=lambda t: len(self._postings[t]))
+        rarest, others = known[0], [(idf[t], self._postings[t]) for t in known[1:]]
+        rarest_idf = idf[rarest]
+        full: List[Tuple[float, int]] = []
+        for doc_id, freq in self._postings[rarest].items():
+            score = rarest_idf * self._weight(freq, doc_id, norm)
+            for term_idf, postings in others:
+                f = postings.get(doc_id)
+                if f is None:
+                    break
+                score += term_idf * self._weight(f, doc_id, norm)
+            else:
+                full.append((score, doc_id))
+        top = heapq.nlargest(limit, full)
+        if len(top) >= limit:
+            return top
+
+        # Not enough full matches: fill with the strongest partial matches per term
+        seen = {d for _, d in top}
+        partial: Dict[int, float] = {}
+        for term in known:
+            for w, doc_id in self._impact_list(term, norm)[:limit]:
+                if doc_id not in seen:
+                    partial[doc_id] = partial.get(doc_id, 0.0) + idf[term] * w
+        top.extend(heapq.nlargest(limit - len(top), ((s, d) for d, s in partial.items())))
+        return top
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "courses": len(self._course_docs),
+                "docs": len(self._docs),
+                "terms": len(self._postings),
+            }
+
+
+_INDEX = SearchIndex()
+loader.add_change_listener(_INDEX.invalidate)
+
+
+def warm() -> None:
+    """Build the index now instead of on the first query (e.g. in a pre-fork master)."""
+    _INDEX._refresh()
+
+
+def search(query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Ranked hits for `query` across all courses (see SearchIndex.search)."""
+    return _INDEX.search(query, limit)
@@ -0,0 +1,169 @@
+# app/content/snapshot.py
+"""
+Precompiled content snapshot for fast worker startup.
+
+`flask content build` serializes every discovered course (meta, modules and
+QUIZZES) into a single binary file so workers can boot without importing each
+course's modules.py/quizzes.py and rebuilding the dataclasses.
+
+File layout (format 3):
+  MAGIC (8 bytes) | format version (uint16) | source digest (32 bytes) | table length (uint64)
+  table: pickle of [{slug, source, meta, offset, length}, ...]
+  one pickle blob per course with its modules and quizzes
+
+Objects are stored as the shared types from app.content.types, so unpickling
+only imports that module, never the course packages themselves.
+
+Course metadata lives in the table so the landing page can be served without
+touching the bodies; each course blob is read on demand by offset from a
+read-only mapping of the file the table was read from.
+
+The source digest is a sha256 over every course's source files; a
+snapshot whose digest no longer matches the tree on disk is considered stale
+and the loader falls back to live discovery.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.content.markdown_course import COURSE_FILE
+
+MAGIC = b"CTRNSNAP"
+FORMAT_VERSION = 3
+
+_HEADER = struct.Struct(">8sH32sQ")
+
+
+# Files that make up a course: Python packages and file-based (Markdown/YAML) courses
+SOURCE_EXTENSIONS = (".py", ".md", ".yaml", ".yml")
+
+
+def course_package_dirs(package: str) -> List[str]:
+    """Return the directories of all courses under `package`, sorted.
+
+    A course is either a subpackage or a directory with a course.yaml
+    (see app.content.markdown_course).
+    """
+    pkg = importlib.import_module(package)
+    dirs: List[str] = []
+    for base in pkg.__path__:
+        try:
+            names = os.listdir(base)
+        except OSError:
+            continue
+        for name in names:
+            path = os.path.join(base, name)
+            if name.startswith(("_", ".")) or not os.path.isdir(path):
+                continue
+            if os.path.isfile(os.path.join(path, "__init__.py")) or os.path.isfile(os.path.join(path, COURSE_FILE)):
+                dirs.append(path)
+    return sorted(dirs)
+
+
+def iter_source_files(pkg_dir: str) -> List[str]:
+    """Return the source files of one course directory, relative to it and sorted."""
+    files: List[str] = []
+    for root, subdirs, names in os.walk(pkg_dir):
+        subdirs[:] = [d for d in subdirs if not d.startswith(("_", "."))]
+        for fname in names:
+            if fname.endswith(SOURCE_EXTENSIONS):
+                files.append(os.path.relpath(os.path.join(root, fname), pkg_dir))
+    return sorted(files)
+
+
+def source_digest(package: str) -> bytes:
+    """Hash the source files of every course under `package`.
+
+    Content hashes (not mtimes) are used so a fresh checkout of the same tree
+    still matches a snapshot built in the deploy step.
+    """
+    h = hashlib.sha256()
+    for pkg_dir in course_package_dirs(package):
+        for rel in iter_source_files(pkg_dir):
+            path = os.path.join(pkg_dir, rel)
+            h.update(os.path.relpath(path, os.path.dirname(pkg_dir)).encode())
+            with open(path, "rb") as f:
+                h.update(f.read())
+    return h.digest()
+
+
+# --- Read / write ---
+
+def write_snapshot(path: str, courses: List[Dict[str, Any]], digest: bytes) -> int:
+    """Write fully loaded courses to `path` atomically. Returns the file size in bytes."""
+    blobs = [
+        pickle.dumps({"modules": c.get("modules") or [], "quizzes": c.get("quizzes") or {}},
+                     protocol=pickle.HIGHEST_PROTOCOL)
+        for c in courses
+    ]
+    table = []
+    offset = 0
+    for c, blob in zip(courses, blobs):
+        table.append({
+            "slug": c.get("slug"),
+            "source": c.get("source"),
+            "meta": c.get("meta"),
+            "offset": offset,
+            "length": len(blob),
+        })
+        offset += len(blob)
+    table_bytes = pickle.dumps(table, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, digest, len(table_bytes)))
+        f.write(table_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return _HEADER.size + len(table_bytes) + offset
+
+
+def read_snapshot_table(path: str, digest: Optional[bytes] = None) -> Optional[List[Dict[str, Any]]]:
+    """Return the course metadata table of `path`, or None if missing, foreign, or stale.
+
+    Each entry has slug, source, meta, the snapshot mapped read-only as
+    `data`, and a `blob` (absolute offset, length) pair for
+    read_course_body(). The mapping lives as long as an entry refers to it,
+    so course bodies come from the snapshot this table was read from even
+    after `flask content build` replaces the file. When `digest` is given,
+    the snapshot is only accepted if it was built from the same sources.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version, file_digest, table_length = _HEADER.unpack(header)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            if digest is not None and file_digest != digest:
+                return None
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data_start = _HEADER.size + table_length
+        table = pickle.loads(data[_HEADER.size:data_start])
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return None
+    return [
+        {
+            "slug": t["slug"],
+            "source": t["source"],
+            "meta": t["meta"],
+            "data": data,
+            "blob": (data_start + t["offset"], t["length"]),
+        }
+        for t in table
+    ]
+
+
+def read_course_body(data: mmap.mmap, blob: Tuple[int, int]) -> Dict[str, Any]:
+    """Read one course's modules and quizzes from a table entry's `data` (see read_snapshot_table())."""
+    offset, length = blob
+    return pickle.loads(data[offset:offset + length])
@@ -0,0 +1,109 @@
+# app/content/types.py
+"""
+Shared content types for every course package.
+
+All types are frozen and slotted: no per-instance __dict__, and content can be
+shared safely between requests (and between forked workers). Slugs and ids are
+interned. Lists passed in by course files are stored as tuples. Quiz options
+become a tuple of (key, label) pairs. Module resources become Resource
+records instead of per-object dicts.
+
+Course files can keep writing `options={...}` and `resources=[{...}]`;
+__post_init__ normalizes them.
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Tuple
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleSection:
+    title: str
+    content: str
+
+
+@dataclass(frozen=True, slots=True)
+class Resource:
+    label: str
+    url: str
+
+
+@dataclass(frozen=True, slots=True)
+class Module:
+    slug: str
+    title: str
+    summary: str
+    sections: Tuple[ModuleSection, ...]
+    resources: Tuple[Resource, ...] = ()
+    guardrails: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, "slug", _intern(self.slug))
+        object.__setattr__(self, "sections", tuple(
+            s if isinstance(s, ModuleSection) else ModuleSection(s.title, s.content)
+            for s in self.sections
+        ))
+        object.__setattr__(self, "resources", tuple(
+            r if isinstance(r, Resource) else Resource(**r) if isinstance(r, dict) else Resource(r.label, r.url)
+            for r in self.resources
+        ))
+        object.__setattr__(self, "guardrails", tuple(self.guardrails))
+
+
+@dataclass(frozen=True, slots=True)
+class CourseMeta:
+    slug: str
+    title: str
+    summary: str
+    duration: str
+    level: str
+    hero_image: str
+    thumbnail: str
+    og_image: str
+    tags: Tuple[str, ...] = ()
+    order: Optional[float] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "slug", _intern(self.slug))
+        object.__setattr__(self, "tags", tuple(_intern(t) for t in self.tags))
+
+
+@dataclass(frozen=True, slots=True)
+class QuizQuestion:
+    id: str
+    prompt: str
+    options: Tuple[Tuple[str, str], ...]  # (key, label) pairs, e.g. ('a', 'Answer text')
+    correct: str                          # key of the correct option
+    help: Optional[str] = None
+
+    def __post_init__(self):
+        options = self.options.items() if isinstance(self.options, dict) else self.options
+        object.__setattr__(self, "id", _intern(self.id))
+        object.__setattr__(self, "options", tuple((_intern(k), label) for k, label in options))
+        object.__setattr__(self, "correct", _intern(self.correct))
+
+    def options_dict(self) -> Dict[str, str]:
+        return dict(self.options)
+
+
+def coerce(cls, obj: Any):
+    """Return `obj` as an instance of the shared type `cls`.
+
+    Lets the loader accept course packages that still define their own
+    Module/CourseMeta/QuizQuestion classes; unknown attributes are dropped.
+    """
+    if isinstance(obj, cls):
+        return obj
+    kwargs = {}
+    for f in fields(cls):
+        try:
+            kwargs[f.name] = getattr(obj, f.name)
+        except AttributeError:
+            continue
+    return cls(**kwargs)
@@ -0,0 +1,106 @@
+# app/content/watcher.py
+"""
+Change detection for course packages under app.content.
+
+A cheap stat pass (mtime + size of each .py/.md/.yaml source file) runs on
+every poll; a package whose stats moved is only reported as changed if its
+content hash differs too, so touching or re-saving a file without edits does
+not trigger a reload.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+
+from app.content.snapshot import course_package_dirs, iter_source_files
+
+_StatKey = Tuple[Tuple[str, int, int], ...]
+
+
+class PackageState(NamedTuple):
+    stats: _StatKey
+    digest: bytes
+
+
+class SourceChanges(NamedTuple):
+    changed: Set[str]
+    added: Set[str]
+    removed: Set[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.added or self.removed)
+
+
+def _stat_package(pkg_dir: str) -> _StatKey:
+    stats = []
+    for fname in iter_source_files(pkg_dir):
+        try:
+            st = os.stat(os.path.join(pkg_dir, fname))
+        except OSError:
+            continue
+        stats.append((fname, st.st_mtime_ns, st.st_size))
+    return tuple(stats)
+
+
+def _hash_package(pkg_dir: str, stats: _StatKey) -> bytes:
+    h = hashlib.sha256()
+    for fname, _, _ in stats:
+        h.update(fname.encode())
+        try:
+            with open(os.path.join(pkg_dir, fname), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            continue
+    return h.digest()
+
+
+def scan_sources(package: str, previous: Optional[Dict[str, PackageState]] = None) -> Dict[str, PackageState]:
+    """Return package name -> PackageState for every course package.
+
+    Hashes are reused from `previous` for packages whose stats did not move.
+    """
+    previous = previous or {}
+    state: Dict[str, PackageState] = {}
+    for pkg_dir in course_package_dirs(package):
+        name = os.path.basename(pkg_dir)
+        stats = _stat_package(pkg_dir)
+        prev = previous.get(name)
+        if prev is not None and prev.stats == stats:
+            state[name] = prev
+        else:
+            state[name] = PackageState(stats, _hash_package(pkg_dir, stats))
+    return state
+
+
+class SourceWatcher:
+    """Polls course packages and reports which ones changed since the last poll."""
+
+    def __init__(self, package: str):
+        self.package = package
+        self._state: Dict[str, PackageState] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Take the current tree as the baseline (e.g. right after a full load)."""
+        with self._lock:
+            self._state = scan_sources(self.package)
+
+    def forget(self, names: Set[str]) -> None:
+        """Report these packages again on the next poll (e.g. after their reload failed)."""
+        with self._lock:
+            for name in names:
+                if name in self._state:
+                    self._state[name] = PackageState((), b"")
+
+    def poll(self) -> SourceChanges:
+        with self._lock:
+            new_state = scan_sources(self.package, self._state)
+            old_names, new_names = set(self._state), set(new_state)
+            changed = {
+                name for name in old_names & new_names
+                if self._state[name].digest != new_state[name].digest
+            }
+            self._state = new_state
+        return SourceChanges(changed, new_names - old_names, old_names - new_names)
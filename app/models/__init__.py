@@ -2,10 +2,13 @@
 from app import db  # ensures db is available to submodules
 
 # Export training app models
+from .analytics import EventDailyCount, JobWatermark, ModuleStats  # noqa: F401
+from .dimensions import LearnerSession, ModuleKey, PagePath  # noqa: F401
 from .progress import ModuleProgress, ProgressEvent  # noqa: F401
-from .quiz import QuizAttempt  # noqa: F401
+from .quiz import QuizAttempt, QuizState  # noqa: F401
 
 __all__ = [
-    'ModuleProgress', 'ProgressEvent', 'QuizAttempt'
+    'EventDailyCount', 'JobWatermark', 'LearnerSession', 'ModuleKey', 'PagePath', 'ModuleProgress', 'ModuleStats',
+    'ProgressEvent', 'QuizAttempt', 'QuizState'
 ]
 
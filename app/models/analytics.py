@@ -0,0 +1,81 @@
+# app/models/analytics.py
+"""
+Aggregates derived from the raw progress tables, for reports that must not
+scan them.
+"""
+from datetime import datetime
+
+from app import db
+
+
+class EventDailyCount(db.Model):
+    """progress_events counted per UTC day, module key and event type (app/utils/rollups.py).
+
+    module_key_id is NULL for events that carried no module.
+    """
+    __tablename__ = 'event_daily_counts'
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    module_key_id = db.Column(db.Integer, db.ForeignKey('module_keys.id', name='fk_event_daily_counts_module_key'),
+                              nullable=True)
+    event_type = db.Column(db.String(50), nullable=False)
+    count = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('day', 'module_key_id', 'event_type', name='uq_event_daily_count'),
+        # Per-module reports over a date range
+        db.Index('ix_event_daily_module_day', 'module_key_id', 'day'),
+    )
+
+
+class JobWatermark(db.Model):
+    """How far an incremental job has got, as the (time, id) keyset position of the last row it processed."""
+    __tablename__ = 'job_watermarks'
+
+    name = db.Column(db.String(50), primary_key=True)
+    position_at = db.Column(db.DateTime, nullable=True)
+    position_id = db.Column(db.Integer, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class ModuleStats(db.Model):
+    """Per-module funnel counters behind /api/analytics/courses (app/utils/analytics.py).
+
+    The write paths add to them in the same transaction as the rows they
+    count: `started` and `completed` learners from module_progress,
+    `quiz_attempts` and `quiz_correct` answers from quiz_attempts, and
+    `quiz_passed` learners whose solved set first covered the whole quiz.
+    """
+    __tablename__ = 'module_stats'
+
+    COUNTERS = ('started', 'completed', 'quiz_attempts', 'quiz_correct', 'quiz_passed')
+
+    module_key_id = db.Column(db.Integer, db.ForeignKey('module_keys.id', name='fk_module_stats_module_key'),
+                              primary_key=True)
+    started = db.Column(db.Integer, default=0, nullable=False)
+    completed = db.Column(db.Integer, default=0, nullable=False)
+    quiz_attempts = db.Column(db.Integer, default=0, nullable=False)
+    quiz_correct = db.Column(db.Integer, default=0, nullable=False)
+    quiz_passed = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    @staticmethod
+    def add(module_key_id, **deltas):
+        """Add to a module's counters in one upsert; zero deltas are skipped. Does not commit."""
+        from app.utils.db import upsert
+
+        deltas = {name: n for name, n in deltas.items() if n}
+        if not deltas:
+            return
+        upsert(
+            ModuleStats,
+            dict(module_key_id=module_key_id, updated_at=datetime.utcnow(),
+                 **{name: deltas.get(name, 0) for name in ModuleStats.COUNTERS}),
+            ('module_key_id',),
+            lambda excluded: {
+                **{name: getattr(ModuleStats, name) + getattr(excluded, name) for name in deltas},
+                'updated_at': excluded.updated_at,
+            },
+            shape=('add', tuple(deltas)),
+        )
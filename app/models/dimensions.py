@@ -0,0 +1,43 @@
+# app/models/dimensions.py
+"""
+Dimension tables for the strings the progress tables used to repeat.
+
+module_progress, quiz_attempts, quiz_states and progress_events store the
+integer id of a learner session (learner_sessions), of a "course:module"
+key (module_keys) and of a page path (pages) instead of the strings
+themselves. Rows are insert-only and never change, so app/utils/dimensions.py
+and app/utils/learner_sessions.py can cache value -> id per process.
+"""
+from datetime import datetime
+
+from app import db
+
+
+class LearnerSession(db.Model):
+    """An anonymous learner. "<id>" tokens carry the id itself (signed).
+
+    `legacy_id` holds a client key: the random key of a page-signed key token,
+    or the hex id older clients generated themselves. Either is mapped to a
+    row the first time the client calls the API.
+    """
+    __tablename__ = 'learner_sessions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    legacy_id = db.Column(db.String(64), unique=True, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ModuleKey(db.Model):
+    """A course-prefixed module key, "<course_slug>:<module_slug>"."""
+    __tablename__ = 'module_keys'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+
+class PagePath(db.Model):
+    """A page path reported with progress events."""
+    __tablename__ = 'pages'
+
+    id = db.Column(db.Integer, primary_key=True)
+    path = db.Column(db.String(200), unique=True, nullable=False)
@@ -6,22 +6,103 @@ class ModuleProgress(db.Model):
     __tablename__ = 'module_progress'
 
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(db.String(64), index=True, nullable=False)
-    module_slug = db.Column(db.String(100), index=True, nullable=False)
+    learner_id = db.Column(db.Integer, db.ForeignKey('learner_sessions.id', name='fk_module_progress_learner'), nullable=False)
+    module_key_id = db.Column(db.Integer, db.ForeignKey('module_keys.id', name='fk_module_progress_module_key'),
+                              nullable=False)
     completed = db.Column(db.Boolean, default=False, nullable=False)
+    # Progress posts for this row, and the one that first marked it complete (see record())
+    visits = db.Column(db.Integer, default=1, nullable=False)
+    completed_on_visit = db.Column(db.Integer, nullable=True)
     last_accessed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     __table_args__ = (
-        db.UniqueConstraint('session_id', 'module_slug', name='uq_session_module'),
+        db.UniqueConstraint('learner_id', 'module_key_id', name='uq_session_module'),
+        # GET /api/progress reads only these columns, so it never touches the table
+        db.Index('ix_progress_session_state', 'learner_id', 'module_key_id', 'completed', 'last_accessed_at'),
+        # Keyset order for exports (app/models/queries.py export_page), overall and per module
+        db.Index('ix_progress_updated', 'updated_at', 'id'),
+        db.Index('ix_progress_module_updated', 'module_key_id', 'updated_at', 'id'),
     )
 
+    @staticmethod
+    def record(learner_id, module_key_id, completed):
+        """Touch a learner's row for a module, creating it if needed; completion is sticky. Does not commit.
+
+        One INSERT ... ON CONFLICT DO UPDATE ... RETURNING, so concurrent first
+        writes can't trip uq_session_module. RETURNING only shows the row after
+        the write, so the row carries its own history: `visits` counts the
+        posts and `completed_on_visit` keeps the visit that first completed
+        it. Returns (started, newly_completed) for ModuleStats: visit 1 is the
+        insert, and completion is new when it happened on this visit.
+        """
+        from app.utils.db import upsert
+
+        now = datetime.utcnow()
+        visits, completed_on_visit = upsert(
+            ModuleProgress,
+            dict(learner_id=learner_id, module_key_id=module_key_id, completed=completed, visits=1,
+                 completed_on_visit=1 if completed else None, last_accessed_at=now, updated_at=now),
+            ('learner_id', 'module_key_id'),
+            lambda excluded: {
+                # SET expressions all see the row as it was before this statement
+                'completed': db.or_(ModuleProgress.completed, excluded.completed),
+                'visits': ModuleProgress.visits + 1,
+                'completed_on_visit': db.func.coalesce(
+                    ModuleProgress.completed_on_visit,
+                    db.case((excluded.completed, ModuleProgress.visits + 1), else_=None),
+                ),
+                'last_accessed_at': excluded.last_accessed_at,
+                'updated_at': excluded.updated_at,
+            },
+            returning=(ModuleProgress.visits, ModuleProgress.completed_on_visit),
+            shape='record',
+        ).one()
+        return visits == 1, completed_on_visit == visits
+
 class ProgressEvent(db.Model):
     __tablename__ = 'progress_events'
 
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(db.String(64), index=True, nullable=False)
+    learner_id = db.Column(db.Integer, db.ForeignKey('learner_sessions.id', name='fk_progress_events_learner'), nullable=False)
     event_type = db.Column(db.String(50), nullable=False)
-    module_slug = db.Column(db.String(100), nullable=True)
-    page = db.Column(db.String(200), nullable=True)
+    module_key_id = db.Column(db.Integer, db.ForeignKey('module_keys.id', name='fk_progress_events_module_key'),
+                              nullable=True)
+    page_id = db.Column(db.Integer, db.ForeignKey('pages.id', name='fk_progress_events_page'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_event_session_created', 'learner_id', 'created_at'),
+        # Keyset order for exports (app/models/queries.py export_page), overall and per module
+        db.Index('ix_event_created', 'created_at', 'id'),
+        db.Index('ix_event_module_created', 'module_key_id', 'created_at', 'id'),
+    )
+
+    @staticmethod
+    def insert_rows(rows):
+        """Bulk-insert event dicts that carry `session_id` / `module_slug` / `page` strings; does not commit.
+
+        The strings are swapped for their ids first, in the caches' own
+        transactions, so call this before other writes. Rows whose session_id
+        doesn't resolve (a bad token signature) are skipped.
+        """
+        from app.utils.dimensions import module_keys, pages
+        from app.utils.learner_sessions import learner_sessions
+
+        learner_ids = learner_sessions().ids_for(row['session_id'] for row in rows)
+        rows = [row for row in rows if row['session_id'] in learner_ids]
+        if not rows:
+            return
+        key_ids = module_keys().ids_for(row.get('module_slug') for row in rows)
+        page_ids = pages().ids_for(row.get('page') for row in rows)
+        now = datetime.utcnow()
+        db.session.execute(db.insert(ProgressEvent), [
+            {
+                'learner_id': learner_ids[row['session_id']],
+                'event_type': row['event_type'],
+                'module_key_id': key_ids.get(row.get('module_slug')),
+                'page_id': page_ids.get(row.get('page')),
+                'created_at': row.get('created_at') or now,
+            }
+            for row in rows
+        ])
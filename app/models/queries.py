@@ -0,0 +1,139 @@
+# app/models/queries.py
+"""
+Statements behind the per-learner API routes, kept in one place so
+`flask queries check` can EXPLAIN exactly what the routes run.
+
+Each builder returns a SELECT; callers execute it. Modules are identified by
+their module_keys id (app.utils.dimensions) and learners by learner_sessions
+id (app.utils.learner_sessions). HOT_QUERIES maps a name to a
+zero-argument factory with sample parameters, and every entry must be
+answerable from an index (see app/utils/query_plans.py).
+
+export_page() is one page of a bulk export (app/utils/exports.py): rows in
+(time, id) order after a keyset position, read from the (time, id) or
+(module_key_id, time, id) indexes.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, tuple_
+
+from app.models.dimensions import ModuleKey, PagePath
+from app.models.progress import ModuleProgress, ProgressEvent
+from app.models.quiz import QuizAttempt, QuizState
+
+
+def progress_for_session(learner_id):
+    """GET /api/progress: every module row for a session, with its key (ix_progress_session_state)."""
+    return select(
+        ModuleKey.name.label("module_slug"), ModuleProgress.completed, ModuleProgress.last_accessed_at
+    ).join(ModuleKey, ModuleKey.id == ModuleProgress.module_key_id).where(ModuleProgress.learner_id == learner_id)
+
+
+def quiz_solved(learner_id, module_key_id):
+    """quiz_next / batch submit: the solved set, one primary-key lookup."""
+    return select(QuizState.solved).where(QuizState.learner_id == learner_id, QuizState.module_key_id == module_key_id)
+
+
+def module_bootstrap(learner_id, module_key_id):
+    """/api/bootstrap: progress and solved set for one module as one row of scalar subqueries."""
+    progress_filter = (ModuleProgress.learner_id == learner_id, ModuleProgress.module_key_id == module_key_id)
+    return select(
+        select(ModuleProgress.completed).where(*progress_filter).scalar_subquery(),
+        select(ModuleProgress.last_accessed_at).where(*progress_filter).scalar_subquery(),
+        quiz_solved(learner_id, module_key_id).scalar_subquery(),
+    )
+
+
+def correct_question_ids(learner_id, module_key_id):
+    """Question ids answered correctly in quiz_attempts (rebuilding quiz_states); index-only."""
+    return select(QuizAttempt.question_id).distinct().where(
+        QuizAttempt.learner_id == learner_id,
+        QuizAttempt.module_key_id == module_key_id,
+        QuizAttempt.correct.is_(True),
+    )
+
+
+def events_for_session(learner_id, since):
+    """A session's events since `since`, oldest first (ix_event_session_created)."""
+    return select(ProgressEvent).where(
+        ProgressEvent.learner_id == learner_id, ProgressEvent.created_at >= since
+    ).order_by(ProgressEvent.created_at)
+
+
+ExportSpec = namedtuple("ExportSpec", "model stamp columns")
+
+EXPORTS = {
+    "attempts": ExportSpec(QuizAttempt, QuizAttempt.created_at, (
+        QuizAttempt.id, QuizAttempt.learner_id, ModuleKey.name.label("module_slug"), QuizAttempt.question_id,
+        QuizAttempt.selected, QuizAttempt.correct, QuizAttempt.created_at,
+    )),
+    "events": ExportSpec(ProgressEvent, ProgressEvent.created_at, (
+        ProgressEvent.id, ProgressEvent.learner_id, ProgressEvent.event_type, ModuleKey.name.label("module_slug"),
+        PagePath.path.label("page"), ProgressEvent.created_at,
+    )),
+    # Progress rows change in place, so they are exported by when they last changed
+    "progress": ExportSpec(ModuleProgress, ModuleProgress.updated_at, (
+        ModuleProgress.id, ModuleProgress.learner_id, ModuleKey.name.label("module_slug"), ModuleProgress.completed,
+        ModuleProgress.last_accessed_at, ModuleProgress.updated_at,
+    )),
+}
+
+
+def export_page(dataset, after=None, since=None, until=None, module_key_id=None, limit=1000):
+    """Up to `limit` rows of an EXPORTS dataset past the keyset position `after` = (time, id).
+
+    `since` is inclusive and `until` exclusive. With `module_key_id` the
+    page comes from that module's (module_key_id, time, id) index, otherwise
+    from the (time, id) index.
+    """
+    spec = EXPORTS[dataset]
+    model = spec.model
+    stmt = select(*spec.columns).select_from(model).outerjoin(ModuleKey, ModuleKey.id == model.module_key_id)
+    if model is ProgressEvent:
+        stmt = stmt.outerjoin(PagePath, PagePath.id == ProgressEvent.page_id)
+    if module_key_id is not None:
+        stmt = stmt.where(model.module_key_id == module_key_id)
+    if since is not None:
+        stmt = stmt.where(spec.stamp >= since)
+    if until is not None:
+        stmt = stmt.where(spec.stamp < until)
+    if after is not None:
+        stmt = stmt.where(tuple_(spec.stamp, model.id) > tuple_(*after))
+    return stmt.order_by(spec.stamp, model.id).limit(limit)
+
+
+def events_to_roll_up(after, until, limit):
+    """The rollup job's next batch: events past the watermark `after` = (created_at, id) (ix_event_created)."""
+    stmt = select(ProgressEvent.created_at, ProgressEvent.id, ProgressEvent.module_key_id, ProgressEvent.event_type)
+    if after is not None:
+        stmt = stmt.where(tuple_(ProgressEvent.created_at, ProgressEvent.id) > tuple_(*after))
+    return stmt.where(ProgressEvent.created_at < until).order_by(ProgressEvent.created_at, ProgressEvent.id).limit(limit)
+
+
+def events_older_than(cutoff, limit):
+    """Ids of the oldest events before `cutoff`, for one retention batch (ix_event_created, index-only)."""
+    return select(ProgressEvent.id).where(ProgressEvent.created_at < cutoff).order_by(
+        ProgressEvent.created_at, ProgressEvent.id
+    ).limit(limit)
+
+
+_SAMPLE_SESSION = 1
+_SAMPLE_MODULE = 1
+
+HOT_QUERIES = {
+    "progress_for_session": lambda: progress_for_session(_SAMPLE_SESSION),
+    "quiz_solved": lambda: quiz_solved(_SAMPLE_SESSION, _SAMPLE_MODULE),
+    "module_bootstrap": lambda: module_bootstrap(_SAMPLE_SESSION, _SAMPLE_MODULE),
+    "correct_question_ids": lambda: correct_question_ids(_SAMPLE_SESSION, _SAMPLE_MODULE),
+    "events_for_session": lambda: events_for_session(_SAMPLE_SESSION, datetime.utcnow() - timedelta(days=1)),
+    "events_to_roll_up": lambda: events_to_roll_up((datetime.utcnow() - timedelta(days=1), 0), datetime.utcnow(), 1000),
+}
+
+for _dataset in EXPORTS:
+    HOT_QUERIES[f"export_{_dataset}"] = lambda d=_dataset: export_page(
+        d, after=(datetime.utcnow() - timedelta(days=1), 0), until=datetime.utcnow()
+    )
+    HOT_QUERIES[f"export_{_dataset}_by_module"] = lambda d=_dataset: export_page(
+        d, after=(datetime.utcnow() - timedelta(days=1), 0), until=datetime.utcnow(), module_key_id=_SAMPLE_MODULE
+    )
@@ -6,13 +6,79 @@ class QuizAttempt(db.Model):
     __tablename__ = 'quiz_attempts'
 
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(db.String(64), index=True, nullable=False)
-    module_slug = db.Column(db.String(100), index=True, nullable=False)
+    learner_id = db.Column(db.Integer, db.ForeignKey('learner_sessions.id', name='fk_quiz_attempts_learner'), nullable=False)
+    module_key_id = db.Column(db.Integer, db.ForeignKey('module_keys.id', name='fk_quiz_attempts_module_key'),
+                              nullable=False)
     question_id = db.Column(db.String(100), nullable=False)
     selected = db.Column(db.String(10), nullable=False)
     correct = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (
-        db.Index('ix_attempt_session_module', 'session_id', 'module_slug'),
+        # Covers the (session, module, correct) -> question_id lookup; also serves session-only filters
+        db.Index('ix_attempt_session_module_correct', 'learner_id', 'module_key_id', 'correct', 'question_id'),
+        # Keyset order for exports (app/models/queries.py export_page), overall and per module
+        db.Index('ix_attempt_created', 'created_at', 'id'),
+        db.Index('ix_attempt_module_created', 'module_key_id', 'created_at', 'id'),
     )
+
+class QuizState(db.Model):
+    """Question ids a session has answered correctly, per course-prefixed module key (module_keys id).
+
+    Maintained by quiz_submit in the same transaction as the attempt, so
+    quiz_next reads one row by primary key instead of scanning quiz_attempts.
+    `solved` holds the ids wrapped in separators (",q1,q3,") so membership is
+    a LIKE match and adding an id is a string concat, both done in SQL.
+    """
+    __tablename__ = 'quiz_states'
+
+    learner_id = db.Column(db.Integer, db.ForeignKey('learner_sessions.id', name='fk_quiz_states_learner'),
+                           primary_key=True)
+    module_key_id = db.Column(db.Integer, db.ForeignKey('module_keys.id', name='fk_quiz_states_module_key'),
+                              primary_key=True)
+    solved = db.Column(db.Text, default=',', nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    @staticmethod
+    def solved_ids(learner_id, module_key_id):
+        """Return the set of solved question ids (one primary-key lookup)."""
+        from app.models.queries import quiz_solved
+
+        solved = db.session.execute(quiz_solved(learner_id, module_key_id)).scalar()
+        return QuizState.parse_solved(solved)
+
+    @staticmethod
+    def parse_solved(solved):
+        """Turn a `solved` column value (or None for no row) into a set of question ids."""
+        return {qid for qid in (solved or '').split(',') if qid}
+
+    @staticmethod
+    def mark_solved(learner_id, module_key_id, *question_ids):
+        """Add question ids to the solved set atomically (INSERT ... ON CONFLICT); does not commit.
+
+        The ids are appended unless all of them are already present, so retries
+        don't grow the column; a partial overlap may leave a duplicate, which
+        parse_solved() ignores. Returns the new solved set if the row was
+        created or changed, else None.
+        """
+        from app.utils.db import upsert
+
+        ids = list(dict.fromkeys(question_ids))
+        if not ids:
+            return None
+        chunk = ''.join(f'{qid},' for qid in ids)
+        now = datetime.utcnow()
+        solved = upsert(
+            QuizState,
+            dict(learner_id=learner_id, module_key_id=module_key_id, solved=f',{chunk}', updated_at=now),
+            ('learner_id', 'module_key_id'),
+            lambda excluded: {
+                'solved': QuizState.solved + chunk,
+                'updated_at': excluded.updated_at,
+            },
+            where=lambda excluded: db.not_(db.and_(
+                *(QuizState.solved.contains(f',{qid},', autoescape=True) for qid in ids)
+            )),
+            returning=(QuizState.solved,),
+        ).scalar()
+        return QuizState.parse_solved(solved) if solved is not None else None
@@ -1,27 +1,63 @@
 # app/routes/main.py
-from flask import Blueprint, render_template, jsonify, request
+import hmac
+
+from flask import Blueprint, Response, current_app, render_template, jsonify, request, url_for
+from sqlalchemy import insert
 from app import db
 from datetime import datetime
 
 # Legacy flat imports removed; use loader for discovery and quizzes
 from app.content.loader import (
     discover_courses,
+    get_catalog_version,
     get_course_by_slug,
+    get_module_entry,
     list_course_summaries,
     get_module_quiz,
     get_module_question,
 )
+from app.content.search import search as search_content
+from app.models import queries
+from app.models.analytics import ModuleStats
+from app.models.dimensions import ModuleKey, PagePath
 from app.models.progress import ModuleProgress, ProgressEvent
-from app.models.quiz import QuizAttempt
+from app.models.quiz import QuizAttempt, QuizState
+from app.utils.dimensions import module_keys
 from app.utils.errors import json_error_response
+from app.utils import analytics, archive, exports
+from app.utils.event_buffer import get_event_buffer
+from app.utils.learner_sessions import COOKIE_NAME, ensure_session_cookie, learner_sessions, upgrade_session_cookie
+from app.utils.http import content_etag
+from app.utils.page_cache import INDEX_TAG, get_page_cache, render_cached
+from app.utils.pool_telemetry import get_pool_telemetry
+from app.utils.sqlite_profile import get_checkpointer
 
 main = Blueprint("main", __name__)
 
+# HTML pages hand out the signed learner session cookie the API calls use; neither
+# hook touches the database (app/utils/learner_sessions.py)
+_PAGE_ENDPOINTS = {"main.index", "main.course_view", "main.course_module_view"}
+
+@main.after_request
+def _issue_learner_session(response):
+    if request.endpoint in _PAGE_ENDPOINTS and response.status_code in (200, 304):
+        return ensure_session_cookie(response)
+    if request.path.startswith("/api/") and response.status_code < 400 and COOKIE_NAME in request.cookies:
+        return upgrade_session_cookie(response)
+    return response
+
+def _invalid_session():
+    return json_error_response("session_id is not a valid session token or id", 400)
+
 @main.route("/")
 def index():
     # Landing page renders discovered courses
-    courses = list_course_summaries()
-    return render_template("index.html", courses=courses)
+    fp, last_modified = get_catalog_version()
+    return render_cached(
+        content_etag("index", fp), last_modified,
+        lambda: render_template("index.html", courses=list_course_summaries()),
+        tags=(INDEX_TAG,),
+    )
 
 # Removed legacy /module/<slug> route; modules are accessed within a course
 
@@ -30,57 +66,139 @@ def course_view(course_slug: str):
     course = get_course_by_slug(course_slug)
     if not course:
         return json_error_response("Course not found", 404)
-    return render_template("course.html", course=course)
+    return render_cached(
+        content_etag("course", course.get("fingerprint")), course.get("last_modified"),
+        lambda: render_template("course.html", course=course),
+        tags=(course_slug,),
+    )
 
 @main.route("/courses/<course_slug>/modules/<module_slug>")
 def course_module_view(course_slug: str, module_slug: str):
     course = get_course_by_slug(course_slug)
     if not course:
         return json_error_response("Course not found", 404)
-    modules = course.get("modules") or []
-    mod = next((m for m in modules if getattr(m, "slug", None) == module_slug), None)
-    if not mod:
+    entry = get_module_entry(course_slug, module_slug)
+    if not entry:
         return json_error_response("Module not found", 404)
 
-    # Determine next module within this course
-    next_module = None
-    for i, m in enumerate(modules):
-        if getattr(m, "slug", None) == module_slug:
-            if i + 1 < len(modules):
-                next_module = modules[i + 1]
-            break
+    def render():
+        # Pass questions just to decide whether to show the quiz panel
+        return render_template(
+            "module.html",
+            module=entry.module,
+            questions=get_module_quiz(course_slug, module_slug),
+            next_module=entry.next_module,
+            course=course,
+        )
 
-    # Pass questions just to decide whether to show the quiz panel
-    questions = get_module_quiz(course_slug, module_slug)
-    return render_template(
-        "module.html",
-        module=mod,
-        questions=questions,
-        next_module=next_module,
-        course=course,
+    return render_cached(
+        content_etag("module", entry.fingerprint), course.get("last_modified"),
+        render, tags=(course_slug,),
     )
 
+@main.route("/api/search")  # ?q=...&limit=
+def search_api():
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return json_error_response("q required", 400)
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 50)
+
+    hits = search_content(query, limit=limit)
+    for hit in hits:
+        hit["url"] = url_for("main.course_module_view", course_slug=hit["course_slug"], module_slug=hit["module_slug"])
+    return jsonify({"status": "success", "data": hits, "count": len(hits)})
+
 # Health and utility endpoints
 @main.route("/api/health")
 def health_check():
     try:
         db.session.execute(db.text('SELECT 1'))
+        page_cache = get_page_cache()
+        event_buffer = get_event_buffer()
+        checkpointer = get_checkpointer()
+        pool = get_pool_telemetry()
         return jsonify({
             "status": "ok", 
             "timestamp": datetime.utcnow().isoformat(),
-            "database": "connected"
+            "database": "connected",
+            "page_cache": page_cache.stats() if page_cache else None,
+            "event_buffer": event_buffer.stats() if event_buffer else None,
+            "sqlite_wal": checkpointer.stats() if checkpointer else None,
+            "db_pool": pool.stats() if pool else None,
         })
     except Exception as e:
         return json_error_response(f"Health check failed: {str(e)}", 500)
 
+def _check_export_token():
+    """Error response unless the request carries the EXPORT_API_TOKEN bearer token; 404 when no token is set."""
+    token = current_app.config.get("EXPORT_API_TOKEN")
+    if not token:
+        return json_error_response("Not found", 404)
+    if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()):
+        return json_error_response("Export token required", 401)
+    return None
+
+# Bulk export for analytics; disabled unless EXPORT_API_TOKEN is set
+@main.route("/api/export/<dataset>")  # ?format=ndjson|csv&since=&until=&course=&source=live|archive  (Authorization: Bearer <token>)
+def export_data(dataset: str):
+    if dataset not in queries.EXPORTS:
+        return json_error_response("Not found", 404)
+    denied = _check_export_token()
+    if denied:
+        return denied
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in exports.FORMATS:
+        return json_error_response(f"format must be one of {', '.join(exports.FORMATS)}", 400)
+    try:
+        since = exports.parse_timestamp(request.args.get("since"))
+        until = exports.parse_timestamp(request.args.get("until"))
+    except ValueError:
+        return json_error_response("since/until must be ISO 8601 dates or datetimes", 400)
+
+    course = request.args.get("course") or None
+    source = request.args.get("source", "live")
+    if source == "archive":
+        if dataset not in archive.DATASETS:
+            return json_error_response(f"Only {', '.join(archive.DATASETS)} are archived", 400)
+        pages = archive.iter_pages(archive.archive_dir(), dataset, since=since, until=until, course=course)
+    elif source == "live":
+        # The generator outlives the request context, so it gets the engine rather than db.session
+        pages = exports.iter_pages(
+            db.engine, dataset, since=since, until=until, course=course,
+            batch_size=int(current_app.config.get("EXPORT_BATCH_SIZE", 5000)),
+        )
+    else:
+        return json_error_response("source must be live or archive", 400)
+    response = Response(exports.encode(pages, dataset, fmt), mimetype=exports.FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{dataset}.{fmt}"'
+    response.cache_control.no_store = True
+    return response
+
+# Course funnels from the module_stats counters (app/utils/analytics.py); same token as the exports
+@main.route("/api/analytics/courses")  # ?course=<slug>  (Authorization: Bearer <token>)
+def analytics_courses():
+    denied = _check_export_token()
+    if denied:
+        return denied
+    courses = analytics.course_summary()
+    course = request.args.get("course")
+    if course:
+        if course not in courses:
+            return json_error_response("Course not found", 404)
+        courses = {course: courses[course]}
+    return jsonify({"status": "success", "data": courses})
+
 # Anonymous progress APIs
 @main.route("/api/progress", methods=["GET"])  # expects ?session_id=... 
 def get_progress():
     session_id = request.args.get("session_id")
     if not session_id:
         return json_error_response("session_id required", 400)
+    learner_id = learner_sessions().id_for(session_id)
+    if learner_id is None:
+        return _invalid_session()
 
-    rows = ModuleProgress.query.filter_by(session_id=session_id).all()
+    rows = db.session.execute(queries.progress_for_session(learner_id)).all()
     data = {row.module_slug: {"completed": row.completed, "last_accessed_at": row.last_accessed_at.isoformat()} for row in rows}
     return jsonify({"status": "success", "data": data})
 
@@ -93,34 +211,108 @@ def upsert_progress():
 
     if not session_id or not module_key:
         return json_error_response("session_id and module_slug are required", 400)
+    if not module_keys().valid(module_key):
+        return json_error_response("module_slug is too long", 400)
+    learner_id = learner_sessions().id_for(session_id)
+    if learner_id is None:
+        return _invalid_session()
+    module_key_id = module_keys().id_for(module_key)
 
-    row = ModuleProgress.query.filter_by(session_id=session_id, module_slug=module_key).first()
-    if not row:
-        row = ModuleProgress(session_id=session_id, module_slug=module_key)
-        db.session.add(row)
-    row.completed = completed or row.completed
-    row.last_accessed_at = datetime.utcnow()
+    started, newly_completed = ModuleProgress.record(learner_id, module_key_id, completed)
+    ModuleStats.add(module_key_id, started=int(started), completed=int(newly_completed))
     db.session.commit()
 
     return jsonify({"status": "success"})
 
+# Upper bound on events per /api/events request; main.js flushes well below this
+MAX_EVENT_BATCH = 200
+
+def _event_buffer_full():
+    response, status = json_error_response("Event queue is full, retry later", 503)
+    response.headers["Retry-After"] = "1"
+    return response, status
+
+# Column each event field is stored in (module_slug and page via their dimension tables)
+_EVENT_FIELD_COLUMNS = {
+    "event_type": ProgressEvent.__table__.c.event_type,
+    "module_slug": ModuleKey.__table__.c.name,
+    "page": PagePath.__table__.c.path,
+}
+
+def _event_row(item, default_session_id):
+    """Validate one event payload; returns a row dict for ProgressEvent.insert_rows() or None."""
+    if not isinstance(item, dict):
+        return None
+    row = {
+        "session_id": item.get("session_id") or default_session_id,
+        "event_type": item.get("event_type"),
+        "module_slug": item.get("module_slug"),
+        "page": item.get("page"),
+    }
+    if not row["session_id"] or not row["event_type"]:
+        return None
+    # One bad value must not fail the whole multi-row INSERT
+    if not learner_sessions().valid(row["session_id"]):
+        return None
+    for name, column in _EVENT_FIELD_COLUMNS.items():
+        value = row[name]
+        limit = column.type.length
+        if value is not None and (not isinstance(value, str) or len(value) > limit):
+            return None
+    return row
+
 @main.route("/api/event", methods=["POST"])  # JSON: {session_id, event_type, module_slug?, page?}
 def record_event():
     payload = request.get_json(silent=True) or {}
     session_id = payload.get("session_id")
     event_type = payload.get("event_type")
-    module_key = payload.get("module_slug")  # Can be course-prefixed
-    page = payload.get("page")
 
     if not session_id or not event_type:
         return json_error_response("session_id and event_type are required", 400)
+    # module_slug can be course-prefixed; page is the page path
+    row = _event_row(payload, None)
+    if row is None:
+        return json_error_response("invalid session_id or event fields too long", 400)
 
-    evt = ProgressEvent(session_id=session_id, event_type=event_type, module_slug=module_key, page=page)
-    db.session.add(evt)
+    buffer = get_event_buffer()
+    if buffer is not None:
+        if not buffer.submit([row]):
+            return _event_buffer_full()
+        return jsonify({"status": "success"}), 202
+
+    ProgressEvent.insert_rows([row])
     db.session.commit()
 
     return jsonify({"status": "success"})
 
+@main.route("/api/events", methods=["POST"])  # JSON: {session_id?, events: [{session_id?, event_type, module_slug?, page?}, ...]}
+def record_events():
+    # sendBeacon may not set a JSON content type, so parse the body regardless
+    payload = request.get_json(force=True, silent=True)
+    if isinstance(payload, list):
+        payload = {"events": payload}
+    if not isinstance(payload, dict) or not isinstance(payload.get("events"), list):
+        return json_error_response("events array is required", 400)
+
+    events = payload["events"]
+    if len(events) > MAX_EVENT_BATCH:
+        return json_error_response(f"At most {MAX_EVENT_BATCH} events per request", 413)
+
+    rows = [r for r in (_event_row(item, payload.get("session_id")) for item in events) if r is not None]
+    data = {"accepted": len(rows), "rejected": len(events) - len(rows)}
+    buffer = get_event_buffer()
+    if buffer is not None:
+        if rows and not buffer.submit(rows):
+            return _event_buffer_full()
+        return jsonify({"status": "success", "data": data}), 202
+
+    if rows:
+        # Single executemany INSERT and a single commit for the whole batch
+        ProgressEvent.insert_rows(rows)
+        db.session.commit()
+
+    return jsonify({"status": "success", "data": data})
+
 # Quiz APIs (course-scoped)
 @main.route("/api/quiz/<course_slug>/<module_slug>", methods=["GET"])  # rotate one question
 def quiz_next(course_slug: str, module_slug: str):
@@ -130,36 +322,90 @@ def quiz_next(course_slug: str, module_slug: str):
 
     questions = get_module_quiz(course_slug, module_slug)
     if not questions:
-        return jsonify({"status": "success", "data": None, "completed": True, "remaining": 0, "total": 0})
+        return jsonify({"status": "success", **_quiz_payload(questions, set())})
 
-    # Determine which questions have been answered correctly
-    storage_key = f"{course_slug}:{module_slug}"
-    correct_ids = {a.question_id for a in QuizAttempt.query.filter_by(session_id=session_id, module_slug=storage_key, correct=True).all()}
-    remaining = [q for q in questions if getattr(q, 'id', None) not in correct_ids]
+    # Determine which questions have been answered correctly (one row, kept current by quiz_submit)
+    learner_id = learner_sessions().id_for(session_id)
+    if learner_id is None:
+        return _invalid_session()
+    module_key_id = module_keys().id_for(f"{course_slug}:{module_slug}")
+    correct_ids = QuizState.solved_ids(learner_id, module_key_id)
+    return jsonify({"status": "success", **_quiz_payload(questions, correct_ids)})
 
+def _quiz_payload(questions, correct_ids):
+    """The next not-yet-correct question plus quiz progress, as returned by quiz_next."""
+    remaining = [q for q in questions if getattr(q, 'id', None) not in correct_ids]
     if not remaining:
-        # All questions answered correctly
-        return jsonify({
-            "status": "success",
-            "data": None,
-            "completed": True,
-            "remaining": 0,
-            "total": len(questions)
-        })
+        # All questions answered correctly (or the module has no quiz)
+        return {"data": None, "completed": True, "remaining": 0, "total": len(questions)}
 
     # Next question to attempt (first remaining not-yet-correct)
     q = remaining[0]
-    return jsonify({
-        "status": "success",
+    return {
         "data": {
             "id": q.id,
             "prompt": q.prompt,
-            "options": q.options
+            "options": q.options_dict()
         },
         "completed": False,
         "remaining": len(remaining),
         "total": len(questions)
+    }
+
+@main.route("/api/bootstrap/<course_slug>/<module_slug>")  # ?session_id=...
+def module_bootstrap(course_slug: str, module_slug: str):
+    """Everything the module page loads per learner, in one round trip.
+
+    Returns this module's progress and the quiz_next payload, and records the
+    'view' event the page used to post separately. Progress and quiz state are
+    read in a single SELECT of scalar subqueries.
+    """
+    session_id = request.args.get("session_id")
+    if not session_id:
+        return json_error_response("session_id required", 400)
+    if not get_module_entry(course_slug, module_slug):
+        return json_error_response("Module not found", 404)
+    learner_id = learner_sessions().id_for(session_id)
+    if learner_id is None:
+        return _invalid_session()
+
+    storage_key = f"{course_slug}:{module_slug}"
+    module_key_id = module_keys().id_for(storage_key)
+    completed, last_accessed_at, solved = db.session.execute(queries.module_bootstrap(learner_id, module_key_id)).one()
+
+    _record_view(session_id, storage_key, request.args.get("page"))
+
+    response = jsonify({
+        "status": "success",
+        "data": {
+            "progress": {
+                "completed": bool(completed),
+                "last_accessed_at": last_accessed_at.isoformat() if last_accessed_at else None,
+            },
+            "quiz": _quiz_payload(get_module_quiz(course_slug, module_slug), QuizState.parse_solved(solved)),
+        },
     })
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+def _record_view(session_id, module_key, page):
+    """Record a module 'view' event; dropped (not an error) when the event buffer is full."""
+    row = _event_row({"session_id": session_id, "event_type": "view", "module_slug": module_key, "page": page}, None)
+    if row is None:
+        return
+    buffer = get_event_buffer()
+    if buffer is not None:
+        buffer.submit([row])
+        return
+    ProgressEvent.insert_rows([row])
+    db.session.commit()
+
+def _completes_quiz(solved, course_slug, module_slug, questions=None):
+    """True if `solved`, as returned by QuizState.mark_solved() after a change, now covers every question."""
+    if solved is None:
+        return False
+    questions = questions if questions is not None else get_module_quiz(course_slug, module_slug)
+    return bool(questions) and all(q.id in solved for q in questions)
 
 @main.route("/api/quiz/<course_slug>/<module_slug>", methods=["POST"])  # submit answer
 def quiz_submit(course_slug: str, module_slug: str):
@@ -175,11 +421,18 @@ def quiz_submit(course_slug: str, module_slug: str):
     if not q:
         return json_error_response("Question not found", 404)
 
+    learner_id = learner_sessions().id_for(session_id)
+    if learner_id is None:
+        return _invalid_session()
+
     is_correct = (selected == getattr(q, 'correct', None))
 
-    storage_key = f"{course_slug}:{module_slug}"
-    att = QuizAttempt(session_id=session_id, module_slug=storage_key, question_id=qid, selected=selected, correct=is_correct)
+    module_key_id = module_keys().id_for(f"{course_slug}:{module_slug}")
+    att = QuizAttempt(learner_id=learner_id, module_key_id=module_key_id, question_id=qid, selected=selected, correct=is_correct)
     db.session.add(att)
+    solved = QuizState.mark_solved(learner_id, module_key_id, q.id) if is_correct else None
+    ModuleStats.add(module_key_id, quiz_attempts=1, quiz_correct=int(is_correct),
+                    quiz_passed=int(_completes_quiz(solved, course_slug, module_slug)))
     db.session.commit()
 
     return jsonify({
@@ -189,3 +442,61 @@ def quiz_submit(course_slug: str, module_slug: str):
             "help": getattr(q, 'help', None)
         }
     })
+
+# Upper bound on answers per batch submission
+MAX_QUIZ_BATCH = 100
+
+@main.route("/api/quiz/<course_slug>/<module_slug>/batch", methods=["POST"])  # JSON: {session_id, answers: [{question_id, selected}, ...]}
+def quiz_submit_batch(course_slug: str, module_slug: str):
+    payload = request.get_json(silent=True) or {}
+    session_id = payload.get("session_id")
+    answers = payload.get("answers")
+
+    if not session_id or not isinstance(answers, list) or not answers:
+        return json_error_response("session_id and a non-empty answers array are required", 400)
+    if len(answers) > MAX_QUIZ_BATCH:
+        return json_error_response(f"At most {MAX_QUIZ_BATCH} answers per request", 413)
+    learner_id = learner_sessions().id_for(session_id)
+    if learner_id is None:
+        return _invalid_session()
+
+    questions = get_module_quiz(course_slug, module_slug)
+    # Only real modules get a module_keys row; without a quiz every answer is "not found" anyway
+    module_key_id = module_keys().id_for(f"{course_slug}:{module_slug}") if questions else None
+    selected_limit = QuizAttempt.__table__.c.selected.type.length
+    results, rows, newly_correct = [], [], []
+    for answer in answers:
+        qid = answer.get("question_id") if isinstance(answer, dict) else None
+        selected = answer.get("selected") if isinstance(answer, dict) else None
+        q = get_module_question(course_slug, module_slug, qid) if isinstance(qid, str) else None
+        if q is None or not isinstance(selected, str) or not selected or len(selected) > selected_limit:
+            # Graded per answer: a bad entry doesn't reject the rest of the batch
+            results.append({"question_id": qid, "error": "Question not found" if q is None else "Invalid selection"})
+            continue
+        is_correct = (selected == getattr(q, 'correct', None))
+        rows.append({"learner_id": learner_id, "module_key_id": module_key_id, "question_id": q.id,
+                     "selected": selected, "correct": is_correct})
+        if is_correct:
+            newly_correct.append(q.id)
+        results.append({"question_id": q.id, "correct": is_correct, "help": getattr(q, 'help', None)})
+
+    correct_ids = QuizState.solved_ids(learner_id, module_key_id) if module_key_id else set()
+    if rows:
+        # One executemany INSERT for the attempts, one upsert for the solved set, one commit
+        db.session.execute(insert(QuizAttempt), rows)
+        solved = QuizState.mark_solved(learner_id, module_key_id, *(qid for qid in newly_correct if qid not in correct_ids))
+        ModuleStats.add(module_key_id, quiz_attempts=len(rows), quiz_correct=sum(1 for row in rows if row["correct"]),
+                        quiz_passed=int(_completes_quiz(solved, course_slug, module_slug, questions)))
+        db.session.commit()
+    correct_ids.update(newly_correct)
+
+    quiz = _quiz_payload(questions, correct_ids)
+    return jsonify({
+        "status": "success",
+        "data": {
+            "results": results,
+            "completed": quiz["completed"],
+            "remaining": quiz["remaining"],
+            "total": quiz["total"],
+        }
+    })
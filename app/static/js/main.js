@@ -25,13 +25,15 @@ function getCookie(name) {
 }
 
 function generateSessionId() {
-    // Lightweight random hex id
+    // Lightweight random hex id (fallback only; see getOrSetSessionId)
     const arr = new Uint8Array(16);
     crypto.getRandomValues(arr);
     return Array.from(arr).map(b => b.toString(16).padStart(2, '0')).join('');
 }
 
 function getOrSetSessionId() {
+    // Pages set ctr_session_id to a signed server token. If it is missing, a
+    // random id still works with the API, and API responses swap it for a token.
     let id = getCookie('ctr_session_id');
     if (!id) {
         id = generateSessionId();
@@ -40,20 +42,46 @@ function getOrSetSessionId() {
     return id;
 }
 
-async function recordEvent(eventType, moduleSlug = null, page = null) {
-    const sessionId = getOrSetSessionId();
-    try {
-        await fetch('/api/event', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ session_id: sessionId, event_type: eventType, module_slug: moduleSlug, page: page || window.location.pathname })
-        });
-    } catch (e) {
-        // Silently ignore
-        console.debug('Event record failed', e);
+// Events are queued and sent in batches to /api/events: on an interval, when
+// the queue fills up, and when the page is hidden (tab switch, navigation, close).
+const EVENT_ENDPOINT = '/api/events';
+const EVENT_FLUSH_INTERVAL_MS = 15000;
+const EVENT_BATCH_SIZE = 50;
+const eventQueue = [];
+
+function recordEvent(eventType, moduleSlug = null, page = null) {
+    eventQueue.push({
+        session_id: getOrSetSessionId(),
+        event_type: eventType,
+        module_slug: moduleSlug,
+        page: page || window.location.pathname
+    });
+    if (eventQueue.length >= EVENT_BATCH_SIZE) flushEvents();
+}
+
+function flushEvents() {
+    while (eventQueue.length) {
+        const body = JSON.stringify({ events: eventQueue.splice(0, EVENT_BATCH_SIZE) });
+        // sendBeacon survives page unload; fall back to a keepalive fetch if it is unavailable or refuses
+        const queued = navigator.sendBeacon
+            && navigator.sendBeacon(EVENT_ENDPOINT, new Blob([body], { type: 'application/json' }));
+        if (!queued) {
+            fetch(EVENT_ENDPOINT, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body,
+                keepalive: true
+            }).catch(e => console.debug('Event record failed', e));
+        }
     }
 }
 
+setInterval(flushEvents, EVENT_FLUSH_INTERVAL_MS);
+document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flushEvents();
+});
+window.addEventListener('pagehide', flushEvents);
+
 // =============================================================================
 // TOAST NOTIFICATION SYSTEM
 // =============================================================================
@@ -423,6 +451,7 @@ if (document.readyState === 'loading') {
 window.showToast = showToast;
 window.getOrSetSessionId = getOrSetSessionId;
 window.recordEvent = recordEvent;
+window.flushEvents = flushEvents;
 window.clearAllFilters = clearAllFilters;
 window.clearFilter = clearFilter;
 window.resetFormWithValidation = resetFormWithValidation;
@@ -0,0 +1,142 @@
+# app/utils/analytics.py
+"""
+Course funnel analytics from the module_stats counters.
+
+`course_summary()` answers /api/analytics/courses by reading module_stats,
+one small row per module, so its cost doesn't grow with learners or
+attempts. The counters are kept current by the write paths
+(ModuleProgress.record, quiz submits; see ModuleStats).
+
+`compute_stats()` derives the same numbers from scratch with GROUP BYs over
+module_progress, quiz_attempts (plus attempts moved to the archive) and
+quiz_states. `rebuild()` replaces the counters with them. Use it to verify
+the counters, or to seed them after a migration or a manual data fix.
+Quiz passes are judged against the current content, so a quiz that gained
+questions since a learner passed it counts differently in a rebuild.
+"""
+import os
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import case, delete, func, insert, select
+
+from app import db
+from app.content.loader import get_module_quiz
+from app.models.analytics import ModuleStats
+from app.models.dimensions import ModuleKey
+from app.models.progress import ModuleProgress
+from app.models.quiz import QuizAttempt, QuizState
+from app.utils import archive
+
+
+def _rates(counts):
+    started, attempts = counts["started"], counts["quiz_attempts"]
+    return {
+        **counts,
+        "completion_rate": round(counts["completed"] / started, 4) if started else None,
+        "quiz_pass_rate": round(counts["quiz_passed"] / started, 4) if started else None,
+        "quiz_accuracy": round(counts["quiz_correct"] / attempts, 4) if attempts else None,
+    }
+
+
+def course_summary():
+    """{course_slug: {counters, rates, "modules": {module_slug: {counters, rates}}}} from module_stats."""
+    rows = db.session.execute(
+        select(ModuleKey.name, *(getattr(ModuleStats, name) for name in ModuleStats.COUNTERS))
+        .join(ModuleKey, ModuleKey.id == ModuleStats.module_key_id)
+        .order_by(ModuleKey.name)
+    ).all()
+    courses = {}
+    for row in rows:
+        course_slug, _, module_slug = row.name.partition(":")
+        counts = {name: getattr(row, name) for name in ModuleStats.COUNTERS}
+        course = courses.setdefault(course_slug, {"totals": dict.fromkeys(ModuleStats.COUNTERS, 0), "modules": {}})
+        course["modules"][module_slug] = _rates(counts)
+        for name, n in counts.items():
+            course["totals"][name] += n
+    return {
+        slug: {**_rates(course["totals"]), "modules": course["modules"]}
+        for slug, course in courses.items()
+    }
+
+
+def _archived_attempts(archive_dir):
+    """{module key name: (attempts, correct)} over archived quiz_attempts partitions."""
+    counts = defaultdict(lambda: [0, 0])
+    if os.path.exists(os.path.join(archive_dir, "manifest.json")):
+        for rows in archive.iter_pages(archive_dir, "attempts"):
+            for row in rows:
+                entry = counts[row["module_slug"]]
+                entry[0] += 1
+                entry[1] += bool(row["correct"])
+    return counts
+
+
+def _passes(module_key_names):
+    """{module_key_id: learners whose quiz_states row covers every question of the module's current quiz}."""
+    passed = defaultdict(int)
+    quiz_ids = {}
+    for key_id, name in module_key_names.items():
+        course_slug, _, module_slug = name.partition(":")
+        quiz_ids[key_id] = {q.id for q in get_module_quiz(course_slug, module_slug) or []}
+    result = db.session.execute(
+        select(QuizState.module_key_id, QuizState.solved).execution_options(yield_per=5000)
+    )
+    for key_id, solved in result:
+        questions = quiz_ids.get(key_id)
+        if questions and questions <= QuizState.parse_solved(solved):
+            passed[key_id] += 1
+    return passed
+
+
+def compute_stats(archive_dir=None):
+    """{module_key_id: {counter: value}} recomputed from the underlying tables (and the archive, if given)."""
+    names = dict(db.session.execute(select(ModuleKey.id, ModuleKey.name)).all())
+    stats = defaultdict(lambda: dict.fromkeys(ModuleStats.COUNTERS, 0))
+    for key_id, started, completed in db.session.execute(
+        select(ModuleProgress.module_key_id, func.count(),
+               func.sum(case((ModuleProgress.completed.is_(True), 1), else_=0)))
+        .group_by(ModuleProgress.module_key_id)
+    ):
+        stats[key_id].update(started=started, completed=completed)
+    for key_id, attempts, correct in db.session.execute(
+        select(QuizAttempt.module_key_id, func.count(), func.sum(case((QuizAttempt.correct.is_(True), 1), else_=0)))
+        .group_by(QuizAttempt.module_key_id)
+    ):
+        stats[key_id].update(quiz_attempts=attempts, quiz_correct=correct)
+    if archive_dir is not None:
+        ids = {name: key_id for key_id, name in names.items()}
+        for name, (attempts, correct) in _archived_attempts(archive_dir).items():
+            entry = stats[ids[name]]
+            entry["quiz_attempts"] += attempts
+            entry["quiz_correct"] += correct
+    for key_id, n in _passes(names).items():
+        stats[key_id]["quiz_passed"] = n
+    return {key_id: counts for key_id, counts in stats.items() if any(counts.values())}
+
+
+def stored_stats():
+    return {
+        row.module_key_id: {name: getattr(row, name) for name in ModuleStats.COUNTERS}
+        for row in db.session.execute(select(ModuleStats)).scalars()
+    }
+
+
+def rebuild(archive_dir=None):
+    """Replace module_stats with compute_stats() in one transaction; returns the recomputed stats.
+
+    module_stats is locked first (its write lock on SQLite, an EXCLUSIVE
+    table lock on Postgres), so writes that would change a counter wait
+    until the rebuild commits, while reads carry on.
+    """
+    with db.session.begin():
+        if db.session.get_bind().dialect.name == "postgresql":
+            db.session.execute(db.text("LOCK TABLE module_stats IN EXCLUSIVE MODE"))
+        db.session.execute(delete(ModuleStats))
+        stats = compute_stats(archive_dir)
+        if stats:
+            now = datetime.utcnow()
+            db.session.execute(insert(ModuleStats), [
+                {"module_key_id": key_id, "updated_at": now, **counts} for key_id, counts in stats.items()
+            ])
+    return stats
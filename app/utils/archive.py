@@ -0,0 +1,289 @@
+# app/utils/archive.py
+"""
+Cold archive of old quiz_attempts and progress_events rows.
+
+`archive()` moves rows older than a cutoff out of the live tables into
+compressed, columnar files, one partition per dataset and UTC day:
+
+    <ARCHIVE_DIR>/<dataset>/<YYYY>/<YYYY-MM-DD>.<part>.cols.zst   (.cols.gz without zstandard)
+    <ARCHIVE_DIR>/manifest.json
+
+A partition file is a compressed stream of JSON lines. The first line is a
+header (dataset, day, column names and types), and each following line is
+one row group: {"n": rows, "columns": [[values of column 0], ...]}. Storing a
+column's values together lets the compressor collapse the repeated module
+keys, pages and timestamps. A reader decompresses one row group at a time.
+Rows are stored as the export API shows them (app/models/queries.py
+EXPORTS), with module keys and page paths as strings, so an archive can be
+read without the database.
+
+Each partition is written to a temporary file and renamed into place, then
+recorded in the manifest as "written". Only then are its rows deleted from
+the live table, by id, in small transactions, and the entry marked
+"deleted". A run that stops in between finishes the deletes next time from
+the ids in the file. Rows that turn up for an archived day later go into the
+next part. Events are only archived once the daily rollup has counted them
+(app/utils/rollups.py).
+
+`iter_pages()` streams archived rows back, in the page shape that
+app/utils/exports.py encodes.
+"""
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, select
+
+from app import db
+from app.models.queries import EXPORTS
+from app.utils import exports
+
+try:  # optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DATASETS = ("attempts", "events")
+FORMAT_VERSION = 1
+_EXTENSIONS = {"zstd": ".cols.zst", "gzip": ".cols.gz"}
+
+
+def archive_dir():
+    return current_app.config.get("ARCHIVE_DIR") or os.path.join(current_app.instance_path, "archive")
+
+
+def default_codec():
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _column_types(dataset):
+    return ["datetime" if column.type.python_type is datetime else "value" for column in EXPORTS[dataset].columns]
+
+
+# -- manifest ---------------------------------------------------------------
+
+def load_manifest(archive_dir):
+    path = os.path.join(archive_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {"format": FORMAT_VERSION, "partitions": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(archive_dir, manifest):
+    path = os.path.join(archive_dir, "manifest.json")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked(archive_dir):
+    """Hold an exclusive lock on the archive directory so two runs can't interleave."""
+    os.makedirs(archive_dir, exist_ok=True)
+    with open(os.path.join(archive_dir, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+# -- partition files --------------------------------------------------------
+
+def _open_text(path, mode, codec):
+    if codec == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    if zstandard is None:
+        raise RuntimeError(f"{path} is zstd-compressed; install the zstandard package to read it")
+    cctx = zstandard.ZstdCompressor(level=10) if mode == "w" else None
+    return zstandard.open(path, mode + "t", cctx=cctx, encoding="utf-8")
+
+
+def _cell(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _write_partition(path, codec, dataset, day, pages):
+    """Write pages of rows as one partition file; returns the ids written (file left in place even if empty)."""
+    header = exports.columns(dataset)
+    ids = []
+    with _open_text(path, "w", codec) as f:
+        f.write(json.dumps({"format": FORMAT_VERSION, "dataset": dataset, "day": day.isoformat(),
+                            "columns": header, "types": _column_types(dataset)}) + "\n")
+        for rows in pages:
+            f.write(json.dumps({"n": len(rows), "columns": [[_cell(row[key]) for row in rows] for key in header]},
+                               separators=(",", ":")) + "\n")
+            ids.extend(row["id"] for row in rows)
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+    return ids
+
+
+def read_partition(path, codec):
+    """Yield lists of row dicts, one per row group of a partition file."""
+    with _open_text(path, "r", codec) as f:
+        header = json.loads(f.readline())
+        names, types = header["columns"], header["types"]
+        for line in f:
+            group = json.loads(line)
+            columns = [
+                [datetime.fromisoformat(v) if v is not None else None for v in values] if kind == "datetime"
+                else values
+                for values, kind in zip(group["columns"], types)
+            ]
+            yield [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# -- archiving --------------------------------------------------------------
+
+def _delete_ids(model, ids, batch_size, pause):
+    for start in range(0, len(ids), batch_size):
+        with db.session.begin():
+            db.session.execute(delete(model).where(model.id.in_(ids[start:start + batch_size])))
+        if start + batch_size < len(ids):
+            time.sleep(pause)
+
+
+def _finish_deletes(archive_dir, manifest, batch_size, pause):
+    """Delete the source rows of partitions a previous run wrote but didn't finish removing."""
+    for entry in manifest["partitions"]:
+        if entry["state"] != "written":
+            continue
+        path = os.path.join(archive_dir, entry["file"])
+        ids = [row["id"] for rows in read_partition(path, entry["codec"]) for row in rows]
+        _delete_ids(EXPORTS[entry["dataset"]].model, ids, batch_size, pause)
+        entry["state"] = "deleted"
+        _save_manifest(archive_dir, manifest)
+
+
+def _next_day(dataset, after_day, until):
+    """The first UTC day at or after `after_day` with rows before `until`, or None."""
+    spec = EXPORTS[dataset]
+    with db.session.begin():
+        first = db.session.execute(select(func.min(spec.stamp)).where(
+            spec.stamp >= datetime.combine(after_day, datetime.min.time()), spec.stamp < until
+        )).scalar()
+    return first.date() if first is not None else None
+
+
+def archive(archive_dir, cutoff, datasets=DATASETS, codec=None, batch_size=5000, delete_batch_size=1000,
+            pause=0.05):
+    """Archive whole UTC days before `cutoff` (a date) and delete them from the live tables.
+
+    Returns {dataset: rows archived}.
+    """
+    from app.utils.rollups import rolled_up_until
+
+    codec = codec or default_codec()
+    archived = {}
+    with _locked(archive_dir):
+        manifest = load_manifest(archive_dir)
+        _finish_deletes(archive_dir, manifest, delete_batch_size, pause)
+        for dataset in datasets:
+            until = datetime.combine(cutoff, datetime.min.time())
+            if dataset == "events":
+                # Deleted events can't be counted any more
+                with db.session.begin():
+                    counted_until = rolled_up_until()
+                if counted_until is None:
+                    logger.warning("Not archiving progress_events: the daily rollup has not run yet")
+                    continue
+                until = min(until, datetime.combine(counted_until.date(), datetime.min.time()))
+            archived[dataset] = 0
+            day = date.min
+            while (day := _next_day(dataset, day, until)) is not None:
+                archived[dataset] += _archive_day(archive_dir, manifest, dataset, day, codec,
+                                                  batch_size, delete_batch_size, pause)
+                day += timedelta(days=1)
+    return archived
+
+
+def _archive_day(archive_dir, manifest, dataset, day, codec, batch_size, delete_batch_size, pause):
+    part = sum(1 for e in manifest["partitions"] if e["dataset"] == dataset and e["day"] == day.isoformat())
+    name = os.path.join(dataset, f"{day.year:04d}", f"{day.isoformat()}.{part}{_EXTENSIONS[codec]}")
+    path = os.path.join(archive_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    start = datetime.combine(day, datetime.min.time())
+    pages = exports.iter_pages(db.engine, dataset, since=start, until=start + timedelta(days=1),
+                               batch_size=batch_size)
+    ids = _write_partition(tmp, codec, dataset, day, pages)
+    if not ids:
+        os.unlink(tmp)
+        return 0
+    os.replace(tmp, path)
+    entry = {
+        "dataset": dataset, "day": day.isoformat(), "part": part, "file": name, "codec": codec,
+        "rows": len(ids), "bytes": os.path.getsize(path), "sha256": _sha256(path),
+        "archived_at": datetime.utcnow().isoformat(timespec="seconds"), "state": "written",
+    }
+    manifest["partitions"].append(entry)
+    _save_manifest(archive_dir, manifest)
+    _delete_ids(EXPORTS[dataset].model, ids, delete_batch_size, pause)
+    entry["state"] = "deleted"
+    _save_manifest(archive_dir, manifest)
+    return len(ids)
+
+
+# -- reading ----------------------------------------------------------------
+
+def iter_pages(archive_dir, dataset, since=None, until=None, course=None):
+    """Yield lists of archived row dicts for `dataset`, by day, filtered like exports.iter_pages()."""
+    stamp = EXPORTS[dataset].stamp.key
+    prefix = f"{course}:" if course is not None else None
+    entries = sorted(
+        (e for e in load_manifest(archive_dir)["partitions"] if e["dataset"] == dataset),
+        key=lambda e: (e["day"], e["part"]),
+    )
+    for entry in entries:
+        day = date.fromisoformat(entry["day"])
+        if since is not None and day < since.date():
+            continue
+        if until is not None and datetime.combine(day, datetime.min.time()) >= until:
+            continue
+        for rows in read_partition(os.path.join(archive_dir, entry["file"]), entry["codec"]):
+            rows = [
+                row for row in rows
+                if (since is None or row[stamp] >= since) and (until is None or row[stamp] < until)
+                and (prefix is None or (row["module_slug"] or "").startswith(prefix))
+            ]
+            if rows:
+                yield rows
+
+
+def verify(archive_dir):
+    """Check every manifest entry's file against its size, checksum and row count; returns a list of problems."""
+    problems = []
+    for entry in load_manifest(archive_dir)["partitions"]:
+        path = os.path.join(archive_dir, entry["file"])
+        if not os.path.exists(path):
+            problems.append(f"{entry['file']}: missing")
+            continue
+        if _sha256(path) != entry["sha256"]:
+            problems.append(f"{entry['file']}: checksum mismatch")
+            continue
+        rows = sum(len(group) for group in read_partition(path, entry["codec"]))
+        if rows != entry["rows"]:
+            problems.append(f"{entry['file']}: {rows} rows, manifest says {entry['rows']}")
+    return problems
@@ -0,0 +1,82 @@
+# app/utils/db.py
+"""
+Dialect-aware statement helpers for the SQLite and Postgres backends (DB_TYPE).
+"""
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+
+_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def dialect_insert(model, bind=None):
+    """Return an INSERT for `model` that supports on_conflict_do_update() on the bound dialect.
+
+    `bind` (an engine or connection) defaults to the session's.
+    """
+    name = (bind if bind is not None else db.session.get_bind()).dialect.name
+    try:
+        return _INSERTS[name](model)
+    except KeyError:
+        raise ValueError(
+            f"No native upsert for database dialect {name!r}; supported: {', '.join(sorted(_INSERTS))}"
+        ) from None
+
+
+# (dialect name, shape key) -> (text() statement, constant parameters); see upsert(shape=...)
+_PREPARED = {}
+
+
+def _prepared(stmt, dialect, shape, values, returning):
+    """`stmt` as a text() statement, compiled once per dialect and shape.
+
+    The dialect insert constructs have no SQL cache key, so SQLAlchemy would
+    otherwise compile every upsert again. Bind types carry over, and the
+    constants the statement embeds (e.g. the 1 in `visits + 1`) are kept to
+    pass with each call's values.
+    """
+    key = (dialect.name, shape)
+    if key not in _PREPARED:
+        compiled = stmt.compile(dialect=type(dialect)(paramstyle="named"))
+        prepared = text(compiled.string).bindparams(
+            *(bindparam(name, type_=param.type) for param, name in compiled.bind_names.items())
+        )
+        if returning:
+            prepared = prepared.columns(*returning)
+        constants = {name: value for name, value in compiled.params.items() if name not in values}
+        _PREPARED[key] = (prepared, constants)
+    return _PREPARED[key]
+
+
+def upsert(model, values, conflict_columns, update, where=None, returning=(), shape=None):
+    """INSERT `values` or, if a row with the same `conflict_columns` exists, UPDATE it in one statement.
+
+    `update` is called with the statement's `excluded` pseudo-row (the values
+    that failed to insert) and returns the SET mapping, so updates can combine
+    the stored and incoming values, e.g. `model.flag | excluded.flag`.
+    With `update=None` an existing row is left alone (ON CONFLICT DO NOTHING).
+    `where` (called the same way) limits the UPDATE to matching rows, and
+    `returning` columns come back for rows that were inserted or updated.
+
+    For hot paths, pass `shape`: any hashable key that is the same exactly
+    when the statement differs only in `values`. The statement is then
+    compiled once per dialect and reused. Does not commit.
+    """
+    stmt = dialect_insert(model).values(**values)
+    if update is None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns), set_=update(stmt.excluded),
+            where=where(stmt.excluded) if where is not None else None,
+        )
+    if returning:
+        stmt = stmt.returning(*returning)
+    if shape is None:
+        return db.session.execute(stmt)
+    prepared, constants = _prepared(stmt, db.session.get_bind().dialect, (model.__tablename__, shape), values, returning)
+    return db.session.execute(prepared, {**constants, **values})
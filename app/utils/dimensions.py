@@ -0,0 +1,121 @@
+# app/utils/dimensions.py
+"""
+In-process name -> id cache for the dimension tables (app/models/dimensions.py).
+
+Write paths turn module keys and page paths into surrogate ids here before
+they insert. A hit is a dict lookup. A miss costs one SELECT and, for a
+value never seen before, an INSERT ... ON CONFLICT DO NOTHING. Both run in
+a short transaction of their own, so an id is only cached once it is
+committed, even if the caller's transaction later rolls back.
+
+Because of that separate transaction, resolve ids before the request
+session writes anything. On SQLite the session would otherwise hold the
+write lock that the dimension insert is waiting for.
+
+Dimension rows are never updated or deleted, so cached ids never go
+stale. Each cache is an LRU bounded by DIMENSION_CACHE_SIZE entries, since
+page paths come from clients.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.models.dimensions import ModuleKey, PagePath
+
+
+class DimensionCache:
+    """Bounded LRU of value -> id for one dimension table."""
+
+    def __init__(self, model, column_name, max_entries=10000):
+        self.model = model
+        self.column = model.__table__.c[column_name]
+        self.max_length = self.column.type.length
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.register_at_fork(after_in_child=self._reset_lock)
+
+    def _reset_lock(self):
+        self._lock = threading.Lock()
+
+    def valid(self, value):
+        return isinstance(value, str) and 0 < len(value) <= self.max_length
+
+    def id_for(self, value):
+        """Return the id for `value`, creating the dimension row if needed; None for None."""
+        if value is None:
+            return None
+        return self.ids_for([value])[value]
+
+    def ids_for(self, values):
+        """Return {value: id} for the non-None `values`, creating missing dimension rows."""
+        wanted = {value for value in values if value is not None}
+        found, missing = {}, []
+        with self._lock:
+            for value in wanted:
+                key_id = self._entries.get(value)
+                if key_id is None:
+                    missing.append(value)
+                else:
+                    self._entries.move_to_end(value)
+                    found[value] = key_id
+            self.hits += len(found)
+            self.misses += len(missing)
+        if missing:
+            loaded = self._load(missing)
+            found.update(loaded)
+            with self._lock:
+                self._entries.update(loaded)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return found
+
+    def _load(self, values):
+        from app import db
+        from app.utils.db import dialect_insert
+
+        table = self.model.__table__
+        lookup = select(self.column, table.c.id)
+        with db.engine.begin() as conn:
+            ids = dict(conn.execute(lookup.where(self.column.in_(values))).all())
+            new = [value for value in values if value not in ids]
+            if new:
+                # Another worker may insert the same value concurrently; keep whichever row won
+                stmt = dialect_insert(self.model, bind=conn).on_conflict_do_nothing(index_elements=[self.column.name])
+                conn.execute(stmt, [{self.column.name: value} for value in new])
+                ids.update(conn.execute(lookup.where(self.column.in_(new))).all())
+        return ids
+
+    def peek(self, value):
+        """Return the cached id for `value`, or None; never queries the database."""
+        with self._lock:
+            return self._entries.get(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def init_app(app):
+    size = int(app.config.get("DIMENSION_CACHE_SIZE", 10000))
+    app.extensions["dimensions"] = {
+        "module_keys": DimensionCache(ModuleKey, "name", size),
+        "pages": DimensionCache(PagePath, "path", size),
+    }
+
+
+def module_keys():
+    return current_app.extensions["dimensions"]["module_keys"]
+
+
+def pages():
+    return current_app.extensions["dimensions"]["pages"]
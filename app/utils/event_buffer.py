@@ -0,0 +1,167 @@
+# app/utils/event_buffer.py
+"""
+Write-behind buffer for ProgressEvent inserts.
+
+Analytics events are fire-and-forget, so /api/event and /api/events only
+enqueue rows here and return 202; a background thread bulk-inserts them in
+batches, whenever EVENT_BUFFER_BATCH_SIZE rows are waiting or every
+EVENT_BUFFER_FLUSH_INTERVAL seconds. Request latency no longer depends on
+database write latency.
+
+The queue is bounded (EVENT_BUFFER_MAX_EVENTS). When it is full, submit()
+refuses the whole batch and the endpoints answer 503 with Retry-After, so
+clients back off instead of the worker growing without limit. Remaining rows
+are flushed at interpreter exit (gunicorn's graceful worker shutdown).
+
+The flusher thread is started lazily on the first submit and the buffer is
+reset in forked children, so a buffer created in a pre-fork master (gunicorn
+preload_app) still gets one thread per worker.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    """Bounded in-process queue of ProgressEvent rows with a background flusher."""
+
+    def __init__(self, app, max_events=10000, batch_size=500, flush_interval=1.0):
+        self.app = app
+        self.max_events = max_events
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._reset()
+        # A forked child starts with an empty queue and fresh locks; the
+        # parent's flusher thread does not exist there
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self.enqueued = 0
+        self.written = 0
+        self.rejected = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="event-buffer-flusher", daemon=True)
+            self._thread.start()
+
+    def submit(self, rows):
+        """Queue event rows for insertion. Returns False (queuing nothing) when the buffer is full."""
+        now = datetime.utcnow()
+        with self._cond:
+            # Checked first: after close() no flusher may be started again
+            if self._closed:
+                self.rejected += len(rows)
+                return False
+            self._ensure_thread()
+            if len(self._queue) + len(rows) > self.max_events:
+                self.rejected += len(rows)
+                return False
+            for row in rows:
+                # Stamp at receipt so created_at doesn't drift by the flush delay
+                row.setdefault("created_at", now)
+                self._queue.append(row)
+            self.enqueued += len(rows)
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def _take(self):
+        with self._cond:
+            count = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _write(self, rows):
+        from app import db
+        from app.models.progress import ProgressEvent
+
+        with self.app.app_context():
+            try:
+                ProgressEvent.insert_rows(rows)
+                db.session.commit()
+                self.written += len(rows)
+            except Exception:
+                db.session.rollback()
+                self.failed += len(rows)
+                logger.exception("Dropped %d buffered progress events after a failed insert", len(rows))
+            finally:
+                db.session.remove()
+        self.flushes += 1
+
+    def flush(self):
+        """Write everything queued so far, in batches. Safe to call from any thread."""
+        with self._flush_lock:
+            while True:
+                rows = self._take()
+                if not rows:
+                    return
+                self._write(rows)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._queue) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self, timeout=5.0):
+        """Stop accepting events and flush what is queued (registered with atexit)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        with self._cond:
+            queued = len(self._queue)
+        return {
+            "queued": queued,
+            "max_events": self.max_events,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
+
+
+def init_app(app):
+    # Tests write synchronously unless they opt in, so assertions see the rows
+    if not app.config.get("EVENT_BUFFER_ENABLED", not app.testing):
+        return
+    buffer = EventBuffer(
+        app,
+        max_events=int(app.config.get("EVENT_BUFFER_MAX_EVENTS", 10000)),
+        batch_size=int(app.config.get("EVENT_BUFFER_BATCH_SIZE", 500)),
+        flush_interval=float(app.config.get("EVENT_BUFFER_FLUSH_INTERVAL", 1.0)),
+    )
+    app.extensions["event_buffer"] = buffer
+    atexit.register(buffer.close)
+
+
+def get_event_buffer():
+    return current_app.extensions.get("event_buffer")
@@ -0,0 +1,109 @@
+# app/utils/exports.py
+"""
+Streaming bulk exports of quiz attempts, progress events and module progress.
+
+Rows are read in keyset pages: each page is `export_page()` (app/models/
+queries.py), ordered by (time, id) and continuing after the last row of the
+previous page. Every page is its own short read on a connection that goes
+back to the pool before the page is encoded and sent. A multi-million-row
+export therefore keeps one page in memory and never holds a transaction
+open while a slow client reads. On SQLite that means WAL checkpoints (and,
+without WAL, writers) aren't held back for the length of the download.
+
+Pages are not one snapshot. A row written during an export is included if
+its time sorts after the current position.
+
+Filters: `since` (inclusive) and `until` (exclusive) on the dataset's time
+column, and `course`, which exports each of the course's module keys in turn
+from the (module_key_id, time, id) index.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.models.dimensions import ModuleKey
+from app.models.queries import EXPORTS, export_page
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 date or datetime into naive UTC, as the tables store it; None passes through."""
+    if value is None or value == "":
+        return None
+    stamp = datetime.fromisoformat(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return stamp
+
+
+def columns(dataset):
+    return [column.key for column in EXPORTS[dataset].columns]
+
+
+def course_module_key_ids(conn, course_slug):
+    """Ids of every "<course_slug>:..." module key, from a range on the unique name index."""
+    return conn.execute(
+        select(ModuleKey.id)
+        .where(ModuleKey.name >= f"{course_slug}:", ModuleKey.name < f"{course_slug};")
+        .order_by(ModuleKey.id)
+    ).scalars().all()
+
+
+def iter_pages(engine, dataset, since=None, until=None, course=None, batch_size=5000):
+    """Yield lists of row mappings, one keyset page (and one short read) at a time."""
+    stamp = EXPORTS[dataset].stamp.key
+    if course is None:
+        module_key_ids = [None]
+    else:
+        with engine.connect() as conn:
+            module_key_ids = course_module_key_ids(conn, course)
+    for module_key_id in module_key_ids:
+        after = None
+        while True:
+            stmt = export_page(dataset, after=after, since=since, until=until,
+                               module_key_id=module_key_id, limit=batch_size)
+            with engine.connect() as conn:
+                rows = conn.execute(stmt).mappings().all()
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                break
+            after = (rows[-1][stamp], rows[-1]["id"])
+
+
+def _cell(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_ndjson(pages):
+    for rows in pages:
+        yield "".join(
+            json.dumps({key: _cell(value) for key, value in row.items()}, separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+
+def encode_csv(pages, header):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    for rows in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_cell(row[key]) for key in header] for row in rows)
+        yield buffer.getvalue()
+
+
+def encode(pages, dataset, fmt):
+    """Turn pages from iter_pages() into text chunks of the given FORMATS entry."""
+    if fmt == "csv":
+        return encode_csv(pages, columns(dataset))
+    return encode_ndjson(pages)
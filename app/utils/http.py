@@ -0,0 +1,75 @@
+# app/utils/http.py
+"""
+Conditional GET helpers: strong ETags and Last-Modified for content pages.
+
+Pages built purely from course content are validated by the content
+fingerprint (see app.content.fingerprint) combined with a hash of the
+templates, so a deploy that only changes markup still busts client caches.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from flask import current_app, make_response, request
+
+_TEMPLATE_SALT = None
+
+
+def _template_salt():
+    """Hash of the app's template files; recomputed per call in debug so edits show up."""
+    global _TEMPLATE_SALT
+    if _TEMPLATE_SALT is not None and not current_app.debug:
+        return _TEMPLATE_SALT
+    h = hashlib.sha256()
+    template_dir = os.path.join(current_app.root_path, current_app.template_folder or "templates")
+    for root, dirs, files in os.walk(template_dir):
+        dirs.sort()
+        for fname in sorted(files):
+            if not fname.endswith(".html"):
+                continue
+            with open(os.path.join(root, fname), "rb") as f:
+                h.update(fname.encode())
+                h.update(f.read())
+    _TEMPLATE_SALT = h.hexdigest()[:16]
+    return _TEMPLATE_SALT
+
+
+def content_etag(*fingerprints):
+    """Build a strong ETag value from content fingerprints and the template salt."""
+    h = hashlib.sha256(_template_salt().encode())
+    for fp in fingerprints:
+        h.update(b"\0")
+        h.update(str(fp).encode())
+    return h.hexdigest()[:32]
+
+
+def _http_date(last_modified):
+    if last_modified is None:
+        return None
+    return datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+
+
+def not_modified_response(etag, last_modified=None):
+    """Return a 304 response if the request's validators match, else None.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if request.if_none_match:
+        if not request.if_none_match.contains(etag):
+            return None
+    elif request.if_modified_since and last_modified is not None:
+        if _http_date(last_modified) > request.if_modified_since:
+            return None
+    else:
+        return None
+    response = make_response("", 304)
+    return set_validators(response, etag, last_modified)
+
+
+def set_validators(response, etag, last_modified=None):
+    """Attach ETag/Last-Modified and require revalidation on every reuse."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,184 @@
+# app/utils/learner_sessions.py
+"""
+Anonymous learner sessions: compact signed tokens backed by integer ids.
+
+The progress tables key rows by learner_sessions.id instead of repeating a
+32-64 character client-generated hex string. Tokens are itsdangerous HMACs
+in two forms:
+
+- "<id>.<signature>" carries the learner id, so resolving it is a
+  signature check with no database round trip.
+- "k<random key>.<signature>" is what pages hand a browser without a
+  cookie. Signing it needs no database, so crawlers, one-off visitors and
+  304 revalidations never create rows.
+
+The first time the API sees a key token it maps the key to a
+learner_sessions row (legacy_id) through the same bounded LRU and
+insert-if-missing path as the other dimensions (app/utils/dimensions.py).
+Cookies from before server tokens hold a hex id the browser made up and go
+through the same mapping. Once a key is mapped, API responses swap the
+cookie for an "<id>" token of the same learner, using only the LRU.
+Forged or corrupted tokens don't resolve.
+
+The signing key is SESSION_TOKEN_SECRET, else SECRET_KEY. If neither is
+set, a random key is stored in the instance folder so that every worker
+on the host agrees on it.
+"""
+import os
+import secrets
+
+from flask import current_app, request
+from itsdangerous import BadSignature, Signer
+
+from app.models.dimensions import LearnerSession
+from app.utils.dimensions import DimensionCache
+
+
+COOKIE_NAME = "ctr_session_id"
+_TOKEN_SEPARATOR = "."
+# Key tokens sign "k" + a random key; learner id tokens sign digits only
+_KEY_PREFIX = "k"
+
+
+class LearnerSessions:
+    """Sign and resolve learner session tokens; client keys (key tokens, legacy ids) go through an LRU."""
+
+    def __init__(self, secret, cache_size=10000):
+        self.signer = Signer(secret, salt="learner-session", sep=_TOKEN_SEPARATOR)
+        self.client_keys = DimensionCache(LearnerSession, "legacy_id", cache_size)
+        self.issued = 0
+        self.rejected = 0
+
+    def token_for(self, learner_id):
+        return self.signer.sign(str(learner_id)).decode("ascii")
+
+    def new_key_token(self):
+        """A signed token for a learner who doesn't exist yet; the row is created when the API first sees it."""
+        self.issued += 1
+        return self.signer.sign(_KEY_PREFIX + secrets.token_hex(12)).decode("ascii")
+
+    def _unsign(self, value):
+        try:
+            return self.signer.unsign(value).decode("ascii")
+        except (BadSignature, UnicodeDecodeError):
+            return None
+
+    def parse_token(self, value):
+        """Return the learner id an "<id>" token carries, or None for any other value."""
+        payload = self._unsign(value)
+        return int(payload) if payload is not None and payload.isdigit() else None
+
+    def client_key(self, value):
+        """Return the client key of a key token or legacy id (mapped through legacy_id), or None."""
+        if not self.is_token(value):
+            return value if self.client_keys.valid(value) else None
+        payload = self._unsign(value)
+        if payload is not None and payload.startswith(_KEY_PREFIX) and self.client_keys.valid(payload):
+            return payload
+        return None
+
+    @staticmethod
+    def is_token(value):
+        # Legacy ids are plain hex; only server tokens contain the separator
+        return _TOKEN_SEPARATOR in value
+
+    def valid(self, value):
+        """Cheap pre-check for a session_id: a correctly signed token or a legacy id that fits the column."""
+        if not isinstance(value, str) or not value:
+            return False
+        return self.parse_token(value) is not None or self.client_key(value) is not None
+
+    def id_for(self, value):
+        """Return the learner id for a session_id, or None if it is invalid."""
+        if not isinstance(value, str):
+            return None
+        return self.ids_for([value]).get(value)
+
+    def ids_for(self, values):
+        """Return {session_id: learner id} for the valid values (creating rows for new client keys)."""
+        found, keys = {}, {}
+        for value in set(values):
+            if not isinstance(value, str) or not value:
+                continue
+            learner_id = self.parse_token(value)
+            if learner_id is not None:
+                found[value] = learner_id
+                continue
+            key = self.client_key(value)
+            if key is not None:
+                keys[value] = key
+            elif self.is_token(value):
+                self.rejected += 1
+        if keys:
+            ids = self.client_keys.ids_for(keys.values())
+            found.update((value, ids[key]) for value, key in keys.items())
+        return found
+
+    def upgraded_token(self, value):
+        """The "<id>" token for a key token or legacy id the LRU has already mapped, else None. No query."""
+        key = self.client_key(value) if isinstance(value, str) and value else None
+        learner_id = self.client_keys.peek(key) if key is not None else None
+        return self.token_for(learner_id) if learner_id is not None else None
+
+    def stats(self):
+        return {"issued": self.issued, "rejected_tokens": self.rejected, "client_keys": self.client_keys.stats()}
+
+
+def _signing_secret(app):
+    secret = app.config.get("SESSION_TOKEN_SECRET") or app.secret_key
+    if secret:
+        return secret
+    path = os.path.join(app.instance_path, "session_token.key")
+    if not os.path.exists(path):
+        # Write a complete key file, then link it into place: link() fails if another
+        # worker got there first, and nobody can read a half-written key
+        tmp = f"{path}.{os.getpid()}"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_urlsafe(32))
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp)
+    with open(path) as f:
+        return f.read().strip()
+
+
+def init_app(app):
+    app.extensions["learner_sessions"] = LearnerSessions(
+        _signing_secret(app), int(app.config.get("DIMENSION_CACHE_SIZE", 10000))
+    )
+
+
+def learner_sessions():
+    return current_app.extensions["learner_sessions"]
+
+
+def _set_cookie(response, token):
+    response.set_cookie(
+        COOKIE_NAME, token,
+        max_age=int(current_app.config.get("LEARNER_SESSION_COOKIE_DAYS", 60)) * 24 * 3600,
+        samesite="Lax",
+        secure=bool(current_app.config.get("SESSION_COOKIE_SECURE", False)),
+        # main.js reads the cookie to send session_id with API calls
+        httponly=False,
+    )
+    # A response that sets a per-browser cookie must not be stored by shared caches
+    response.cache_control.private = True
+    return response
+
+
+def ensure_session_cookie(response):
+    """Give a page's browser a key token unless it already has a valid session id. No database access."""
+    sessions = learner_sessions()
+    if sessions.valid(request.cookies.get(COOKIE_NAME, "")):
+        return response
+    return _set_cookie(response, sessions.new_key_token())
+
+
+def upgrade_session_cookie(response):
+    """On an API response, swap a key token or legacy id cookie for its "<id>" token once the LRU knows it."""
+    token = learner_sessions().upgraded_token(request.cookies.get(COOKIE_NAME, ""))
+    return _set_cookie(response, token) if token is not None else response
@@ -0,0 +1,179 @@
+# app/utils/page_cache.py
+"""
+Server-side cache of rendered content pages.
+
+Pages that are pure functions of course content (landing, course, module) are
+stored by their ETag, which already encodes the content fingerprint and the
+template hash, so a content change can never serve stale HTML. Entries are
+also tagged with their course slug and dropped as soon as the loader reports
+that course changed, instead of waiting to age out.
+
+The cache is bounded by total bytes (LRU eviction) and keeps gzip/brotli
+variants next to the identity body, compressed on first demand.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import current_app, make_response, request
+
+from app.content import loader
+from app.utils.http import not_modified_response, set_validators
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+INDEX_TAG = "__index__"
+
+
+class CachedPage:
+    __slots__ = ("body", "variants", "tags", "size")
+
+    def __init__(self, body, tags):
+        self.body = body
+        self.variants = {}
+        self.tags = frozenset(tags)
+        self.size = len(body)
+
+
+class PageCache:
+    """Byte-bounded LRU of rendered pages with hit/miss counters."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key, body, tags=()):
+        page = CachedPage(body, tags)
+        if page.size > self.max_bytes:
+            return page
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.size
+            self._entries[key] = page
+            self.current_bytes += page.size
+            self._evict()
+        return page
+
+    def variant(self, key, page, encoding):
+        """Return the body of `page` in `encoding`, compressing and accounting it once."""
+        data = page.variants.get(encoding)
+        if data is not None:
+            return data
+        if encoding == "br":
+            data = brotli.compress(page.body, quality=5)
+        else:
+            data = gzip.compress(page.body, compresslevel=6)
+        with self._lock:
+            if self._entries.get(key) is page and encoding not in page.variants:
+                page.variants[encoding] = data
+                page.size += len(data)
+                self.current_bytes += len(data)
+                self._evict()
+        return data
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, old = self._entries.popitem(last=False)
+            self.current_bytes -= old.size
+            self.evictions += 1
+
+    def invalidate(self, slugs=None):
+        """Drop pages tagged with any of `slugs` (and the landing page); all pages if None."""
+        with self._lock:
+            if slugs is None:
+                dropped = list(self._entries)
+            else:
+                tags = set(slugs) | {INDEX_TAG}
+                dropped = [k for k, p in self._entries.items() if p.tags & tags]
+            for key in dropped:
+                self.current_bytes -= self._entries.pop(key).size
+            self.invalidations += len(dropped)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def init_app(app):
+    if not app.config.get("PAGE_CACHE_ENABLED", True):
+        return
+    cache = PageCache(int(app.config.get("PAGE_CACHE_MAX_BYTES", 32 * 1024 * 1024)))
+    app.extensions["page_cache"] = cache
+    loader.add_change_listener(cache.invalidate)
+
+
+def get_page_cache():
+    return current_app.extensions.get("page_cache")
+
+
+def _preferred_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def render_cached(etag, last_modified, render, tags=()):
+    """Serve a content page: 304 if validators match, else cached or freshly rendered HTML.
+
+    `render` is a zero-argument callable returning the page HTML; it only runs
+    on a cache miss. Compressed representations get their own strong ETag (`<etag>-gzip`).
+    """
+    cache = get_page_cache()
+    if cache is None:
+        cached = not_modified_response(etag, last_modified)
+        if cached:
+            return cached
+        response = make_response(render())
+        return set_validators(response, etag, last_modified)
+
+    encoding = _preferred_encoding()
+    representation_etag = f"{etag}-{encoding}" if encoding else etag
+    cached = not_modified_response(representation_etag, last_modified)
+    if cached:
+        cached.vary.add("Accept-Encoding")
+        return cached
+
+    page = cache.get(etag)
+    if page is None:
+        page = cache.put(etag, render().encode("utf-8"), tags)
+
+    body = cache.variant(etag, page, encoding) if encoding else page.body
+    response = make_response(body)
+    response.mimetype = "text/html"
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return set_validators(response, representation_etag, last_modified)
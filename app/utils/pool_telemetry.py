@@ -0,0 +1,167 @@
+# app/utils/pool_telemetry.py
+"""
+Connection-pool telemetry.
+
+The engine's QueuePool is swapped for InstrumentedQueuePool, which times
+every checkout. A checkout only waits when all pool_size + max_overflow
+connections are in use. The pool records:
+
+  checkouts / waits       checkouts, and those that blocked for a connection
+  wait_ms_total / max     time spent blocked
+  overflow_opened         connections opened beyond pool_size
+  timeouts                checkouts that gave up after pool_timeout
+
+Current occupancy (checked out, idle, overflow) is read from the pool itself.
+Stats are per worker process and are reported by /api/health. A checkout
+that waits longer than DB_POOL_WAIT_WARN_MS, or times out, is logged as a
+warning. With DB_POOL_LOG_INTERVAL set, a summary line is logged at most
+once per interval.
+
+Together these show whether pool_size fits the worker's concurrency.
+Waits mean it is too small. A large idle count that is never checked out
+means it is too big.
+"""
+import logging
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Blocking shorter than this is lock contention inside the pool, not waiting for a connection
+_WAIT_THRESHOLD = 0.001
+
+
+class PoolTelemetry:
+    def __init__(self, wait_warn_ms=100, log_interval=0.0):
+        self.wait_warn_ms = wait_warn_ms
+        self.log_interval = log_interval
+        self._lock = threading.Lock()
+        self._last_log = time.monotonic()
+        self.pool = None
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.overflow_opened = 0
+        self.timeouts = 0
+
+    def record_checkout(self, waited, opened_overflow):
+        wait_ms = waited * 1000
+        with self._lock:
+            self.checkouts += 1
+            if waited >= _WAIT_THRESHOLD:
+                self.waits += 1
+                self.wait_ms_total += wait_ms
+                self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            if opened_overflow:
+                self.overflow_opened += 1
+            log_due = self.log_interval > 0 and time.monotonic() - self._last_log >= self.log_interval
+            if log_due:
+                self._last_log = time.monotonic()
+        if wait_ms >= self.wait_warn_ms:
+            logger.warning("Waited %.0f ms for a database connection (%s)", wait_ms, self._occupancy())
+        if log_due:
+            logger.info("Database pool: %s", self.stats())
+
+    def record_timeout(self, waited):
+        with self._lock:
+            self.timeouts += 1
+        logger.warning("Timed out after %.0f ms waiting for a database connection (%s)",
+                       waited * 1000, self._occupancy())
+
+    def _occupancy(self):
+        pool = self.pool
+        if pool is None:
+            return "no pool"
+        return f"checked out {pool.checkedout()}, size {pool.size()}, overflow {max(pool.overflow(), 0)}"
+
+    def stats(self):
+        pool = self.pool
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_ms_total": round(self.wait_ms_total, 1),
+                "wait_ms_max": round(self.wait_ms_max, 1),
+                "overflow_opened": self.overflow_opened,
+                "timeouts": self.timeouts,
+            }
+        if pool is not None:
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # overflow() is negative while the pool hasn't opened pool_size connections yet
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            })
+        return stats
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait time and overflow to a PoolTelemetry."""
+
+    def __init__(self, creator, telemetry=None, **kw):
+        super().__init__(creator, **kw)
+        self.telemetry = telemetry or PoolTelemetry()
+        self.telemetry.pool = self
+        self._in_get = threading.local()
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same telemetry
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        self.telemetry.pool = pool
+        return pool
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling self._do_get(); time only the outermost call
+        if getattr(self._in_get, "active", False):
+            return super()._do_get()
+        overflow_before = self.overflow()
+        start = time.perf_counter()
+        self._in_get.active = True
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.telemetry.record_timeout(time.perf_counter() - start)
+            raise
+        finally:
+            self._in_get.active = False
+        waited = time.perf_counter() - start
+        # A negative overflow only means pool_size isn't reached yet, not an overflow connection
+        self.telemetry.record_checkout(waited, self.overflow() > max(overflow_before, 0))
+        return conn
+
+
+def _is_in_memory_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and (not url.database or ":memory:" in url.database)
+
+
+def configure(app):
+    """Install InstrumentedQueuePool through SQLALCHEMY_ENGINE_OPTIONS. Call before db.init_app()."""
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI")
+    if not app.config.get("DB_POOL_TELEMETRY", True) or not uri or _is_in_memory_sqlite(uri):
+        # In-memory SQLite uses a single shared connection, not a QueuePool
+        return
+    telemetry = PoolTelemetry(
+        wait_warn_ms=float(app.config.get("DB_POOL_WAIT_WARN_MS", 100)),
+        log_interval=float(app.config.get("DB_POOL_LOG_INTERVAL", 0)),
+    )
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    options.setdefault("poolclass", InstrumentedQueuePool)
+    if options["poolclass"] is not InstrumentedQueuePool:
+        return
+    options["telemetry"] = telemetry
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    app.extensions["pool_telemetry"] = telemetry
+
+
+def get_pool_telemetry():
+    return current_app.extensions.get("pool_telemetry")
@@ -0,0 +1,95 @@
+# app/utils/query_plans.py
+"""
+Query-plan checks for the statements in app.models.queries.HOT_QUERIES.
+
+Each statement is run through EXPLAIN QUERY PLAN (SQLite) or EXPLAIN (FORMAT
+JSON) (Postgres) on the configured database, and the plan is rejected if it
+reads a whole table or sorts into a temporary structure: SQLite's
+`SCAN <table>` / `USE TEMP B-TREE`, Postgres' `Seq Scan` / `Sort`. Postgres
+is explained with enable_seqscan off, so a sequential scan only shows up when
+no index can answer the query, whatever the table statistics say.
+"""
+import json
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+
+
+@dataclass
+class PlanResult:
+    name: str
+    plan: list
+    problems: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.problems
+
+
+def _compile(conn, stmt):
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[key] for key in compiled.positiontup)
+    return compiled.string, params
+
+
+def _sqlite_plan(conn, sql, params):
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+    plan = [row[-1] for row in rows]
+    problems = [
+        detail for detail in plan
+        if (detail.startswith("SCAN ") and detail != "SCAN CONSTANT ROW") or "USE TEMP B-TREE" in detail
+    ]
+    return plan, problems
+
+
+def _postgres_nodes(node, depth=0):
+    yield depth, node
+    for child in node.get("Plans", ()):
+        yield from _postgres_nodes(child, depth + 1)
+
+
+def _postgres_plan(conn, sql, params):
+    # Scoped to the connection's (autobegun) transaction, which check_plans' caller discards
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    raw = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", params).scalar()
+    doc = json.loads(raw) if isinstance(raw, str) else raw
+    plan, problems = [], []
+    for depth, node in _postgres_nodes(doc[0]["Plan"]):
+        line = "  " * depth + node["Node Type"]
+        if node.get("Relation Name"):
+            line += f" on {node['Relation Name']}"
+        if node.get("Index Name"):
+            line += f" using {node['Index Name']}"
+        plan.append(line)
+        if node["Node Type"] in ("Seq Scan", "Sort"):
+            problems.append(line.strip())
+    return plan, problems
+
+
+_EXPLAINERS = {
+    "sqlite": _sqlite_plan,
+    "postgresql": _postgres_plan,
+}
+
+
+def check_plans(conn, queries):
+    """EXPLAIN every statement in `queries` ({name: factory}) and return a PlanResult per entry.
+
+    Nothing is executed for real, but the caller should roll back `conn`
+    afterwards (the Postgres check changes a transaction-local setting).
+    """
+    try:
+        explain = _EXPLAINERS[conn.dialect.name]
+    except KeyError:
+        raise ValueError(
+            f"No query-plan check for database dialect {conn.dialect.name!r}; "
+            f"supported: {', '.join(sorted(_EXPLAINERS))}"
+        ) from None
+    results = []
+    for name, factory in queries.items():
+        sql, params = _compile(conn, factory())
+        plan, problems = explain(conn, sql, params)
+        results.append(PlanResult(name, plan, problems))
+    return results
@@ -0,0 +1,112 @@
+# app/utils/rollups.py
+"""
+Incremental daily rollup of progress_events, and retention for the raw rows.
+
+`roll_up_events()` counts events per UTC day, module key and event type into
+event_daily_counts. Reports read those counts instead of scanning
+progress_events. The job reads events in (created_at, id) order after a
+watermark kept in job_watermarks, so each run only touches rows added since
+the last one. Every batch adds its counts and moves the watermark in one
+transaction, so a crash neither loses nor double-counts a batch.
+
+Events newer than ROLLUP_SETTLE_SECONDS are left for the next run. Their
+created_at is the request time, and the write-behind buffer (or a
+concurrent Postgres transaction) may commit them a little later. Rows that
+arrive behind the watermark would otherwise never be counted.
+
+`prune_events()` deletes raw events older than the retention window in
+small batches, each its own short transaction with a pause in between,
+so live inserts keep getting the write lock. It never deletes events the
+rollup hasn't counted yet.
+"""
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+
+from app import db
+from app.models.analytics import EventDailyCount, JobWatermark
+from app.models.progress import ProgressEvent
+from app.models.queries import events_older_than, events_to_roll_up
+from app.utils.db import upsert
+
+logger = logging.getLogger(__name__)
+
+EVENT_ROLLUP = "event_daily_counts"
+
+
+def _watermark(session, name):
+    """Return the job's watermark row, locked against a concurrent run.
+
+    The row is created with INSERT ... ON CONFLICT DO NOTHING first, so two
+    first runs can't both insert it. On SQLite that statement also takes the
+    write lock, which with_for_update() can't, and so serializes the runs.
+    """
+    upsert(JobWatermark, dict(name=name, updated_at=datetime.utcnow()), ('name',), None)
+    return session.execute(select(JobWatermark).where(JobWatermark.name == name).with_for_update()).scalar_one()
+
+
+def _add_counts(session, counts):
+    for (day, module_key_id, event_type), n in counts.items():
+        # module_key_id may be NULL, which ON CONFLICT can't match; the watermark lock
+        # keeps this update-then-insert to one writer
+        updated = session.execute(
+            update(EventDailyCount)
+            .where(EventDailyCount.day == day, EventDailyCount.module_key_id.is_not_distinct_from(module_key_id),
+                   EventDailyCount.event_type == event_type)
+            .values(count=EventDailyCount.count + n)
+        ).rowcount
+        if not updated:
+            session.add(EventDailyCount(day=day, module_key_id=module_key_id, event_type=event_type, count=n))
+
+
+def roll_up_events(batch_size=5000, settle_seconds=300, now=None):
+    """Count events past the watermark into event_daily_counts; returns the number of events counted."""
+    until = (now or datetime.utcnow()) - timedelta(seconds=settle_seconds)
+    total = 0
+    while True:
+        with db.session.begin():
+            mark = _watermark(db.session, EVENT_ROLLUP)
+            after = (mark.position_at, mark.position_id) if mark.position_at is not None else None
+            rows = db.session.execute(events_to_roll_up(after, until, batch_size)).all()
+            if not rows:
+                break
+            _add_counts(db.session, Counter(
+                (row.created_at.date(), row.module_key_id, row.event_type) for row in rows
+            ))
+            mark.position_at, mark.position_id = rows[-1].created_at, rows[-1].id
+        total += len(rows)
+        if len(rows) < batch_size:
+            break
+    return total
+
+
+def rolled_up_until():
+    """The created_at the event rollup has counted up to, or None if it has never run."""
+    return db.session.execute(
+        select(JobWatermark.position_at).where(JobWatermark.name == EVENT_ROLLUP)
+    ).scalar()
+
+
+def prune_events(days, batch_size=1000, pause=0.05, now=None):
+    """Delete events older than `days` days that the rollup has counted; returns the number deleted."""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    with db.session.begin():
+        counted_until = rolled_up_until()
+    if counted_until is None:
+        logger.warning("Not pruning progress_events: the daily rollup has not run yet")
+        return 0
+    # Rows at the watermark's own timestamp may not all be counted yet
+    cutoff = min(cutoff, counted_until)
+    total = 0
+    while True:
+        with db.session.begin():
+            ids = db.session.execute(events_older_than(cutoff, batch_size)).scalars().all()
+            if ids:
+                db.session.execute(delete(ProgressEvent).where(ProgressEvent.id.in_(ids)))
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
+        time.sleep(pause)
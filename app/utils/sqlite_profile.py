@@ -0,0 +1,173 @@
+# app/utils/sqlite_profile.py
+"""
+Connection tuning for the SQLite backend.
+
+Out of the box SQLite uses a rollback journal: a writer locks out readers
+and every commit fsyncs twice, so concurrent workers stall on "database is
+locked". On every new connection this module sets:
+
+  journal_mode=WAL       readers no longer block the writer, and vice versa
+  synchronous=NORMAL     fsync at checkpoints only, which is safe in WAL mode.
+                         A power loss can drop the last commits, but it can't
+                         corrupt the file.
+  busy_timeout           wait for the write lock instead of failing at once
+  mmap_size, cache_size  read pages through the OS page cache and keep a
+                         larger per-connection page cache
+  temp_store=MEMORY      temp tables and sort spills stay off disk
+
+In WAL mode, commits append to <db>-wal until a checkpoint copies them back
+into the database. SQLite's auto-checkpoint runs on the committing request
+and can't finish while readers are active, so the WAL keeps growing.
+WalCheckpointer runs a PASSIVE checkpoint every SQLITE_CHECKPOINT_INTERVAL
+seconds on a background thread. Once the WAL passes
+SQLITE_WAL_TRUNCATE_BYTES it runs a TRUNCATE checkpoint, which shrinks the
+file back to zero.
+
+Every value comes from config (SQLITE_*). SQLITE_TUNING=0 leaves the driver
+defaults in place.
+"""
+import logging
+import os
+import threading
+
+from flask import current_app
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+def _choice(value, allowed, key):
+    value = str(value).upper()
+    if value not in allowed:
+        raise ValueError(f"{key} must be one of {sorted(allowed)}, not {value!r}")
+    return value
+
+
+def build_pragmas(config):
+    """Return the ordered PRAGMA statements for `config`; values are validated, not interpolated raw."""
+    return [
+        f"PRAGMA journal_mode={_choice(config.get('SQLITE_JOURNAL_MODE', 'WAL'), _JOURNAL_MODES, 'SQLITE_JOURNAL_MODE')}",
+        f"PRAGMA synchronous={_choice(config.get('SQLITE_SYNCHRONOUS', 'NORMAL'), _SYNCHRONOUS, 'SQLITE_SYNCHRONOUS')}",
+        f"PRAGMA busy_timeout={int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+        f"PRAGMA mmap_size={int(config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size={-int(config.get('SQLITE_CACHE_SIZE_KB', 20000))}",
+        f"PRAGMA temp_store={_choice(config.get('SQLITE_TEMP_STORE', 'MEMORY'), _TEMP_STORES, 'SQLITE_TEMP_STORE')}",
+    ]
+
+
+class WalCheckpointer:
+    """Background PASSIVE checkpoints, escalating to TRUNCATE when the WAL file grows too large."""
+
+    def __init__(self, engine, wal_path, interval=30.0, truncate_bytes=64 * 1024 * 1024):
+        self.engine = engine
+        self.wal_path = wal_path
+        self.interval = interval
+        self.truncate_bytes = truncate_bytes
+        self._reset()
+        # Threads don't survive fork; a preloaded master's checkpointer restarts per worker
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.checkpoints = 0
+        self.truncations = 0
+        self.busy = 0
+        self.failed = 0
+        self.last_result = None
+
+    def ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sqlite-wal-checkpointer", daemon=True)
+                self._thread.start()
+
+    def wal_bytes(self):
+        try:
+            return os.path.getsize(self.wal_path)
+        except OSError:
+            return 0
+
+    def checkpoint(self, mode=None):
+        """Run one checkpoint and return SQLite's (busy, wal_frames, checkpointed_frames) row.
+
+        `mode` defaults to PASSIVE, or TRUNCATE once the WAL exceeds truncate_bytes.
+        """
+        if mode is None:
+            mode = "TRUNCATE" if self.wal_bytes() > self.truncate_bytes else "PASSIVE"
+        mode = _choice(mode, {"PASSIVE", "FULL", "RESTART", "TRUNCATE"}, "checkpoint mode")
+        with self.engine.connect() as conn:
+            result = tuple(conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one())
+        self.checkpoints += 1
+        if mode == "TRUNCATE":
+            self.truncations += 1
+        if result[0]:
+            self.busy += 1
+        self.last_result = {"mode": mode, "busy": result[0], "wal_frames": result[1], "checkpointed": result[2]}
+        return result
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.checkpoint()
+            except Exception:
+                self.failed += 1
+                logger.exception("SQLite WAL checkpoint failed")
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {
+            "wal_bytes": self.wal_bytes(),
+            "checkpoints": self.checkpoints,
+            "truncations": self.truncations,
+            "busy": self.busy,
+            "failed": self.failed,
+            "last": self.last_result,
+        }
+
+
+def init_app(app):
+    if not app.config.get("SQLITE_TUNING", True):
+        return
+    from app import db
+
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = build_pragmas(app.config)
+    database = engine.url.database
+    checkpointer = None
+    interval = float(app.config.get("SQLITE_CHECKPOINT_INTERVAL", 30.0))
+    in_memory = not database or database == ":memory:" or database.startswith("file::memory:")
+    if interval > 0 and not in_memory and pragmas[0].endswith("=WAL"):
+        checkpointer = WalCheckpointer(
+            engine, f"{database}-wal", interval=interval,
+            truncate_bytes=int(app.config.get("SQLITE_WAL_TRUNCATE_BYTES", 64 * 1024 * 1024)),
+        )
+        app.extensions["sqlite_checkpointer"] = checkpointer
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+        # Started from the first connection, i.e. in the process that serves requests
+        if checkpointer is not None:
+            checkpointer.ensure_started()
+
+
+def get_checkpointer():
+    return current_app.extensions.get("sqlite_checkpointer")
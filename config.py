@@ -7,6 +7,22 @@ from datetime import timedelta
 basedir = os.path.abspath(os.path.dirname(__file__))
 load_dotenv(os.path.join(basedir, '.env'))
 
+def postgres_engine_options(pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=-1,
+                            pre_ping=False, statement_timeout_ms=0):
+    """SQLAlchemy engine options for DB_TYPE=postgres; DB_* environment variables override the defaults."""
+    options = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', pool_size)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', max_overflow)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', pool_timeout)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', pool_recycle)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1' if pre_ping else '0').lower() in ('1', 'true', 'yes'),
+    }
+    statement_timeout_ms = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', statement_timeout_ms))
+    if statement_timeout_ms > 0:
+        # Server-side limit per statement, set at connection start (libpq options)
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout_ms}'}
+    return options
+
 class Config:
     # Core Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY')
@@ -17,11 +33,68 @@ class Config:
     
     if DB_TYPE == 'postgres':
         SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+        SQLALCHEMY_ENGINE_OPTIONS = postgres_engine_options()
     else:
         # SQLite database
         SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(basedir, 'instance', 'app.db')}"
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool telemetry in /api/health (see app/utils/pool_telemetry.py)
+    DB_POOL_TELEMETRY = os.environ.get('DB_POOL_TELEMETRY', '1').lower() in ('1', 'true', 'yes')
+    DB_POOL_WAIT_WARN_MS = float(os.environ.get('DB_POOL_WAIT_WARN_MS', 100))
+    DB_POOL_LOG_INTERVAL = float(os.environ.get('DB_POOL_LOG_INTERVAL', 0))  # seconds; 0 = warnings only
+
+    # SQLite connection profile applied on connect (see app/utils/sqlite_profile.py)
+    SQLITE_TUNING = os.environ.get('SQLITE_TUNING', '1').lower() in ('1', 'true', 'yes')
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 20000))
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')
+    # Background WAL checkpoints every N seconds (0 disables); TRUNCATE once the WAL is this large
+    SQLITE_CHECKPOINT_INTERVAL = float(os.environ.get('SQLITE_CHECKPOINT_INTERVAL', 30.0))
+    SQLITE_WAL_TRUNCATE_BYTES = int(os.environ.get('SQLITE_WAL_TRUNCATE_BYTES', 64 * 1024 * 1024))
+
+    # Content snapshot built by `flask content build`; live discovery is used if missing/stale
+    CONTENT_SNAPSHOT_PATH = os.environ.get('CONTENT_SNAPSHOT_PATH', os.path.join(basedir, 'instance', 'content.snapshot'))
+    CONTENT_SNAPSHOT_ENABLED = True
+    # Max fully loaded courses (modules + quizzes) kept per worker; metadata is always resident
+    CONTENT_COURSE_CACHE_SIZE = int(os.environ.get('CONTENT_COURSE_CACHE_SIZE', 16))
+    # Compiled Markdown/YAML course files, keyed by file hash (see app/content/markdown_course.py)
+    CONTENT_COMPILE_CACHE_DIR = os.environ.get('CONTENT_COMPILE_CACHE_DIR', os.path.join(basedir, 'instance', 'content_cache'))
+    # Hot reload of edited course packages (polled at most every CONTENT_WATCH_INTERVAL seconds)
+    CONTENT_WATCH = os.environ.get('CONTENT_WATCH', '').lower() in ('1', 'true', 'yes')
+    CONTENT_WATCH_INTERVAL = float(os.environ.get('CONTENT_WATCH_INTERVAL', 2.0))
+
+    # Rendered HTML cache for content pages (per worker, LRU by total bytes incl. gzip/br variants)
+    PAGE_CACHE_ENABLED = True
+    PAGE_CACHE_MAX_BYTES = int(os.environ.get('PAGE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+    # Write-behind queue for /api/event(s): rows are inserted in the background by size or time
+    EVENT_BUFFER_ENABLED = os.environ.get('EVENT_BUFFER_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    EVENT_BUFFER_MAX_EVENTS = int(os.environ.get('EVENT_BUFFER_MAX_EVENTS', 10000))
+    EVENT_BUFFER_BATCH_SIZE = int(os.environ.get('EVENT_BUFFER_BATCH_SIZE', 500))
+    EVENT_BUFFER_FLUSH_INTERVAL = float(os.environ.get('EVENT_BUFFER_FLUSH_INTERVAL', 1.0))
+    # Per-process LRU of module key / page path -> dimension id (app/utils/dimensions.py)
+    DIMENSION_CACHE_SIZE = int(os.environ.get('DIMENSION_CACHE_SIZE', 10000))
+    # Signed learner session cookie (app/utils/learner_sessions.py); the secret defaults to SECRET_KEY
+    SESSION_TOKEN_SECRET = os.environ.get('SESSION_TOKEN_SECRET')
+    LEARNER_SESSION_COOKIE_DAYS = int(os.environ.get('LEARNER_SESSION_COOKIE_DAYS', 60))
+    # GET /api/export/<dataset> needs "Authorization: Bearer <EXPORT_API_TOKEN>"; unset disables it
+    EXPORT_API_TOKEN = os.environ.get('EXPORT_API_TOKEN')
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 5000))
+    # `flask events rollup` / `flask events prune` (app/utils/rollups.py), meant for cron
+    ROLLUP_BATCH_SIZE = int(os.environ.get('ROLLUP_BATCH_SIZE', 5000))
+    ROLLUP_SETTLE_SECONDS = int(os.environ.get('ROLLUP_SETTLE_SECONDS', 300))
+    # Raw progress_events older than this many days are pruned once counted; unset keeps them
+    EVENT_RETENTION_DAYS = int(os.environ['EVENT_RETENTION_DAYS']) if os.environ.get('EVENT_RETENTION_DAYS') else None
+    EVENT_PRUNE_BATCH_SIZE = int(os.environ.get('EVENT_PRUNE_BATCH_SIZE', 1000))
+    EVENT_PRUNE_PAUSE = float(os.environ.get('EVENT_PRUNE_PAUSE', 0.05))
+    # `flask archive run` (app/utils/archive.py): compressed day partitions of old attempts/events
+    ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', os.path.join(basedir, 'instance', 'archive'))
+    ARCHIVE_AFTER_DAYS = int(os.environ['ARCHIVE_AFTER_DAYS']) if os.environ.get('ARCHIVE_AFTER_DAYS') else None
     SQLALCHEMY_COMMIT_ON_TEARDOWN = True
     
     # Security settings
@@ -67,6 +140,7 @@ class DevelopmentConfig(Config):
     FLASK_ENV = 'development'
     DEBUG = True
     DEVELOPMENT = True
+    CONTENT_WATCH = True
     
     # More permissive session cookie settings for development
     SESSION_COOKIE_SECURE = False
@@ -83,9 +157,17 @@ class ProductionConfig(Config):
     SESSION_COOKIE_SAMESITE = 'Lax'
     SESSION_FILE_DIR = '/home/ubuntu/see-tran/flask_session'
 
+    if Config.DB_TYPE == 'postgres':
+        # Drop connections the server or a proxy closed while idle; cap runaway queries
+        SQLALCHEMY_ENGINE_OPTIONS = postgres_engine_options(pool_recycle=1800, pre_ping=True,
+                                                            statement_timeout_ms=30000)
+        DB_POOL_LOG_INTERVAL = float(os.environ.get('DB_POOL_LOG_INTERVAL', 300))
+
 class TestConfig(Config):
     """Test configuration."""
     TESTING = True
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
-    WTF_CSRF_ENABLED = False
\ No newline at end of file
+    WTF_CSRF_ENABLED = False
+    CONTENT_SNAPSHOT_ENABLED = False
+    EVENT_BUFFER_ENABLED = False
\ No newline at end of file
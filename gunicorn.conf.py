@@ -0,0 +1,49 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the C-TRAN AI Learning App.
+
+  gunicorn -c gunicorn.conf.py run:app
+
+With CONTENT_SHARED on (the default), the app is imported once in the master
+(preload_app). Every course and the search index are loaded there before any
+worker is forked. The heap is then frozen with gc.freeze(), so workers share
+the content pages copy-on-write instead of each building its own copy.
+Garbage collection stays disabled in the master until then, so freed objects
+don't leave holes in pages the workers will share.
+
+Set CONTENT_SHARED=0 to import the app in each worker instead, e.g. with
+--reload or CONTENT_WATCH, where workers replace their own content anyway.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+preload_app = os.environ.get("CONTENT_SHARED", "1").lower() in ("1", "true", "yes")
+
+if preload_app:
+    gc.disable()
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before the first fork."""
+    if not server.cfg.preload_app:
+        return
+    from app.content import loader, search
+
+    courses = loader.preload()
+    search.warm()
+    server.log.info("Preloaded %d courses into the master for copy-on-write sharing", courses)
+
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app:
+        # Move everything allocated so far out of the collector's reach, so
+        # collections in the worker never write to the shared objects' GC headers
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        gc.enable()
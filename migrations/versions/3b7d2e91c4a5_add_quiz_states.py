@@ -0,0 +1,44 @@
+"""add quiz_states and backfill it from quiz_attempts
+
+One row per (session, course:module) with the ids of the questions answered
+correctly, so quiz_next no longer scans quiz_attempts.
+
+Revision ID: 3b7d2e91c4a5
+Revises: cf64511b0dda
+Create Date: 2026-10-18 06:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7d2e91c4a5'
+down_revision = 'cf64511b0dda'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('quiz_states',
+    sa.Column('session_id', sa.String(length=64), nullable=False),
+    sa.Column('module_slug', sa.String(length=100), nullable=False),
+    sa.Column('solved', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('session_id', 'module_slug')
+    )
+
+    # solved is ',id1,id2,' (see QuizState); build it from the distinct correct answers
+    if op.get_bind().dialect.name == 'postgresql':
+        solved_ids = "string_agg(DISTINCT question_id, ',')"
+    else:
+        solved_ids = "group_concat(DISTINCT question_id)"
+    op.execute(
+        "INSERT INTO quiz_states (session_id, module_slug, solved, updated_at) "
+        f"SELECT session_id, module_slug, ',' || {solved_ids} || ',', max(created_at) "
+        "FROM quiz_attempts WHERE correct GROUP BY session_id, module_slug"
+    )
+
+
+def downgrade():
+    op.drop_table('quiz_states')
@@ -0,0 +1,50 @@
+"""covering composite indexes for the per-session API queries
+
+Replaces the single-column session_id indexes (and ix_attempt_session_module)
+with composite indexes that start with session_id, so each is still usable
+for session-only filters while the hot lookups become index-only.
+
+Revision ID: 8e4f1c6a2d90
+Revises: 3b7d2e91c4a5
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4f1c6a2d90'
+down_revision = '3b7d2e91c4a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.create_index('ix_progress_session_state', ['session_id', 'module_slug', 'completed', 'last_accessed_at'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_module_progress_session_id'))
+
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.create_index('ix_event_session_created', ['session_id', 'created_at'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_progress_events_session_id'))
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.create_index('ix_attempt_session_module_correct', ['session_id', 'module_slug', 'correct', 'question_id'], unique=False)
+        batch_op.drop_index('ix_attempt_session_module')
+        batch_op.drop_index(batch_op.f('ix_quiz_attempts_session_id'))
+
+
+def downgrade():
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_quiz_attempts_session_id'), ['session_id'], unique=False)
+        batch_op.create_index('ix_attempt_session_module', ['session_id', 'module_slug'], unique=False)
+        batch_op.drop_index('ix_attempt_session_module_correct')
+
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_progress_events_session_id'), ['session_id'], unique=False)
+        batch_op.drop_index('ix_event_session_created')
+
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_module_progress_session_id'), ['session_id'], unique=False)
+        batch_op.drop_index('ix_progress_session_state')
@@ -0,0 +1,38 @@
+"""module_stats funnel counters
+
+Per-module started/completed/quiz counters behind /api/analytics/courses,
+added to by the progress and quiz write paths. The table starts empty; run
+`flask analytics rebuild` after upgrading to count the existing rows.
+
+Revision ID: a9c3f5e1d286
+Revises: f4c9d2a7b351
+Create Date: 2026-10-18 09:41:27.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9c3f5e1d286'
+down_revision = 'f4c9d2a7b351'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('module_stats',
+    sa.Column('module_key_id', sa.Integer(), nullable=False),
+    sa.Column('started', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('quiz_attempts', sa.Integer(), nullable=False),
+    sa.Column('quiz_correct', sa.Integer(), nullable=False),
+    sa.Column('quiz_passed', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['module_key_id'], ['module_keys.id'], name='fk_module_stats_module_key'),
+    sa.PrimaryKeyConstraint('module_key_id')
+    )
+
+
+def downgrade():
+    op.drop_table('module_stats')
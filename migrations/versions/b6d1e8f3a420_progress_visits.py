@@ -0,0 +1,40 @@
+"""module_progress visits and completed_on_visit
+
+Lets the single progress upsert tell, from its RETURNING row, whether it
+inserted the row and whether it was the write that completed it. Existing
+rows are backfilled as one visit, completed on that visit if completed.
+
+Revision ID: b6d1e8f3a420
+Revises: a9c3f5e1d286
+Create Date: 2026-10-18 11:02:45.530917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d1e8f3a420'
+down_revision = 'a9c3f5e1d286'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('visits', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('completed_on_visit', sa.Integer(), nullable=True))
+
+    op.execute(
+        "UPDATE module_progress SET visits = 1, "
+        "completed_on_visit = CASE WHEN completed THEN 1 ELSE NULL END"
+    )
+
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.alter_column('visits', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.drop_column('completed_on_visit')
+        batch_op.drop_column('visits')
@@ -0,0 +1,163 @@
+"""module_keys / pages dimension tables; progress tables store their ids
+
+module_progress, quiz_attempts, quiz_states and progress_events replace the
+"course:module" string (and progress_events its page path) with an integer
+id into module_keys / pages. Existing rows are backfilled; indexes that
+contained module_slug are rebuilt on module_key_id.
+
+Revision ID: c5a8e2f47b13
+Revises: 8e4f1c6a2d90
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a8e2f47b13'
+down_revision = '8e4f1c6a2d90'
+branch_labels = None
+depends_on = None
+
+
+def _quiz_states_table(name, key_column):
+    return op.create_table(name,
+    sa.Column('session_id', sa.String(length=64), nullable=False),
+    key_column,
+    sa.Column('solved', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('session_id', key_column.name)
+    )
+
+
+def upgrade():
+    op.create_table('module_keys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('pages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('path', sa.String(length=200), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('path')
+    )
+    op.execute(
+        "INSERT INTO module_keys (name) "
+        "SELECT module_slug FROM module_progress UNION "
+        "SELECT module_slug FROM quiz_attempts UNION "
+        "SELECT module_slug FROM quiz_states UNION "
+        "SELECT module_slug FROM progress_events WHERE module_slug IS NOT NULL"
+    )
+    op.execute("INSERT INTO pages (path) SELECT DISTINCT page FROM progress_events WHERE page IS NOT NULL")
+
+    key_id = "(SELECT id FROM module_keys WHERE module_keys.name = {table}.module_slug)"
+
+    # Nullable first so existing rows can be backfilled, then tightened below
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('module_key_id', sa.Integer(), nullable=True))
+    op.execute(f"UPDATE module_progress SET module_key_id = {key_id.format(table='module_progress')}")
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.drop_index('ix_progress_session_state')
+        batch_op.drop_index(batch_op.f('ix_module_progress_module_slug'))
+        batch_op.drop_constraint('uq_session_module', type_='unique')
+        batch_op.drop_column('module_slug')
+        batch_op.alter_column('module_key_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_module_progress_module_key', 'module_keys', ['module_key_id'], ['id'])
+        batch_op.create_unique_constraint('uq_session_module', ['session_id', 'module_key_id'])
+        batch_op.create_index('ix_progress_session_state', ['session_id', 'module_key_id', 'completed', 'last_accessed_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_module_progress_module_key_id'), ['module_key_id'], unique=False)
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('module_key_id', sa.Integer(), nullable=True))
+    op.execute(f"UPDATE quiz_attempts SET module_key_id = {key_id.format(table='quiz_attempts')}")
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.drop_index('ix_attempt_session_module_correct')
+        batch_op.drop_index(batch_op.f('ix_quiz_attempts_module_slug'))
+        batch_op.drop_column('module_slug')
+        batch_op.alter_column('module_key_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_quiz_attempts_module_key', 'module_keys', ['module_key_id'], ['id'])
+        batch_op.create_index('ix_attempt_session_module_correct', ['session_id', 'module_key_id', 'correct', 'question_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_quiz_attempts_module_key_id'), ['module_key_id'], unique=False)
+
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('module_key_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('page_id', sa.Integer(), nullable=True))
+    op.execute(
+        f"UPDATE progress_events SET module_key_id = {key_id.format(table='progress_events')}, "
+        "page_id = (SELECT id FROM pages WHERE pages.path = progress_events.page)"
+    )
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.drop_column('module_slug')
+        batch_op.drop_column('page')
+        batch_op.create_foreign_key('fk_progress_events_module_key', 'module_keys', ['module_key_id'], ['id'])
+        batch_op.create_foreign_key('fk_progress_events_page', 'pages', ['page_id'], ['id'])
+
+    # The key is part of quiz_states' primary key, so copy into a rebuilt table
+    _quiz_states_table('quiz_states_new', sa.Column(
+        'module_key_id', sa.Integer(), sa.ForeignKey('module_keys.id', name='fk_quiz_states_module_key'), nullable=False
+    ))
+    op.execute(
+        "INSERT INTO quiz_states_new (session_id, module_key_id, solved, updated_at) "
+        "SELECT quiz_states.session_id, module_keys.id, quiz_states.solved, quiz_states.updated_at "
+        "FROM quiz_states JOIN module_keys ON module_keys.name = quiz_states.module_slug"
+    )
+    op.drop_table('quiz_states')
+    op.rename_table('quiz_states_new', 'quiz_states')
+
+
+def downgrade():
+    _quiz_states_table('quiz_states_old', sa.Column('module_slug', sa.String(length=100), nullable=False))
+    op.execute(
+        "INSERT INTO quiz_states_old (session_id, module_slug, solved, updated_at) "
+        "SELECT quiz_states.session_id, module_keys.name, quiz_states.solved, quiz_states.updated_at "
+        "FROM quiz_states JOIN module_keys ON module_keys.id = quiz_states.module_key_id"
+    )
+    op.drop_table('quiz_states')
+    op.rename_table('quiz_states_old', 'quiz_states')
+
+    key_name = "(SELECT name FROM module_keys WHERE module_keys.id = {table}.module_key_id)"
+
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('module_slug', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('page', sa.String(length=200), nullable=True))
+    op.execute(
+        f"UPDATE progress_events SET module_slug = {key_name.format(table='progress_events')}, "
+        "page = (SELECT path FROM pages WHERE pages.id = progress_events.page_id)"
+    )
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_progress_events_page', type_='foreignkey')
+        batch_op.drop_constraint('fk_progress_events_module_key', type_='foreignkey')
+        batch_op.drop_column('page_id')
+        batch_op.drop_column('module_key_id')
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('module_slug', sa.String(length=100), nullable=True))
+    op.execute(f"UPDATE quiz_attempts SET module_slug = {key_name.format(table='quiz_attempts')}")
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quiz_attempts_module_key_id'))
+        batch_op.drop_index('ix_attempt_session_module_correct')
+        batch_op.drop_constraint('fk_quiz_attempts_module_key', type_='foreignkey')
+        batch_op.drop_column('module_key_id')
+        batch_op.alter_column('module_slug', existing_type=sa.String(length=100), nullable=False)
+        batch_op.create_index(batch_op.f('ix_quiz_attempts_module_slug'), ['module_slug'], unique=False)
+        batch_op.create_index('ix_attempt_session_module_correct', ['session_id', 'module_slug', 'correct', 'question_id'], unique=False)
+
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('module_slug', sa.String(length=100), nullable=True))
+    op.execute(f"UPDATE module_progress SET module_slug = {key_name.format(table='module_progress')}")
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_module_progress_module_key_id'))
+        batch_op.drop_index('ix_progress_session_state')
+        batch_op.drop_constraint('uq_session_module', type_='unique')
+        batch_op.drop_constraint('fk_module_progress_module_key', type_='foreignkey')
+        batch_op.drop_column('module_key_id')
+        batch_op.alter_column('module_slug', existing_type=sa.String(length=100), nullable=False)
+        batch_op.create_unique_constraint('uq_session_module', ['session_id', 'module_slug'])
+        batch_op.create_index('ix_progress_session_state', ['session_id', 'module_slug', 'completed', 'last_accessed_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_module_progress_module_slug'), ['module_slug'], unique=False)
+
+    op.drop_table('pages')
+    op.drop_table('module_keys')
@@ -0,0 +1,144 @@
+"""learner_sessions table; progress tables key rows by learner_id
+
+Replaces the client-generated session_id string in module_progress,
+quiz_attempts, quiz_states and progress_events with an integer id into
+learner_sessions. Every existing session_id becomes a learner_sessions row
+(legacy_id), so cookies issued before this keep resolving to their rows.
+
+Revision ID: d7e3b9a1f604
+Revises: c5a8e2f47b13
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e3b9a1f604'
+down_revision = 'c5a8e2f47b13'
+branch_labels = None
+depends_on = None
+
+
+def _quiz_states_table(name, learner_column):
+    return op.create_table(name,
+    learner_column,
+    sa.Column('module_key_id', sa.Integer(), nullable=False),
+    sa.Column('solved', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['module_key_id'], ['module_keys.id'], name='fk_quiz_states_module_key'),
+    sa.PrimaryKeyConstraint(learner_column.name, 'module_key_id')
+    )
+
+
+def upgrade():
+    op.create_table('learner_sessions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('legacy_id', sa.String(length=64), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('legacy_id')
+    )
+    op.execute(
+        "INSERT INTO learner_sessions (legacy_id, created_at) "
+        "SELECT session_id, min(seen_at) FROM ("
+        "SELECT session_id, last_accessed_at AS seen_at FROM module_progress UNION ALL "
+        "SELECT session_id, created_at FROM quiz_attempts UNION ALL "
+        "SELECT session_id, updated_at FROM quiz_states UNION ALL "
+        "SELECT session_id, created_at FROM progress_events"
+        ") AS seen GROUP BY session_id"
+    )
+
+    learner_id = "(SELECT id FROM learner_sessions WHERE learner_sessions.legacy_id = {table}.session_id)"
+
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('learner_id', sa.Integer(), nullable=True))
+    op.execute(f"UPDATE module_progress SET learner_id = {learner_id.format(table='module_progress')}")
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.drop_index('ix_progress_session_state')
+        batch_op.drop_constraint('uq_session_module', type_='unique')
+        batch_op.drop_column('session_id')
+        batch_op.alter_column('learner_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_module_progress_learner', 'learner_sessions', ['learner_id'], ['id'])
+        batch_op.create_unique_constraint('uq_session_module', ['learner_id', 'module_key_id'])
+        batch_op.create_index('ix_progress_session_state', ['learner_id', 'module_key_id', 'completed', 'last_accessed_at'], unique=False)
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('learner_id', sa.Integer(), nullable=True))
+    op.execute(f"UPDATE quiz_attempts SET learner_id = {learner_id.format(table='quiz_attempts')}")
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.drop_index('ix_attempt_session_module_correct')
+        batch_op.drop_column('session_id')
+        batch_op.alter_column('learner_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_quiz_attempts_learner', 'learner_sessions', ['learner_id'], ['id'])
+        batch_op.create_index('ix_attempt_session_module_correct', ['learner_id', 'module_key_id', 'correct', 'question_id'], unique=False)
+
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('learner_id', sa.Integer(), nullable=True))
+    op.execute(f"UPDATE progress_events SET learner_id = {learner_id.format(table='progress_events')}")
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_session_created')
+        batch_op.drop_column('session_id')
+        batch_op.alter_column('learner_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_progress_events_learner', 'learner_sessions', ['learner_id'], ['id'])
+        batch_op.create_index('ix_event_session_created', ['learner_id', 'created_at'], unique=False)
+
+    # session_id is part of quiz_states' primary key, so copy into a rebuilt table
+    _quiz_states_table('quiz_states_by_learner', sa.Column(
+        'learner_id', sa.Integer(), sa.ForeignKey('learner_sessions.id', name='fk_quiz_states_learner'), nullable=False
+    ))
+    op.execute(
+        "INSERT INTO quiz_states_by_learner (learner_id, module_key_id, solved, updated_at) "
+        "SELECT learner_sessions.id, quiz_states.module_key_id, quiz_states.solved, quiz_states.updated_at "
+        "FROM quiz_states JOIN learner_sessions ON learner_sessions.legacy_id = quiz_states.session_id"
+    )
+    op.drop_table('quiz_states')
+    op.rename_table('quiz_states_by_learner', 'quiz_states')
+
+
+def downgrade():
+    # Server-issued sessions never had a client id; give them a stable stand-in
+    session_id = "(SELECT COALESCE(legacy_id, 'learner-' || CAST(id AS VARCHAR(20))) FROM learner_sessions WHERE learner_sessions.id = {table}.learner_id)"
+
+    _quiz_states_table('quiz_states_by_session', sa.Column('session_id', sa.String(length=64), nullable=False))
+    op.execute(
+        "INSERT INTO quiz_states_by_session (session_id, module_key_id, solved, updated_at) "
+        f"SELECT {session_id.format(table='quiz_states')}, module_key_id, solved, updated_at FROM quiz_states"
+    )
+    op.drop_table('quiz_states')
+    op.rename_table('quiz_states_by_session', 'quiz_states')
+
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('session_id', sa.String(length=64), nullable=True))
+    op.execute(f"UPDATE progress_events SET session_id = {session_id.format(table='progress_events')}")
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_session_created')
+        batch_op.drop_constraint('fk_progress_events_learner', type_='foreignkey')
+        batch_op.drop_column('learner_id')
+        batch_op.alter_column('session_id', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index('ix_event_session_created', ['session_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('session_id', sa.String(length=64), nullable=True))
+    op.execute(f"UPDATE quiz_attempts SET session_id = {session_id.format(table='quiz_attempts')}")
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.drop_index('ix_attempt_session_module_correct')
+        batch_op.drop_constraint('fk_quiz_attempts_learner', type_='foreignkey')
+        batch_op.drop_column('learner_id')
+        batch_op.alter_column('session_id', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index('ix_attempt_session_module_correct', ['session_id', 'module_key_id', 'correct', 'question_id'], unique=False)
+
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('session_id', sa.String(length=64), nullable=True))
+    op.execute(f"UPDATE module_progress SET session_id = {session_id.format(table='module_progress')}")
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.drop_index('ix_progress_session_state')
+        batch_op.drop_constraint('uq_session_module', type_='unique')
+        batch_op.drop_constraint('fk_module_progress_learner', type_='foreignkey')
+        batch_op.drop_column('learner_id')
+        batch_op.alter_column('session_id', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_unique_constraint('uq_session_module', ['session_id', 'module_key_id'])
+        batch_op.create_index('ix_progress_session_state', ['session_id', 'module_key_id', 'completed', 'last_accessed_at'], unique=False)
+
+    op.drop_table('learner_sessions')
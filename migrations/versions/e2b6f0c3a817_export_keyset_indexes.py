@@ -0,0 +1,51 @@
+"""(time, id) and (module_key_id, time, id) indexes for keyset exports
+
+The per-module indexes replace the single-column module_key_id indexes on
+module_progress and quiz_attempts, which are their leading prefix.
+
+Revision ID: e2b6f0c3a817
+Revises: d7e3b9a1f604
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6f0c3a817'
+down_revision = 'd7e3b9a1f604'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quiz_attempts_module_key_id'))
+        batch_op.create_index('ix_attempt_created', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_attempt_module_created', ['module_key_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.create_index('ix_event_created', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_event_module_created', ['module_key_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_module_progress_module_key_id'))
+        batch_op.create_index('ix_progress_updated', ['updated_at', 'id'], unique=False)
+        batch_op.create_index('ix_progress_module_updated', ['module_key_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('module_progress', schema=None) as batch_op:
+        batch_op.drop_index('ix_progress_module_updated')
+        batch_op.drop_index('ix_progress_updated')
+        batch_op.create_index(batch_op.f('ix_module_progress_module_key_id'), ['module_key_id'], unique=False)
+
+    with op.batch_alter_table('progress_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_module_created')
+        batch_op.drop_index('ix_event_created')
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.drop_index('ix_attempt_module_created')
+        batch_op.drop_index('ix_attempt_created')
+        batch_op.create_index(batch_op.f('ix_quiz_attempts_module_key_id'), ['module_key_id'], unique=False)
@@ -0,0 +1,49 @@
+"""event_daily_counts rollup table and job_watermarks
+
+Daily per-(module key, event type) counts of progress_events, filled
+incrementally by `flask events rollup` from the watermark in job_watermarks.
+
+Revision ID: f4c9d2a7b351
+Revises: e2b6f0c3a817
+Create Date: 2026-10-18 06:23:03.594609
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c9d2a7b351'
+down_revision = 'e2b6f0c3a817'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('position_at', sa.DateTime(), nullable=True),
+    sa.Column('position_id', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('event_daily_counts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('module_key_id', sa.Integer(), nullable=True),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['module_key_id'], ['module_keys.id'], name='fk_event_daily_counts_module_key'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'module_key_id', 'event_type', name='uq_event_daily_count')
+    )
+    with op.batch_alter_table('event_daily_counts', schema=None) as batch_op:
+        batch_op.create_index('ix_event_daily_module_day', ['module_key_id', 'day'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('event_daily_counts', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_daily_module_day')
+
+    op.drop_table('event_daily_counts')
+    op.drop_table('job_watermarks')
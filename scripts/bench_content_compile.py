@@ -0,0 +1,110 @@
+# scripts/bench_content_compile.py
+"""
+Compile benchmark for file-based (Markdown/YAML) courses.
+
+Generates a synthetic catalog and times a full rebuild with an empty compile
+cache, a rebuild with nothing changed, and a rebuild after editing a single
+module file. Each rebuild uses a fresh CompileCache over the same directory,
+as a new worker or `flask content build` would.
+
+Usage:
+  python scripts/bench_content_compile.py [--courses 10] [--modules 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from app.content import markdown_course  # noqa: E402
+
+COURSE_YAML = """slug: course-{c}
+title: Synthetic course {c}
+summary: Generated for benchmarking.
+duration: ~1 hour
+level: Intermediate
+hero_image: /static/images/hero.png
+thumbnail: /static/images/thumb.png
+og_image: /static/images/hero.png
+"""
+
+MODULE_MD = """---
+title: Module {m}
+summary: Generated module {m}.
+resources:
+  - {{label: Reference, url: "https://example.com/{m}"}}
+guardrails: ["Verify outputs before sharing."]
+---
+## Objectives
+- Understand **topic {m}**
+- Apply it to a *real* task
+- Keep [records](https://example.com/records)
+
+## Details
+{body}
+
+| Step | Owner |
+|------|-------|
+| Draft | You |
+| Review | Team |
+
+## Practice
+1. Summarize a document.
+2. Draft a reply.
+"""
+
+
+def generate(root, courses, modules):
+    body = " ".join(["Plain paragraph text with `code` and emphasis."] * 20)
+    paths = []
+    for c in range(courses):
+        course_dir = os.path.join(root, f"course_{c}")
+        os.makedirs(os.path.join(course_dir, markdown_course.MODULES_DIR))
+        with open(os.path.join(course_dir, markdown_course.COURSE_FILE), "w") as f:
+            f.write(COURSE_YAML.format(c=c))
+        for m in range(modules):
+            path = os.path.join(course_dir, markdown_course.MODULES_DIR, f"{m:03d}-module-{m}.md")
+            with open(path, "w") as f:
+                f.write(MODULE_MD.format(m=m, body=f"Course {c}. {body}"))
+            paths.append(path)
+    return paths
+
+
+def rebuild(root, cache_dir):
+    cache = markdown_course.CompileCache(cache_dir)
+    t0 = time.perf_counter()
+    total = 0
+    for name in sorted(os.listdir(root)):
+        course_dir = os.path.join(root, name)
+        markdown_course.read_course_meta(course_dir, cache)
+        modules, _ = markdown_course.read_course_body(course_dir, cache)
+        total += len(modules)
+    return (time.perf_counter() - t0) * 1000, total, cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=10)
+    parser.add_argument("--modules", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "content")
+        cache_dir = os.path.join(tmp, "cache")
+        paths = generate(root, args.courses, args.modules)
+
+        for label in ("cold (empty cache)", "warm (no changes)"):
+            ms, total, cache = rebuild(root, cache_dir)
+            print(f"{label:>22}: {ms:8.1f} ms  {total} modules  hits={cache.hits} misses={cache.misses}")
+
+        with open(paths[len(paths) // 2], "a") as f:
+            f.write("\nOne more edited line.\n")
+        ms, total, cache = rebuild(root, cache_dir)
+        print(f"{'one module edited':>22}: {ms:8.1f} ms  {total} modules  hits={cache.hits} misses={cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# scripts/bench_content_memory.py
+"""
+Memory benchmark: per-course dataclasses vs. the shared content types.
+
+Builds a large synthetic catalog twice, once with the old per-package style
+(plain dataclasses, dict options, list-of-dict resources, a fresh slug string
+per object) and once with app.content.types. It reports the heap that
+tracemalloc attributes to each catalog, plus the cost of the attribute reads
+the render and grading paths make.
+
+Usage:
+  python scripts/bench_content_memory.py [--courses 200] [--modules 40] [--questions 8]
+"""
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from app.content import types  # noqa: E402
+
+
+# --- Legacy shapes, as each course package used to define them ---
+
+@dataclass
+class LegacySection:
+    title: str
+    content: str
+
+
+@dataclass
+class LegacyModule:
+    slug: str
+    title: str
+    summary: str
+    sections: List[LegacySection]
+    resources: List[Dict[str, str]] = field(default_factory=list)
+    guardrails: List[str] = field(default_factory=list)
+
+
+@dataclass
+class LegacyQuestion:
+    id: str
+    prompt: str
+    options: Dict[str, str]
+    correct: str
+    help: Optional[str] = None
+
+
+def _slug(c, m):
+    # Built at runtime so every object gets its own string, as separate
+    # course files loaded by separate imports do.
+    return "-".join(["course", str(c), "module", str(m)])
+
+
+def build_catalog(kind, courses, modules, questions):
+    shared = kind == "shared"
+    Section = types.ModuleSection if shared else LegacySection
+    Module = types.Module if shared else LegacyModule
+    Question = types.QuizQuestion if shared else LegacyQuestion
+    catalog = []
+    for c in range(courses):
+        mods, quizzes = [], {}
+        for m in range(modules):
+            slug = _slug(c, m)
+            mods.append(Module(
+                slug=slug,
+                title=f"Module {m}",
+                summary="A short summary of the module.",
+                sections=[Section(f"Section {s}", "Body text. " * 40) for s in range(4)],
+                resources=[{"label": f"Link {r}", "url": f"https://example.com/{r}"} for r in range(3)],
+                guardrails=["Check outputs.", "Protect data."],
+            ))
+            quizzes[_slug(c, m)] = [
+                Question(
+                    id="".join(["q", str(q)]),
+                    prompt="Which option is right?",
+                    options={"a": "First", "b": "Second", "c": "Third", "d": "Fourth"},
+                    correct="".join(["b"]),
+                    help="Because it is.",
+                )
+                for q in range(questions)
+            ]
+        catalog.append((mods, quizzes))
+    return catalog
+
+
+def measure(kind, args):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    catalog = build_catalog(kind, args.courses, args.modules, args.questions)
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return catalog, used
+
+
+def access_cost(catalog, shared):
+    mods, quizzes = catalog[0]
+    module = mods[len(mods) // 2]
+
+    def render():
+        for s in module.sections:
+            s.title, s.content
+        for r in module.resources:
+            (r.label, r.url) if shared else (r["label"], r["url"])
+
+    def grade():
+        for q in quizzes[module.slug]:
+            if q.id == "q3":
+                return q.correct == "b"
+
+    n = 200_000
+    return (
+        min(timeit.repeat(render, number=n, repeat=5)) / n * 1e9,
+        min(timeit.repeat(grade, number=n, repeat=5)) / n * 1e9,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--modules", type=int, default=40)
+    parser.add_argument("--questions", type=int, default=8)
+    args = parser.parse_args()
+
+    total_modules = args.courses * args.modules
+    print(f"catalog: {args.courses} courses, {total_modules} modules, "
+          f"{total_modules * args.questions} questions")
+
+    results = {}
+    for kind in ("legacy", "shared"):
+        catalog, used = measure(kind, args)
+        render_ns, grade_ns = access_cost(catalog, kind == "shared")
+        results[kind] = used
+        print(f"{kind:>7}: {used / 2**20:8.1f} MiB  "
+              f"({used / total_modules:7.0f} B/module)  "
+              f"render {render_ns:6.0f} ns  grade {grade_ns:5.0f} ns")
+        del catalog
+
+    saved = 1 - results["shared"] / results["legacy"]
+    print(f"shared types use {saved:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# scripts/bench_content_startup.py
+"""
+Startup benchmark: live course discovery vs. the precompiled content snapshot.
+
+Each trial runs in a fresh interpreter so import costs are included, and
+measures the time until the full catalog (courses, modules, quizzes) is
+available to the loader.
+
+Usage:
+  python scripts/bench_content_startup.py [--trials 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+TRIAL = r"""
+import time, sys
+sys.path.insert(0, {root!r})
+import app  # Flask/SQLAlchemy imports are shared by both paths; keep them out of the timing
+t0 = time.perf_counter()
+from app.content import loader
+loader._SNAPSHOT_PATH = {path!r}
+if {mode!r} == "snapshot":
+    assert loader.load_snapshot(), "snapshot missing or stale"
+courses = loader.discover_courses()
+for c in courses:
+    loader.get_course_quizzes(c["slug"])
+print(time.perf_counter() - t0)
+"""
+
+
+def run_trials(mode, path, trials):
+    code = TRIAL.format(root=ROOT, path=path, mode=mode)
+    samples = []
+    for _ in range(trials):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+        samples.append(float(out.stdout.strip()) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=15)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from app.content import loader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "content.snapshot")
+        info = loader.build_snapshot(path)
+        print(f"snapshot: {info['courses']} courses, {info['modules']} modules, {info['bytes']} bytes")
+
+        for mode in ("live", "snapshot"):
+            samples = run_trials(mode, path, args.trials)
+            print(
+                f"{mode:>8}: median {statistics.median(samples):7.2f} ms  "
+                f"min {min(samples):7.2f} ms  max {max(samples):7.2f} ms  (n={len(samples)})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# scripts/bench_dimension_size.py
+"""
+Table/index size and session-scan timing across the dimension migrations:
+module_keys / pages (c5a8e2f47b13), then learner_sessions (d7e3b9a1f604).
+
+Builds a SQLite database at the revision before them, fills it with
+synthetic learners (progress rows, quiz attempts and events with page
+paths), then measures the bytes per table and index (dbstat) and the time
+for session-scoped reads. It then runs each migration in turn, whose
+backfill converts the same rows to dimension ids, VACUUMs and measures
+again. Once sessions are integers the reads are keyed by learner id, as the
+API resolves a token (or a cached legacy id) before querying.
+
+Usage:
+  python scripts/bench_dimension_size.py [--learners 2000] [--modules 40] [--events 30]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+import flask_migrate  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+
+BEFORE, KEYS, LEARNERS = "8e4f1c6a2d90", "c5a8e2f47b13", "d7e3b9a1f604"
+TABLES = ("module_progress", "quiz_attempts", "quiz_states", "progress_events", "module_keys", "pages",
+          "learner_sessions")
+
+SESSION_READS = {
+    BEFORE: [
+        "SELECT module_slug, completed, last_accessed_at FROM module_progress WHERE session_id = :s",
+        "SELECT id, event_type, module_slug, page, created_at FROM progress_events "
+        "WHERE session_id = :s AND created_at >= :since ORDER BY created_at",
+    ],
+    KEYS: [
+        "SELECT module_keys.name, completed, last_accessed_at FROM module_progress "
+        "JOIN module_keys ON module_keys.id = module_progress.module_key_id WHERE session_id = :s",
+        "SELECT id, event_type, module_key_id, page_id, created_at FROM progress_events "
+        "WHERE session_id = :s AND created_at >= :since ORDER BY created_at",
+    ],
+    LEARNERS: [
+        "SELECT module_keys.name, completed, last_accessed_at FROM module_progress "
+        "JOIN module_keys ON module_keys.id = module_progress.module_key_id WHERE learner_id = :s",
+        "SELECT id, event_type, module_key_id, page_id, created_at FROM progress_events "
+        "WHERE learner_id = :s AND created_at >= :since ORDER BY created_at",
+    ],
+}
+
+
+def fill(conn, args):
+    rng = random.Random(7)
+    now = datetime(2026, 10, 1)
+    keys = [f"course-{c}:module-{m:02d}-{'x' * 24}" for c in range(1, 5) for m in range(args.modules // 4)]
+    progress, attempts, states, events = [], [], [], []
+    for l in range(args.learners):
+        session_id = f"{l:032x}"
+        for key in rng.sample(keys, k=min(len(keys), 10)):
+            progress.append({"s": session_id, "k": key, "c": rng.random() < 0.5, "t": now})
+            attempts.extend({"s": session_id, "k": key, "q": f"q{q}", "ok": rng.random() < 0.6, "t": now}
+                            for q in range(3))
+            states.append({"s": session_id, "k": key, "solved": ",q0,q2,", "t": now})
+        for i in range(args.events):
+            key = rng.choice(keys)
+            course, module = key.split(":")
+            events.append({"s": session_id, "k": key, "p": f"/courses/{course}/modules/{module}",
+                           "t": now + timedelta(minutes=i)})
+    conn.execute(text("INSERT INTO module_progress (session_id, module_slug, completed, last_accessed_at, updated_at) "
+                      "VALUES (:s, :k, :c, :t, :t)"), progress)
+    conn.execute(text("INSERT INTO quiz_attempts (session_id, module_slug, question_id, selected, correct, created_at) "
+                      "VALUES (:s, :k, :q, 'a', :ok, :t)"), attempts)
+    conn.execute(text("INSERT INTO quiz_states (session_id, module_slug, solved, updated_at) "
+                      "VALUES (:s, :k, :solved, :t)"), states)
+    conn.execute(text("INSERT INTO progress_events (session_id, event_type, module_slug, page, created_at) "
+                      "VALUES (:s, 'view', :k, :p, :t)"), events)
+
+
+def sizes(conn):
+    rows = conn.execute(text(
+        "SELECT tbl_name, type, sum(pgsize) FROM dbstat JOIN sqlite_master ON dbstat.name = sqlite_master.name "
+        "GROUP BY tbl_name, type"
+    )).all()
+    out = {}
+    for table, kind, size in rows:
+        entry = out.setdefault(table, {"table": 0, "index": 0})
+        entry[kind] += size
+    return out
+
+
+def time_reads(conn, revision, args):
+    rng = random.Random(11)
+    sessions = [f"{rng.randrange(args.learners):032x}" for _ in range(args.reads)]
+    if revision == LEARNERS:
+        ids = dict(conn.execute(text("SELECT legacy_id, id FROM learner_sessions")).all())
+        sessions = [ids[session_id] for session_id in sessions]
+    since = datetime(2026, 10, 1)
+    t0 = time.perf_counter()
+    for session_id in sessions:
+        for sql in SESSION_READS[revision]:
+            conn.execute(text(sql), {"s": session_id, "since": since}).all()
+    return (time.perf_counter() - t0) / len(sessions) * 1e6
+
+
+def measure(app, revision, args):
+    with app.app_context():
+        db.engine.dispose()
+        with db.engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+            result = sizes(conn), time_reads(conn, revision, args)
+        db.engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--learners", type=int, default=2000)
+    parser.add_argument("--modules", type=int, default=40, help="distinct course:module keys")
+    parser.add_argument("--events", type=int, default=30, help="events per learner")
+    parser.add_argument("--reads", type=int, default=500, help="sessions read for the timing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'dims.db')}",
+            "CONTENT_SNAPSHOT_ENABLED": False,
+            "SQLITE_CHECKPOINT_INTERVAL": 0,
+        })
+        with app.app_context():
+            flask_migrate.upgrade(revision=BEFORE)
+            with db.engine.begin() as conn:
+                fill(conn, args)
+        steps = [(BEFORE, *measure(app, BEFORE, args), 0.0)]
+        for revision in (KEYS, LEARNERS):
+            with app.app_context():
+                t0 = time.perf_counter()
+                flask_migrate.upgrade(revision=revision)
+                migrate_s = time.perf_counter() - t0
+            steps.append((revision, *measure(app, revision, args), migrate_s))
+
+    empty = {"table": 0, "index": 0}
+    print(f"{'KiB (table/index)':<18}" + "".join(f"{revision:>22}" for revision, *_ in steps))
+    for table in TABLES:
+        cells = (step[1].get(table, empty) for step in steps)
+        print(f"{table:<18}" + "".join(f"{c['table'] // 1024:>14} /{c['index'] // 1024:>6}" for c in cells))
+    print(f"{'total':<18}" + "".join(
+        f"{sum(v['table'] + v['index'] for v in step[1].values()) // 1024:>22}" for step in steps
+    ))
+    print(f"{'session reads (us)':<18}" + "".join(f"{step[2]:>22.0f}" for step in steps))
+    print(f"{'migration (s)':<18}" + "".join(f"{step[3]:>22.1f}" for step in steps))
+
+
+if __name__ == "__main__":
+    main()
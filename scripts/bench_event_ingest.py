@@ -0,0 +1,90 @@
+# scripts/bench_event_ingest.py
+"""
+Event ingestion benchmark: one POST /api/event per event vs. batched POST /api/events.
+
+Uses the Flask test client against a file-backed SQLite database (so each
+commit pays a real fsync) and reports requests, commits and wall time for
+the same set of learner events.
+
+Usage:
+  python scripts/bench_event_ingest.py [--learners 20] [--events 30] [--batch 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import event
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from app import create_app, db  # noqa: E402
+
+
+def make_events(learners, per_learner):
+    return [
+        {"session_id": f"learner-{l:04d}", "event_type": "view" if i % 3 else "quiz_answer",
+         "module_slug": f"course-1:module-{i % 10}", "page": f"/courses/course-1/modules/module-{i % 10}"}
+        for l in range(learners) for i in range(per_learner)
+    ]
+
+
+def run(mode, events, batch, db_path):
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "CONTENT_SNAPSHOT_ENABLED": False,
+        "PAGE_CACHE_ENABLED": False,
+    })
+    commits = 0
+
+    def on_commit(conn):
+        nonlocal commits
+        commits += 1
+
+    with app.app_context():
+        db.create_all()
+        event.listen(db.engine, "commit", on_commit)
+        client = app.test_client()
+        requests = 0
+        t0 = time.perf_counter()
+        if mode == "single":
+            for evt in events:
+                client.post("/api/event", json=evt)
+                requests += 1
+        else:
+            # What main.js sends: each learner's queue, flushed in chunks
+            by_learner = {}
+            for evt in events:
+                by_learner.setdefault(evt["session_id"], []).append(evt)
+            for queue in by_learner.values():
+                for i in range(0, len(queue), batch):
+                    client.post("/api/events", json={"events": queue[i:i + batch]})
+                    requests += 1
+        elapsed = time.perf_counter() - t0
+        event.remove(db.engine, "commit", on_commit)
+        db.session.remove()
+        db.engine.dispose()
+    return requests, commits, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--learners", type=int, default=20)
+    parser.add_argument("--events", type=int, default=30, help="events per learner")
+    parser.add_argument("--batch", type=int, default=50, help="client batch size (EVENT_BATCH_SIZE in main.js)")
+    args = parser.parse_args()
+
+    events = make_events(args.learners, args.events)
+    print(f"{len(events)} events from {args.learners} learners")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("single", "batched"):
+            requests, commits, elapsed = run(mode, events, args.batch, os.path.join(tmp, f"{mode}.db"))
+            print(f"{mode:>8}: {requests:5d} requests  {commits:5d} commits  {elapsed * 1000:8.1f} ms  "
+                  f"({elapsed / len(events) * 1e6:6.0f} us/event)")
+
+
+if __name__ == "__main__":
+    main()
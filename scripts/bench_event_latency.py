@@ -0,0 +1,78 @@
+# scripts/bench_event_latency.py
+"""
+Latency of POST /api/event with synchronous inserts vs. the write-behind buffer.
+
+An artificial delay is added to every INSERT (standing in for a slow or
+contended database) and per-request latency percentiles are reported for
+both modes. With the buffer, requests only pay for enqueueing; the delay is
+paid by the background flusher once per batch.
+
+Usage:
+  python scripts/bench_event_latency.py [--requests 2000] [--insert-ms 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import event
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from app import create_app, db  # noqa: E402
+from app.models.progress import ProgressEvent  # noqa: E402
+
+
+def run(buffered, args, db_path):
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "CONTENT_SNAPSHOT_ENABLED": False,
+        "EVENT_BUFFER_ENABLED": buffered,
+        "EVENT_BUFFER_FLUSH_INTERVAL": 0.2,
+    })
+
+    def slow_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            time.sleep(args.insert_ms / 1000)
+
+    with app.app_context():
+        db.create_all()
+        event.listen(db.engine, "before_cursor_execute", slow_insert)
+        client = app.test_client()
+        samples = []
+        for i in range(args.requests):
+            t0 = time.perf_counter()
+            client.post("/api/event", json={"session_id": f"s{i % 50}", "event_type": "view",
+                                            "module_slug": "course-1:introduction"})
+            samples.append((time.perf_counter() - t0) * 1000)
+        buffer = app.extensions.get("event_buffer")
+        if buffer is not None:
+            buffer.close()
+        rows = db.session.query(ProgressEvent).count()
+        event.remove(db.engine, "before_cursor_execute", slow_insert)
+    return samples, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--insert-ms", type=float, default=20.0, help="artificial delay per INSERT")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for buffered in (False, True):
+            label = "buffered" if buffered else "sync"
+            requests = args.requests if buffered else min(args.requests, 200)
+            samples, rows = run(buffered, argparse.Namespace(**{**vars(args), "requests": requests}),
+                                os.path.join(tmp, f"{label}.db"))
+            q = statistics.quantiles(samples, n=100)
+            print(f"{label:>8}: {requests} requests  p50 {q[49]:7.2f} ms  p99 {q[98]:7.2f} ms  "
+                  f"max {max(samples):7.2f} ms  rows written {rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# scripts/bench_progress_upsert.py
+"""
+Concurrency benchmark for POST /api/progress: SELECT-then-INSERT vs. native upsert.
+
+Many writer threads post progress for a small pool of (session, module) keys,
+so first writes for the same key race each other. The legacy path (the old
+upsert_progress body, mounted on a bench-only route) is compared with the
+INSERT ... ON CONFLICT endpoint; each run reports throughput, failed requests
+and integrity errors, and checks that one row exists per key and that
+completion stayed sticky. For the upsert endpoint it also checks that the
+module_stats started/completed counters it maintains match the rows.
+
+Usage:
+  python scripts/bench_progress_upsert.py [--writers 32] [--requests 100] [--keys 50]
+  python scripts/bench_progress_upsert.py --database-url postgresql://...   # default: temp SQLite file
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from flask import jsonify, request
+from sqlalchemy.exc import IntegrityError
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from app import create_app, db  # noqa: E402
+from app.models.analytics import ModuleStats  # noqa: E402
+from app.models.dimensions import LearnerSession, ModuleKey  # noqa: E402
+from app.models.progress import ModuleProgress  # noqa: E402
+from app.utils.dimensions import module_keys  # noqa: E402
+from app.utils.learner_sessions import learner_sessions  # noqa: E402
+
+
+def make_app(database_url):
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "SQLALCHEMY_ENGINE_OPTIONS": {"connect_args": {"timeout": 30}} if database_url.startswith("sqlite") else {},
+        "CONTENT_SNAPSHOT_ENABLED": False,
+    })
+    integrity_errors = []
+
+    def legacy_upsert_progress():
+        payload = request.get_json(silent=True) or {}
+        module_key_id = module_keys().id_for(payload["module_slug"])
+        learner_id = learner_sessions().id_for(payload["session_id"])
+        try:
+            row = ModuleProgress.query.filter_by(learner_id=learner_id, module_key_id=module_key_id).first()
+            if not row:
+                row = ModuleProgress(learner_id=learner_id, module_key_id=module_key_id)
+                db.session.add(row)
+            row.completed = bool(payload.get("completed")) or row.completed
+            row.last_accessed_at = datetime.utcnow()
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            integrity_errors.append(1)
+            return jsonify({"status": "error"}), 409
+        return jsonify({"status": "success"})
+
+    app.add_url_rule("/bench/legacy-progress", view_func=legacy_upsert_progress, methods=["POST"])
+    return app, integrity_errors
+
+
+def run(endpoint, args, database_url):
+    app, integrity_errors = make_app(database_url)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    keys = [(f"learner-{k % 10}", f"course-1:module-{k}") for k in range(args.keys)]
+    # The last request per key always marks it complete; earlier ones are random
+    completed_keys = set()
+    lock = threading.Lock()
+    statuses = []
+    start = threading.Barrier(args.writers)
+
+    def writer(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        local = []
+        start.wait()
+        for _ in range(args.requests):
+            session_id, module_slug = rng.choice(keys)
+            completed = rng.random() < 0.2
+            if completed:
+                with lock:
+                    completed_keys.add((session_id, module_slug))
+            try:
+                resp = client.post(endpoint, json={"session_id": session_id, "module_slug": module_slug,
+                                                   "completed": completed})
+                local.append(resp.status_code)
+            except Exception:
+                local.append(500)
+        with lock:
+            statuses.extend(local)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    with app.app_context():
+        rows = db.session.execute(
+            db.select(LearnerSession.legacy_id, ModuleKey.name, ModuleProgress.completed)
+            .join(LearnerSession).join(ModuleKey)
+        ).all()
+        completed_rows = {(session_id, key) for session_id, key, completed in rows if completed}
+        row_keys = [(session_id, key) for session_id, key, _ in rows]
+        expected = {}
+        for _, key, completed in rows:
+            started_n, completed_n = expected.get(key, (0, 0))
+            expected[key] = (started_n + 1, completed_n + int(completed))
+        counters = {
+            key: (started_n, completed_n) for key, started_n, completed_n in db.session.execute(
+                db.select(ModuleKey.name, ModuleStats.started, ModuleStats.completed).join(ModuleKey)
+            )
+        }
+        db.session.remove()
+        db.engine.dispose()
+    return {
+        "requests": len(statuses),
+        "failed": sum(1 for s in statuses if s != 200),
+        "integrity_errors": len(integrity_errors),
+        "throughput": len(statuses) / elapsed,
+        "duplicate_rows": len(row_keys) - len(set(row_keys)),
+        # Completion lost by the legacy read-modify-write race shows up here
+        "lost_completions": len(completed_keys - completed_rows),
+        # Modules whose module_stats counters disagree with the rows (only the upsert endpoint keeps them)
+        "counter_drift": sum(1 for key in expected.keys() | counters.keys() if expected.get(key) != counters.get(key))
+        if counters else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=100, help="requests per writer")
+    parser.add_argument("--keys", type=int, default=50, help="distinct (session, module) keys")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, endpoint in (("select+insert", "/bench/legacy-progress"), ("upsert", "/api/progress")):
+            url = args.database_url or f"sqlite:///{os.path.join(tmp, label.replace('+', '_'))}.db"
+            r = run(endpoint, args, url)
+            print(f"{label:>14}: {r['requests']} requests  {r['throughput']:7.0f} req/s  failed {r['failed']}  "
+                  f"integrity errors {r['integrity_errors']}  duplicate rows {r['duplicate_rows']}  "
+                  f"lost completions {r['lost_completions']}"
+                  + (f"  counter drift {r['counter_drift']}" if r["counter_drift"] is not None else ""))
+
+
+if __name__ == "__main__":
+    main()
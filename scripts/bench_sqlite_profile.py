@@ -0,0 +1,125 @@
+# scripts/bench_sqlite_profile.py
+"""
+Mixed read/write API benchmark for the SQLite connection profile.
+
+Forks several worker processes (like gunicorn workers), each with its own
+app and engine, against one SQLite file. Every worker sends a mix of
+GET /api/progress (reads), POST /api/progress (upserts) and POST /api/events
+(synchronous inserts, with the event buffer off). It runs once with the
+driver defaults (SQLITE_TUNING=0: rollback journal, synchronous=FULL) and
+once with the profile (WAL, synchronous=NORMAL, busy_timeout, mmap, ...),
+and reports throughput, latency percentiles and failed requests
+("database is locked").
+
+Usage:
+  python scripts/bench_sqlite_profile.py [--workers 4] [--requests 300] [--write-ratio 0.3]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from app import create_app, db  # noqa: E402
+
+
+def make_app(db_path, tuned):
+    return create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "CONTENT_SNAPSHOT_ENABLED": False,
+        "PAGE_CACHE_ENABLED": False,
+        "EVENT_BUFFER_ENABLED": False,
+        "SQLITE_TUNING": tuned,
+        "SQLITE_CHECKPOINT_INTERVAL": 1.0,
+    })
+
+
+def worker(seed, db_path, tuned, args, barrier, results):
+    app = make_app(db_path, tuned)
+    client = app.test_client()
+    rng = random.Random(seed)
+    latencies, failed = [], 0
+    barrier.wait()
+    for _ in range(args.requests):
+        session_id = f"learner-{rng.randrange(args.learners):04d}"
+        module = f"course-1:module-{rng.randrange(10)}"
+        roll = rng.random()
+        t0 = time.perf_counter()
+        try:
+            if roll < args.write_ratio / 2:
+                resp = client.post("/api/progress", json={"session_id": session_id, "module_slug": module,
+                                                          "completed": rng.random() < 0.2})
+            elif roll < args.write_ratio:
+                resp = client.post("/api/events", json={"events": [
+                    {"session_id": session_id, "event_type": "view", "module_slug": module} for _ in range(5)
+                ]})
+            else:
+                resp = client.get(f"/api/progress?session_id={session_id}")
+            ok = resp.status_code < 500
+        except Exception:
+            ok = False
+        latencies.append(time.perf_counter() - t0)
+        failed += not ok
+    with app.app_context():
+        db.engine.dispose()
+    results.put((latencies, failed))
+
+
+def run(tuned, args, db_path):
+    app = make_app(db_path, tuned)
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(args.workers + 1)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(i, db_path, tuned, args, barrier, results)) for i in range(args.workers)]
+    for p in procs:
+        p.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    collected = [results.get() for _ in procs]
+    elapsed = time.perf_counter() - t0
+    for p in procs:
+        p.join()
+
+    latencies = sorted(lat for lats, _ in collected for lat in lats)
+    failed = sum(f for _, f in collected)
+
+    def pct(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    return {
+        "requests": len(latencies),
+        "failed": failed,
+        "throughput": len(latencies) / elapsed,
+        "p50": pct(0.50),
+        "p99": pct(0.99),
+        "max": latencies[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="worker processes")
+    parser.add_argument("--requests", type=int, default=300, help="requests per worker")
+    parser.add_argument("--write-ratio", type=float, default=0.3, help="share of requests that write")
+    parser.add_argument("--learners", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, tuned in (("defaults", False), ("profile", True)):
+            r = run(tuned, args, os.path.join(tmp, f"{label}.db"))
+            print(f"{label:>9}: {r['requests']} requests  {r['throughput']:7.0f} req/s  "
+                  f"p50 {r['p50']:6.2f} ms  p99 {r['p99']:7.2f} ms  max {r['max']:8.1f} ms  failed {r['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# scripts/bench_worker_rss.py
+"""
+Per-worker memory under gunicorn: content loaded per worker vs. shared from the master.
+
+Writes a synthetic catalog as a content snapshot, starts gunicorn with
+gunicorn.conf.py twice (CONTENT_SHARED=0, then 1). It requests every course
+page and a search from each worker, then reads each worker's RSS, PSS
+(proportional share of shared pages) and USS (private pages) from
+/proc/<pid>/smaps_rollup. USS is what a worker costs on top of the others;
+the PSS total is the real footprint of the whole server. Linux only.
+
+Usage:
+  python scripts/bench_worker_rss.py [--workers 8] [--courses 50] [--modules 20]
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from app.content import snapshot  # noqa: E402
+from app.content.types import CourseMeta, Module, ModuleSection, QuizQuestion  # noqa: E402
+
+WORDS = "rider schedule route fare transit operator dispatch safety policy prompt model summary".split()
+
+
+def synthetic_courses(courses, modules):
+    result = []
+    for c in range(courses):
+        slug = f"bench-{c}"
+        mods, quizzes = [], {}
+        for m in range(modules):
+            text = " ".join(WORDS[(c * 7 + m * 3 + i) % len(WORDS)] + str(i % 50) for i in range(400))
+            mods.append(Module(
+                slug=f"module-{m}",
+                title=f"Module {m} of course {c}",
+                summary=f"Summary for module {m}.",
+                sections=[ModuleSection(f"Section {s}", f"<p>{text}</p>") for s in range(4)],
+                resources=[{"label": "Reference", "url": f"https://example.com/{c}/{m}"}],
+            ))
+            quizzes[f"module-{m}"] = [
+                QuizQuestion(id=f"q{q}", prompt=f"Question {q}?", options={"a": "Yes", "b": "No"}, correct="a")
+                for q in range(4)
+            ]
+        meta = CourseMeta(
+            slug=slug, title=f"Bench course {c}", summary="Synthetic.", duration="1h", level="Intermediate",
+            hero_image="", thumbnail="", og_image="",
+        )
+        result.append({
+            "slug": slug, "meta": meta, "modules": mods, "quizzes": quizzes,
+            "source": f"app.content.bench_{c}.modules",
+        })
+    return result
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def memory(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "uss": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=600) as resp:
+        resp.read()
+
+
+def run(shared, args, snapshot_path):
+    port = free_port()
+    env = dict(
+        os.environ,
+        FLASK_ENV="production",
+        CONTENT_SHARED="1" if shared else "0",
+        CONTENT_SNAPSHOT_PATH=snapshot_path,
+        CONTENT_COURSE_CACHE_SIZE=str(args.courses + 1),
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+    )
+    proc = subprocess.Popen(
+        # Long timeout: without preloading, each worker builds its own search index
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--timeout", "600", "run:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(300):
+            try:
+                fetch(base + "/api/health")
+                break
+            except OSError:
+                time.sleep(0.1)
+        # Enough requests that every worker serves every course and a search
+        urls = [f"{base}/courses/bench-{c}" for c in range(args.courses)] * (args.workers * 3)
+        urls += [f"{base}/api/search?q=rider+safety"] * (args.workers * 8)
+        with ThreadPoolExecutor(max_workers=args.workers * 2) as pool:
+            list(pool.map(fetch, urls))
+        time.sleep(0.5)
+        return [memory(pid) for pid in worker_pids(proc.pid)], memory(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--modules", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "content.snapshot")
+        # Stamped with the real source digest so the loader accepts it as fresh
+        size = snapshot.write_snapshot(path, synthetic_courses(args.courses, args.modules),
+                                       snapshot.source_digest("app.content"))
+        print(f"catalog: {args.courses} courses x {args.modules} modules, snapshot {size / 2**20:.1f} MiB, "
+              f"{args.workers} workers")
+
+        for shared in (False, True):
+            workers, master = run(shared, args, path)
+            n = len(workers) or 1
+            avg = {k: sum(w[k] for w in workers) / n / 1024 for k in ("rss", "pss", "uss")}
+            total_pss = (sum(w["pss"] for w in workers) + master["pss"]) / 1024
+            label = "shared (preload)" if shared else "per worker"
+            print(f"{label:>17}: per worker RSS {avg['rss']:7.1f} MiB  PSS {avg['pss']:7.1f} MiB  "
+                  f"USS {avg['uss']:7.1f} MiB | master RSS {master['rss'] / 1024:7.1f} MiB | "
+                  f"total PSS {total_pss:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
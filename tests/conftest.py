@@ -0,0 +1,79 @@
+import atexit
+import os
+import shutil
+
+import flask_migrate
+import pytest
+
+from app import create_app, db
+from app.content import loader
+from app.utils.learner_sessions import learner_sessions
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+MIGRATIONS = os.path.join(ROOT, "migrations")
+
+
+def make_config(database_path, **overrides):
+    config = {
+        "TESTING": True,
+        "SECRET_KEY": "test",
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{database_path}",
+        # Content is discovered from app/content, not a snapshot left in instance/
+        "CONTENT_SNAPSHOT_ENABLED": False,
+        # Events are written in the request, so tests can read them straight back
+        "EVENT_BUFFER_ENABLED": False,
+        "SQLITE_CHECKPOINT_INTERVAL": 0,
+    }
+    config.update(overrides)
+    return config
+
+
+def new_learner():
+    """Id of a fresh learner_sessions row, as the API creates on a key token's first use."""
+    return learner_sessions().id_for(learner_sessions().new_key_token())
+
+
+def quiz_module():
+    """(course_slug, module_slug, questions) for the first module with at least two questions."""
+    for course in loader.discover_courses():
+        for module_slug, questions in loader.get_course_quizzes(course["slug"]).items():
+            if len(questions) > 1:
+                return course["slug"], module_slug, questions
+    raise AssertionError("no course module has a quiz with two questions")
+
+
+@pytest.fixture(scope="session")
+def migrated_db(tmp_path_factory):
+    """A SQLite file with every migration applied, built once and copied per test."""
+    path = tmp_path_factory.mktemp("schema") / "migrated.db"
+    app = create_app(make_config(path))
+    with app.app_context():
+        flask_migrate.upgrade(directory=MIGRATIONS)
+        db.engine.dispose()
+    return path
+
+
+@pytest.fixture
+def app_config():
+    """Extra config for the `app` fixture; override it in a test module to change settings."""
+    return {}
+
+
+@pytest.fixture
+def app(migrated_db, tmp_path, app_config):
+    path = tmp_path / "app.db"
+    shutil.copyfile(migrated_db, path)
+    app = create_app(make_config(path, ARCHIVE_DIR=str(tmp_path / "archive"), **app_config))
+    with app.app_context():
+        yield app
+        buffer = app.extensions.get("event_buffer")
+        if buffer is not None:
+            buffer.close()
+            atexit.unregister(buffer.close)
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app import db
+from app.models.analytics import ModuleStats
+from app.utils import archive
+from app.utils.dimensions import module_keys
+from app.utils.learner_sessions import learner_sessions
+
+from tests.conftest import quiz_module
+
+
+def drive_traffic(client):
+    """Two learners: one completes the module and passes its quiz, the other starts and misses a question."""
+    course_slug, module_slug, questions = quiz_module()
+    key = f"{course_slug}:{module_slug}"
+    url = f"/api/quiz/{course_slug}/{module_slug}"
+    passing, failing = learner_sessions().new_key_token(), learner_sessions().new_key_token()
+
+    client.post("/api/progress", json={"session_id": passing, "module_slug": key, "completed": True})
+    for q in questions:
+        client.post(url, json={"session_id": passing, "question_id": q.id, "selected": q.correct})
+    client.post("/api/progress", json={"session_id": failing, "module_slug": key})
+    wrong = next(k for k, _ in questions[0].options if k != questions[0].correct)
+    client.post(url, json={"session_id": failing, "question_id": questions[0].id, "selected": wrong})
+    return course_slug, module_slug, len(questions)
+
+
+def rebuild(app, *args):
+    return app.test_cli_runner().invoke(args=["analytics", "rebuild", *args])
+
+
+def test_counters_match_a_fresh_count(app, client):
+    course_slug, module_slug, n_questions = drive_traffic(client)
+    key_id = module_keys().id_for(f"{course_slug}:{module_slug}")
+    stats = db.session.get(ModuleStats, key_id)
+    assert (stats.started, stats.completed, stats.quiz_attempts, stats.quiz_correct, stats.quiz_passed) == (
+        2, 1, n_questions + 1, n_questions, 1)
+    db.session.commit()
+
+    result = rebuild(app, "--check")
+    assert result.exit_code == 0, result.output
+    assert "1 modules checked, 0 differed" in result.output
+
+
+def test_check_reports_drift_and_rebuild_repairs_it(app, client):
+    course_slug, module_slug, _ = drive_traffic(client)
+    key_id = module_keys().id_for(f"{course_slug}:{module_slug}")
+    db.session.execute(update(ModuleStats).where(ModuleStats.module_key_id == key_id)
+                       .values(completed=ModuleStats.completed + 5))
+    db.session.commit()
+
+    result = rebuild(app, "--check")
+    assert result.exit_code == 1
+    assert f"module_key {key_id}: completed 6 -> 1" in result.output
+    # --check leaves the counters alone
+    db.session.expire_all()
+    assert db.session.get(ModuleStats, key_id).completed == 6
+    db.session.commit()
+
+    result = rebuild(app)
+    assert result.exit_code == 0, result.output
+    assert "1 modules rebuilt, 1 differed" in result.output
+    assert rebuild(app, "--check").exit_code == 0
+
+
+def test_archived_attempts_still_count(app, client):
+    _, _, n_questions = drive_traffic(client)
+    db.session.commit()
+    archived = archive.archive(archive.archive_dir(), date.today() + timedelta(days=2), datasets=("attempts",),
+                               codec="gzip", pause=0)
+    assert archived == {"attempts": n_questions + 1}
+
+    result = rebuild(app, "--check")
+    assert result.exit_code == 0, result.output
+
+
+def test_course_endpoint_requires_the_export_token(app, client):
+    course_slug, module_slug, n_questions = drive_traffic(client)
+    assert client.get("/api/analytics/courses").status_code == 404
+
+    app.config["EXPORT_API_TOKEN"] = "secret"
+    assert client.get("/api/analytics/courses").status_code == 401
+    assert client.get("/api/analytics/courses", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    auth = {"Authorization": "Bearer secret"}
+    data = client.get("/api/analytics/courses", headers=auth).get_json()["data"]
+    course = data[course_slug]
+    assert (course["started"], course["completed"], course["completion_rate"]) == (2, 1, 0.5)
+    assert course["modules"][module_slug]["quiz_passed"] == 1
+    assert course["modules"][module_slug]["quiz_accuracy"] == round(n_questions / (n_questions + 1), 4)
+
+    only = client.get("/api/analytics/courses", query_string={"course": course_slug}, headers=auth).get_json()["data"]
+    assert list(only) == [course_slug]
+    assert client.get("/api/analytics/courses", query_string={"course": "nope"}, headers=auth).status_code == 404
@@ -0,0 +1,124 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app import db
+from app.models.quiz import QuizAttempt
+from app.utils import archive, exports
+from app.utils.dimensions import module_keys
+
+from tests.conftest import new_learner
+
+DAY = datetime(2026, 1, 5)
+
+
+def add_attempts(days, per_day=3, course="course-1"):
+    learner_id = new_learner()
+    key_id = module_keys().id_for(f"{course}:intro")
+    db.session.execute(insert(QuizAttempt), [
+        {"learner_id": learner_id, "module_key_id": key_id, "question_id": f"q{i}", "selected": "a",
+         "correct": i % 2 == 0, "created_at": DAY + timedelta(days=d, hours=i)}
+        for d in days for i in range(per_day)
+    ])
+    db.session.commit()
+
+
+def live_rows(**filters):
+    return [dict(row) for rows in exports.iter_pages(db.engine, "attempts", **filters) for row in rows]
+
+
+def archived_rows(directory, **filters):
+    return [row for rows in archive.iter_pages(directory, "attempts", **filters) for row in rows]
+
+
+def live_count():
+    with db.session.begin():
+        return db.session.execute(select(func.count()).select_from(QuizAttempt)).scalar()
+
+
+def run(directory, cutoff_days, **kwargs):
+    return archive.archive(directory, (DAY + timedelta(days=cutoff_days)).date(), datasets=("attempts",),
+                           codec="gzip", batch_size=2, delete_batch_size=2, pause=0, **kwargs)
+
+
+def test_archive_moves_whole_days_and_reads_them_back(app, tmp_path):
+    directory = str(tmp_path / "archive")
+    add_attempts(days=(0, 1, 2))
+    add_attempts(days=(0,), per_day=1, course="course-2")
+    before = live_rows()
+
+    assert run(directory, 2) == {"attempts": 7}
+    assert live_rows() == [row for row in before if row["created_at"] >= DAY + timedelta(days=2)]
+    assert archived_rows(directory) == [row for row in before if row["created_at"] < DAY + timedelta(days=2)]
+
+    manifest = archive.load_manifest(directory)
+    assert [(e["day"], e["part"], e["rows"], e["state"]) for e in manifest["partitions"]] == [
+        ("2026-01-05", 0, 4, "deleted"), ("2026-01-06", 0, 3, "deleted"),
+    ]
+    assert archive.verify(directory) == []
+
+    # Filtered like the live export
+    since = DAY + timedelta(days=1)
+    assert archived_rows(directory, since=since) == [row for row in before if since <= row["created_at"] < since + timedelta(days=1)]
+    assert {row["module_slug"] for row in archived_rows(directory, course="course-2")} == {"course-2:intro"}
+
+    # Nothing left before the cutoff: a rerun writes nothing
+    assert run(directory, 2) == {"attempts": 0}
+    assert len(archive.load_manifest(directory)["partitions"]) == 2
+
+
+def test_late_rows_for_an_archived_day_go_into_the_next_part(app, tmp_path):
+    directory = str(tmp_path / "archive")
+    add_attempts(days=(0,))
+    run(directory, 1)
+    add_attempts(days=(0,), per_day=2)
+    assert run(directory, 1) == {"attempts": 2}
+
+    manifest = archive.load_manifest(directory)
+    assert [(e["part"], e["rows"]) for e in manifest["partitions"]] == [(0, 3), (1, 2)]
+    assert len(archived_rows(directory)) == 5
+    assert live_count() == 0
+
+
+def test_interrupted_deletes_are_finished_by_the_next_run(app, tmp_path, monkeypatch):
+    directory = str(tmp_path / "archive")
+    add_attempts(days=(0, 1))
+    before = live_rows()
+
+    def crash(*args):
+        raise RuntimeError("killed")
+
+    real_delete_ids = archive._delete_ids
+    monkeypatch.setattr(archive, "_delete_ids", crash)
+    with pytest.raises(RuntimeError):
+        run(directory, 2)
+    (entry,) = archive.load_manifest(directory)["partitions"]
+    assert entry["state"] == "written"
+    assert live_count() == 6
+
+    monkeypatch.setattr(archive, "_delete_ids", real_delete_ids)
+    assert run(directory, 2) == {"attempts": 3}
+    manifest = archive.load_manifest(directory)
+    assert [(e["day"], e["state"]) for e in manifest["partitions"]] == [("2026-01-05", "deleted"), ("2026-01-06", "deleted")]
+    assert live_count() == 0
+    assert archived_rows(directory) == before
+
+
+def test_verify_reports_missing_and_changed_partitions(app, tmp_path):
+    directory = str(tmp_path / "archive")
+    add_attempts(days=(0, 1))
+    run(directory, 2)
+    first, second = archive.load_manifest(directory)["partitions"]
+
+    with open(os.path.join(directory, first["file"]), "ab") as f:
+        f.write(b"\0")
+    os.unlink(os.path.join(directory, second["file"]))
+    assert archive.verify(directory) == [f"{first['file']}: checksum mismatch", f"{second['file']}: missing"]
+
+
+def test_events_wait_for_the_rollup(app, tmp_path):
+    directory = str(tmp_path / "archive")
+    assert archive.archive(directory, DAY.date(), datasets=("events",), codec="gzip") == {}
+    assert archive.load_manifest(directory)["partitions"] == []
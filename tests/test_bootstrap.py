@@ -0,0 +1,66 @@
+from sqlalchemy import select
+
+from app import db
+from app.models.dimensions import ModuleKey, PagePath
+from app.models.progress import ProgressEvent
+from app.utils.learner_sessions import learner_sessions
+
+from tests.conftest import quiz_module
+
+
+def bootstrap(client, course_slug, module_slug, token, **params):
+    response = client.get(f"/api/bootstrap/{course_slug}/{module_slug}", query_string={"session_id": token, **params})
+    assert response.status_code == 200
+    assert "no-store" in response.headers["Cache-Control"]
+    return response.get_json()["data"]
+
+
+def separate_calls(client, course_slug, module_slug, token):
+    progress = client.get("/api/progress", query_string={"session_id": token}).get_json()["data"]
+    quiz = client.get(f"/api/quiz/{course_slug}/{module_slug}", query_string={"session_id": token}).get_json()
+    quiz.pop("status")
+    return progress.get(f"{course_slug}:{module_slug}"), quiz
+
+
+def test_bootstrap_matches_the_separate_endpoints(client):
+    course_slug, module_slug, questions = quiz_module()
+    key = f"{course_slug}:{module_slug}"
+    token = learner_sessions().new_key_token()
+
+    data = bootstrap(client, course_slug, module_slug, token)
+    progress, quiz = separate_calls(client, course_slug, module_slug, token)
+    assert progress is None
+    assert data == {"progress": {"completed": False, "last_accessed_at": None}, "quiz": quiz}
+
+    client.post("/api/progress", json={"session_id": token, "module_slug": key, "completed": True})
+    client.post(f"/api/quiz/{course_slug}/{module_slug}",
+                json={"session_id": token, "question_id": questions[0].id, "selected": questions[0].correct})
+    data = bootstrap(client, course_slug, module_slug, token)
+    progress, quiz = separate_calls(client, course_slug, module_slug, token)
+    assert data == {"progress": progress, "quiz": quiz}
+    assert data["progress"]["completed"] is True
+    assert data["quiz"]["remaining"] == len(questions) - 1
+
+
+def test_bootstrap_records_the_view_event(client):
+    course_slug, module_slug, _ = quiz_module()
+    token = learner_sessions().new_key_token()
+    bootstrap(client, course_slug, module_slug, token, page=f"/courses/{course_slug}/modules/{module_slug}")
+
+    rows = db.session.execute(
+        select(ProgressEvent.learner_id, ProgressEvent.event_type, ModuleKey.name, PagePath.path)
+        .join(ModuleKey, ModuleKey.id == ProgressEvent.module_key_id)
+        .join(PagePath, PagePath.id == ProgressEvent.page_id)
+    ).all()
+    assert rows == [(learner_sessions().id_for(token), "view", f"{course_slug}:{module_slug}",
+                     f"/courses/{course_slug}/modules/{module_slug}")]
+
+
+def test_bootstrap_rejects_unknown_modules_and_sessions(client):
+    course_slug, module_slug, _ = quiz_module()
+    token = learner_sessions().new_key_token()
+    assert client.get(f"/api/bootstrap/{course_slug}/nope", query_string={"session_id": token}).status_code == 404
+    assert client.get(f"/api/bootstrap/{course_slug}/{module_slug}").status_code == 400
+    assert client.get(f"/api/bootstrap/{course_slug}/{module_slug}",
+                      query_string={"session_id": "forged.token"}).status_code == 400
+    assert db.session.execute(select(ProgressEvent.id)).all() == []
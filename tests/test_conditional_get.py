@@ -0,0 +1,62 @@
+from app.content import loader
+from app.utils.http import content_etag
+
+
+def first_module_url():
+    course = loader.discover_courses()[0]
+    module = loader.get_course_by_slug(course["slug"])["modules"][0]
+    return f"/courses/{course['slug']}", f"/courses/{course['slug']}/modules/{module.slug}"
+
+
+def test_course_and_module_pages_revalidate_with_etag(client):
+    for url in first_module_url():
+        first = client.get(url)
+        assert first.status_code == 200
+        assert first.headers["ETag"]
+        assert first.cache_control.no_cache
+
+        again = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304
+        assert again.data == b""
+        assert again.headers["ETag"] == first.headers["ETag"]
+
+        stale = client.get(url, headers={"If-None-Match": '"not-the-etag"'})
+        assert stale.status_code == 200
+        assert stale.data == first.data
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(client):
+    url, _ = first_module_url()
+    first = client.get(url)
+    assert first.headers["Last-Modified"]
+
+    assert client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]}).status_code == 304
+    response = client.get(url, headers={
+        "If-None-Match": '"not-the-etag"',
+        "If-Modified-Since": first.headers["Last-Modified"],
+    })
+    assert response.status_code == 200
+
+
+def test_compressed_representation_has_its_own_etag(client):
+    url, _ = first_module_url()
+    plain = client.get(url)
+    gzipped = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] != plain.headers["ETag"]
+
+    # The plain ETag must not validate the gzip representation
+    assert client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]}).status_code == 200
+    assert client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["ETag"]}).status_code == 304
+
+
+def test_content_etag_follows_fingerprints(app):
+    assert content_etag("course", "a") == content_etag("course", "a")
+    assert content_etag("course", "a") != content_etag("course", "b")
+    assert content_etag("course", "a") != content_etag("module", "a")
+
+
+def test_missing_course_is_not_cached(client):
+    response = client.get("/courses/no-such-course")
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
@@ -0,0 +1,123 @@
+import sys
+from collections import OrderedDict
+
+import pytest
+
+from app.content import loader, markdown_course
+from app.content.watcher import SourceWatcher
+
+PACKAGE = "reload_content"
+
+COURSE_YAML = """\
+slug: {slug}
+title: {title}
+summary: A file-based course.
+duration: 1h
+level: Beginner
+hero_image: hero.png
+thumbnail: thumb.png
+og_image: og.png
+"""
+
+
+class ContentRoot:
+    """A throwaway content package of file-based courses, served by the loader."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def write_course(self, name, title=None, body="Some text."):
+        course = self.root / name
+        (course / markdown_course.MODULES_DIR).mkdir(parents=True, exist_ok=True)
+        (course / markdown_course.COURSE_FILE).write_text(COURSE_YAML.format(slug=name, title=title or name))
+        self.write_module(name, f"## Section\n\n{body}\n")
+
+    def write_module(self, name, text):
+        (self.root / name / markdown_course.MODULES_DIR / "01-intro.md").write_text(text)
+
+
+@pytest.fixture
+def content_root(tmp_path, monkeypatch):
+    root = tmp_path / PACKAGE
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(loader, "PACKAGE", PACKAGE)
+    monkeypatch.setattr(loader, "_WATCHER", SourceWatcher(PACKAGE))
+    monkeypatch.setattr(loader, "_WATCH_INTERVAL", 0.0)
+    monkeypatch.setattr(loader, "_COMPILE_CACHE", markdown_course.CompileCache())
+    monkeypatch.setattr(loader, "_COURSE_CACHE", OrderedDict())
+    monkeypatch.setattr(loader, "_CHANGE_LISTENERS", [])
+    for name in ("_SNAPSHOT_PATH", "_LAST_POLL", "_DISCOVERY_CACHE", "_CATALOG", "_CATALOG_VERSION", "_PRELOADED"):
+        monkeypatch.setattr(loader, name, getattr(loader, name))
+    yield ContentRoot(root)
+    sys.modules.pop(PACKAGE, None)
+
+
+def sections(slug):
+    return [s.content for s in loader.get_course_by_slug(slug)["modules"][0].sections]
+
+
+def test_broken_edit_keeps_the_previous_version_and_is_retried(content_root, tmp_path, monkeypatch):
+    content_root.write_course("alpha", body="Alpha v1.")
+    content_root.write_course("beta", body="Beta v1.")
+    content_root.write_course("gamma", body="Gamma v1.")
+    monkeypatch.setattr(loader, "_SNAPSHOT_PATH", str(tmp_path / "content.snapshot"))
+    loader.build_snapshot()
+    assert loader.load_snapshot()
+    assert sections("alpha") == ["<p>Alpha v1.</p>"]  # alpha is loaded, gamma stays cold in the snapshot
+
+    content_root.write_module("alpha", "---\n- not a mapping\n---\nBroken.\n")
+    content_root.write_module("gamma", "---\n- not a mapping\n---\nBroken.\n")
+    content_root.write_course("beta", body="Beta v2.")
+    assert loader.reload_changed() == ["beta"]
+    assert sections("alpha") == ["<p>Alpha v1.</p>"]
+    assert sections("beta") == ["<p>Beta v2.</p>"]
+    assert sections("gamma") == ["<p>Gamma v1.</p>"]
+
+    # The broken packages are polled again until they compile
+    assert loader.reload_changed() == []
+    content_root.write_module("alpha", "## Section\n\nAlpha v2.\n")
+    assert loader.reload_changed() == ["alpha"]
+    assert sections("alpha") == ["<p>Alpha v2.</p>"]
+    assert loader.reload_changed() == []
+
+
+def test_broken_edit_does_not_fail_the_request_hook(content_root):
+    content_root.write_course("alpha")
+    loader.discover_courses(force_reload=True)
+    assert sections("alpha") == ["<p>Some text.</p>"]
+    content_root.write_module("alpha", "---\n- not a mapping\n---\nBroken.\n")
+    loader.maybe_reload()
+    assert sections("alpha") == ["<p>Some text.</p>"]
+
+
+def test_edit_swaps_only_the_changed_course(content_root):
+    content_root.write_course("alpha", title="Alpha")
+    content_root.write_course("beta", title="Beta")
+    loader.discover_courses(force_reload=True)
+    alpha, beta = loader._load_course("alpha"), loader._load_course("beta")
+    catalog_beta = loader._CATALOG["beta"]
+    notified = []
+    loader.add_change_listener(notified.append)
+
+    assert loader.reload_changed() == []
+    content_root.write_module("alpha", "## Section\n\nEdited.\n")
+    assert loader.reload_changed() == ["alpha"]
+
+    assert notified == [{"alpha"}]
+    new_alpha = loader._load_course("alpha")
+    assert new_alpha is not alpha
+    assert [s.content for s in new_alpha.course["modules"][0].sections] == ["<p>Edited.</p>"]
+    # The replacement was built before publishing, so it went straight into the cache
+    assert loader._COURSE_CACHE["alpha"] is new_alpha
+    assert loader._load_course("beta") is beta
+    assert loader._CATALOG["beta"] is catalog_beta
+
+    # Metadata edits go through the same path, and adding a course only announces it
+    content_root.write_course("beta", title="Beta, revised", body="Some text.")
+    content_root.write_course("delta")
+    assert loader.reload_changed() == ["beta", "delta"]
+    assert notified[1:] == [{"beta", "delta"}]
+    assert loader._load_course("alpha") is new_alpha
+    assert loader._CATALOG["beta"]["meta"].title == "Beta, revised"
@@ -0,0 +1,86 @@
+import sys
+
+from app import create_app
+from app.content import loader, snapshot
+
+from tests.conftest import make_config
+
+
+def live_courses():
+    return [loader._load_live_course(entry) for entry in loader._discover_live()]
+
+
+def test_snapshot_round_trip(tmp_path):
+    courses = live_courses()
+    path = str(tmp_path / "content.snapshot")
+    digest = snapshot.source_digest(loader.PACKAGE)
+    snapshot.write_snapshot(path, courses, digest)
+
+    table = snapshot.read_snapshot_table(path, digest=digest)
+    assert [entry["slug"] for entry in table] == [c["slug"] for c in courses]
+    for entry, course in zip(table, courses):
+        assert entry["meta"] == course["meta"]
+        body = snapshot.read_course_body(entry["data"], entry["blob"])
+        assert body["modules"] == course["modules"]
+        assert body["quizzes"] == course["quizzes"]
+
+
+def test_stale_foreign_or_missing_snapshot_is_rejected(tmp_path):
+    path = str(tmp_path / "content.snapshot")
+    snapshot.write_snapshot(path, live_courses(), b"\0" * 32)
+    assert snapshot.read_snapshot_table(path) is not None
+    assert snapshot.read_snapshot_table(path, digest=snapshot.source_digest(loader.PACKAGE)) is None
+
+    foreign = tmp_path / "foreign.snapshot"
+    foreign.write_bytes(b"not a snapshot at all")
+    assert snapshot.read_snapshot_table(str(foreign)) is None
+    assert snapshot.read_snapshot_table(str(tmp_path / "missing.snapshot")) is None
+
+
+def test_source_digest_changes_with_course_files(tmp_path, monkeypatch):
+    course = tmp_path / "snapshot_pkg" / "course_a"
+    course.mkdir(parents=True)
+    (tmp_path / "snapshot_pkg" / "__init__.py").write_text("")
+    (course / "__init__.py").write_text("")
+    (course / "modules.py").write_text("MODULES = []\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "snapshot_pkg", raising=False)
+
+    before = snapshot.source_digest("snapshot_pkg")
+    assert snapshot.source_digest("snapshot_pkg") == before
+    (course / "modules.py").write_text("MODULES = [1]\n")
+    edited = snapshot.source_digest("snapshot_pkg")
+    assert edited != before
+    (course / "notes.txt").write_text("not a source file")
+    assert snapshot.source_digest("snapshot_pkg") == edited
+
+
+def test_loader_serves_a_fresh_snapshot_and_ignores_a_stale_one(tmp_path):
+    path = str(tmp_path / "content.snapshot")
+    app = create_app(make_config(tmp_path / "app.db", CONTENT_SNAPSHOT_PATH=path))
+    with app.app_context():
+        assert loader.load_snapshot() is False
+        built = loader.build_snapshot()
+        assert built["courses"] == len(loader._discover_live())
+        assert loader.load_snapshot() is True
+        for entry in loader.discover_courses():
+            live = loader._load_live_course(entry)
+            assert loader.get_course_quizzes(entry["slug"]) == live["quizzes"]
+
+        snapshot.write_snapshot(path, live_courses(), b"\0" * 32)
+        assert loader.load_snapshot() is False
+
+
+def test_lazy_loads_survive_a_rebuild_after_boot(tmp_path):
+    path = str(tmp_path / "content.snapshot")
+    courses = live_courses()
+    # Boot from a snapshot laid out in the opposite order to the one build writes
+    snapshot.write_snapshot(path, courses[::-1], snapshot.source_digest(loader.PACKAGE))
+    app = create_app(make_config(tmp_path / "app.db", CONTENT_SNAPSHOT_ENABLED=True, CONTENT_SNAPSHOT_PATH=path))
+    with app.app_context():
+        assert loader._COURSE_CACHE == {}
+        loader.build_snapshot()  # `flask content build` during a deploy, workers still up
+        for course in courses:
+            loaded = loader.get_course_by_slug(course["slug"])
+            assert loaded["modules"] == course["modules"]
+            assert loaded["quizzes"] == course["quizzes"]
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from sqlalchemy import func, select
+
+from app import db
+from app.models.progress import ProgressEvent
+from app.utils.event_buffer import get_event_buffer
+from app.utils.learner_sessions import learner_sessions
+
+
+@pytest.fixture
+def app_config():
+    # A long interval, so only the size trigger (or a test that shortens it) flushes
+    return {
+        "EVENT_BUFFER_ENABLED": True,
+        "EVENT_BUFFER_MAX_EVENTS": 10,
+        "EVENT_BUFFER_BATCH_SIZE": 4,
+        "EVENT_BUFFER_FLUSH_INTERVAL": 60.0,
+    }
+
+
+@pytest.fixture
+def buffer(app):
+    return get_event_buffer()
+
+
+def events(n):
+    token = learner_sessions().new_key_token()
+    return {"session_id": token, "events": [{"event_type": "view", "page": f"/p/{i}"} for i in range(n)]}
+
+
+def stored_events():
+    count = db.session.execute(select(func.count()).select_from(ProgressEvent)).scalar()
+    db.session.rollback()
+    return count
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_full_queue_answers_503_with_retry_after(client, buffer):
+    buffer.batch_size = 100  # nothing flushes while the queue fills
+    accepted = client.post("/api/events", json=events(8))
+    assert accepted.status_code == 202
+    assert accepted.get_json()["data"] == {"accepted": 8, "rejected": 0}
+
+    full = client.post("/api/events", json=events(3))
+    assert full.status_code == 503
+    assert full.headers["Retry-After"] == "1"
+    # The refused batch queued nothing, so two more single events still fit
+    single = {"session_id": learner_sessions().new_key_token(), "event_type": "view"}
+    assert [client.post("/api/event", json=single).status_code for _ in range(3)] == [202, 202, 503]
+    assert buffer.stats()["queued"] == 10
+    assert buffer.stats()["rejected"] == 4
+    assert stored_events() == 0
+
+
+def test_batch_size_triggers_a_flush(client, buffer):
+    assert client.post("/api/events", json=events(3)).status_code == 202
+    time.sleep(0.2)
+    assert buffer.stats()["written"] == 0
+
+    client.post("/api/events", json=events(1))
+    assert wait_until(lambda: buffer.stats()["written"] == 4)
+    assert stored_events() == 4
+
+
+def test_flush_interval_triggers_a_flush(client, buffer):
+    buffer.flush_interval = 0.1
+    client.post("/api/events", json=events(1))
+    assert wait_until(lambda: buffer.stats()["written"] == 1)
+    assert stored_events() == 1
+
+
+def test_close_flushes_pending_events_and_stops_the_flusher(client, buffer):
+    client.post("/api/events", json=events(3))
+    flusher = buffer._thread
+    buffer.close()
+    assert not flusher.is_alive()
+    assert buffer.stats()["written"] == 3
+    assert stored_events() == 3
+
+    # Late submits are refused and don't start another flusher
+    assert client.post("/api/events", json=events(1)).status_code == 503
+    assert buffer._thread is flusher and not flusher.is_alive()
+    assert buffer.stats()["queued"] == 0
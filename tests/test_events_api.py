@@ -0,0 +1,68 @@
+import json
+
+from sqlalchemy import select
+
+from app import db
+from app.models.dimensions import ModuleKey, PagePath
+from app.models.progress import ProgressEvent
+from app.routes.main import MAX_EVENT_BATCH
+from app.utils.learner_sessions import learner_sessions
+
+
+def stored_events():
+    return db.session.execute(
+        select(ProgressEvent.event_type, ModuleKey.name, PagePath.path)
+        .outerjoin(ModuleKey, ModuleKey.id == ProgressEvent.module_key_id)
+        .outerjoin(PagePath, PagePath.id == ProgressEvent.page_id)
+        .order_by(ProgressEvent.id)
+    ).all()
+
+
+def test_invalid_items_are_rejected_one_by_one(client):
+    token = learner_sessions().new_key_token()
+    other = learner_sessions().new_key_token()
+    response = client.post("/api/events", json={"session_id": token, "events": [
+        {"event_type": "view", "module_slug": "course-1:intro", "page": "/courses/course-1"},
+        "not an object",
+        {"module_slug": "course-1:intro"},                       # no event_type
+        {"event_type": "x" * 51},                                # longer than the column
+        {"event_type": "view", "page": 42},                      # not a string
+        {"event_type": "view", "session_id": "forged.token"},    # bad signature
+        {"event_type": "complete", "session_id": other},         # its own session overrides the default
+    ]})
+    assert response.status_code == 200
+    assert response.get_json()["data"] == {"accepted": 2, "rejected": 5}
+    assert stored_events() == [("view", "course-1:intro", "/courses/course-1"), ("complete", None, None)]
+
+
+def test_a_bare_list_is_accepted_with_per_item_sessions(client):
+    token = learner_sessions().new_key_token()
+    response = client.post("/api/events", json=[{"session_id": token, "event_type": "view"}, {"event_type": "view"}])
+    assert response.get_json()["data"] == {"accepted": 1, "rejected": 1}
+
+
+def test_beacon_bodies_without_a_json_content_type_are_parsed(client):
+    token = learner_sessions().new_key_token()
+    body = json.dumps({"session_id": token, "events": [{"event_type": "view"}]})
+    response = client.post("/api/events", data=body, content_type="text/plain")
+    assert response.get_json()["data"] == {"accepted": 1, "rejected": 0}
+
+
+def test_oversized_batches_are_refused(app, client):
+    token = learner_sessions().new_key_token()
+    events = [{"event_type": "view"}] * (MAX_EVENT_BATCH + 1)
+    assert client.post("/api/events", json={"session_id": token, "events": events}).status_code == 413
+    assert client.post("/api/events", json={"session_id": token, "events": events[1:]}).status_code == 200
+
+    app.config["MAX_CONTENT_LENGTH"] = 1024
+    padded = {"session_id": token, "events": [{"event_type": "view", "page": "/" + "p" * 2000}]}
+    assert client.post("/api/events", json=padded).status_code == 413
+    assert len(stored_events()) == MAX_EVENT_BATCH
+
+
+def test_empty_or_malformed_payloads_are_rejected(client):
+    for payload in ({}, {"events": "view"}, {"events": None}, "events"):
+        assert client.post("/api/events", json=payload).status_code == 400, payload
+    assert client.post("/api/events", data="not json", content_type="application/json").status_code == 400
+    assert client.post("/api/events").status_code == 400
+    assert stored_events() == []
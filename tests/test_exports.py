@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app import db
+from app.models.quiz import QuizAttempt
+from app.utils import exports
+from app.utils.dimensions import module_keys
+
+from tests.conftest import new_learner
+
+START = datetime(2026, 2, 1, 9, 0)
+AUTH = {"Authorization": "Bearer export-token"}
+
+
+@pytest.fixture
+def app_config():
+    return {"EXPORT_API_TOKEN": "export-token", "EXPORT_BATCH_SIZE": 2}
+
+
+@pytest.fixture
+def attempts(app):
+    """Nine attempts over three courses; several share a created_at, so pages split ties."""
+    learner_id = new_learner()
+    rows = [
+        {"learner_id": learner_id, "module_key_id": module_keys().id_for(f"{course}:intro"),
+         "question_id": f"q{i}", "selected": "a", "correct": i % 2 == 0,
+         "created_at": START + timedelta(minutes=i // 3)}
+        for i, course in enumerate(["course-1", "course-2", "course-10"] * 3)
+    ]
+    db.session.execute(insert(QuizAttempt), rows)
+    db.session.commit()
+    return rows
+
+
+def exported(**filters):
+    pages = list(exports.iter_pages(db.engine, "attempts", batch_size=2, **filters))
+    assert all(len(rows) <= 2 for rows in pages)
+    return [row for rows in pages for row in rows]
+
+
+def test_keyset_pages_cross_ties_without_gaps_or_duplicates(attempts):
+    rows = exported()
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids)) == len(attempts)
+    assert [(row["created_at"], row["id"]) for row in rows] == sorted((row["created_at"], row["id"]) for row in rows)
+    assert [row["question_id"] for row in rows] == [a["question_id"] for a in attempts]
+
+
+def test_course_filter_and_time_bounds(attempts):
+    assert {row["module_slug"] for row in exported(course="course-1")} == {"course-1:intro"}
+    assert len(exported(course="course-1")) == 3
+    assert exported(course="no-such-course") == []
+
+    # since is inclusive, until exclusive
+    window = exported(since=START + timedelta(minutes=1), until=START + timedelta(minutes=2))
+    assert {row["created_at"] for row in window} == {START + timedelta(minutes=1)}
+    assert len(window) == 3
+    assert len(exported(since=START, until=START)) == 0
+    assert len(exported(course="course-10", since=START + timedelta(minutes=1))) == 2
+
+
+def test_export_endpoint_requires_the_token(app, client, attempts):
+    assert client.get("/api/export/attempts").status_code == 401
+    assert client.get("/api/export/attempts", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.get("/api/export/nope", headers=AUTH).status_code == 404
+
+    app.config["EXPORT_API_TOKEN"] = None
+    assert client.get("/api/export/attempts", headers=AUTH).status_code == 404
+
+
+def test_csv_and_ndjson_have_the_same_columns_and_rows(client, attempts):
+    query = {"course": "course-2", "since": START.isoformat()}
+    ndjson = client.get("/api/export/attempts", query_string={**query, "format": "ndjson"}, headers=AUTH)
+    assert ndjson.status_code == 200
+    assert ndjson.headers["Content-Disposition"] == 'attachment; filename="attempts.ndjson"'
+    records = [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()]
+
+    response = client.get("/api/export/attempts", query_string={**query, "format": "csv"}, headers=AUTH)
+    assert response.status_code == 200
+    header, *lines = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+
+    assert header == list(records[0]) == exports.columns("attempts")
+    assert len(lines) == len(records) == 3
+    for line, record in zip(lines, records):
+        assert line == ["" if v is None else str(v) for v in record.values()]
+
+
+def test_export_endpoint_validates_parameters(client):
+    assert client.get("/api/export/attempts", query_string={"format": "xml"}, headers=AUTH).status_code == 400
+    assert client.get("/api/export/attempts", query_string={"since": "yesterday"}, headers=AUTH).status_code == 400
+    assert client.get("/api/export/attempts", query_string={"source": "tape"}, headers=AUTH).status_code == 400
@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+
+from itsdangerous import Signer
+from sqlalchemy import event, func, select
+
+from app import db
+from app.models.dimensions import LearnerSession
+from app.utils.learner_sessions import COOKIE_NAME, learner_sessions
+
+from tests.conftest import quiz_module
+
+MODULE = "course-1:intro"
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def learner_rows():
+    return db.session.execute(select(func.count()).select_from(LearnerSession)).scalar()
+
+
+def post_progress(client, session_id):
+    return client.post("/api/progress", json={"session_id": session_id, "module_slug": MODULE})
+
+
+def test_pages_issue_key_tokens_without_touching_the_database(client):
+    course_slug, module_slug, _ = quiz_module()
+    with count_queries() as statements:
+        first = client.get("/")
+        assert first.status_code == 200
+        cookie = client.get_cookie(COOKIE_NAME).value
+        assert cookie.startswith("k")
+        assert "private" in first.headers["Cache-Control"]
+
+        revalidated = client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+        assert revalidated.status_code == 304
+        # The browser already has a valid token, so pages don't reissue it
+        assert "Set-Cookie" not in revalidated.headers
+        assert "Set-Cookie" not in client.get(f"/courses/{course_slug}/modules/{module_slug}").headers
+    assert statements == []
+    with count_queries() as statements:
+        assert learner_rows() == 0
+    assert statements  # the listener does see queries
+
+
+def test_key_token_becomes_a_learner_on_first_api_call_and_the_cookie_is_upgraded(client):
+    client.get("/")
+    key_token = client.get_cookie(COOKIE_NAME).value
+
+    assert post_progress(client, key_token).status_code == 200
+    assert learner_rows() == 1
+    learner = db.session.execute(select(LearnerSession)).scalar_one()
+    assert learner.legacy_id == key_token.split(".")[0]
+
+    upgraded = client.get_cookie(COOKIE_NAME).value
+    assert upgraded == learner_sessions().token_for(learner.id)
+    assert learner_sessions().parse_token(upgraded) == learner.id
+
+    # Both forms keep resolving to the same learner; the id token needs no lookup
+    assert learner_sessions().id_for(key_token) == learner.id
+    with count_queries() as statements:
+        assert learner_sessions().id_for(upgraded) == learner.id
+    assert statements == []
+    assert post_progress(client, upgraded).status_code == 200
+    progress = client.get("/api/progress", query_string={"session_id": key_token}).get_json()["data"]
+    assert list(progress) == [MODULE]
+    assert learner_rows() == 1
+
+
+def test_forged_and_corrupted_tokens_are_rejected(client):
+    sessions = learner_sessions()
+    learner_id = sessions.id_for(sessions.new_key_token())
+    token = sessions.token_for(learner_id)
+    payload, signature = token.split(".")
+    flipped = signature[:-1] + ("A" if signature[-1] != "A" else "B")
+    forged = [
+        f"{payload}.{flipped}",
+        f"{learner_id + 1}.{signature}",
+        Signer("another-secret", salt="learner-session").sign(str(learner_id)).decode(),
+        Signer("another-secret", salt="learner-session").sign("k" + "0" * 24).decode(),
+        "k0123456789abcdef.",
+        ".",
+    ]
+    rejected = sessions.rejected
+    for value in forged:
+        assert not sessions.valid(value), value
+        assert sessions.id_for(value) is None, value
+        assert post_progress(client, value).status_code == 400, value
+    assert sessions.rejected > rejected
+    assert learner_rows() == 1
+
+    # A forged cookie on a page is replaced by a fresh key token
+    client.set_cookie(COOKIE_NAME, forged[0])
+    client.get("/")
+    assert client.get_cookie(COOKIE_NAME).value.startswith("k")
+
+
+def test_legacy_hex_ids_still_resolve(client):
+    legacy = "0123456789abcdef" * 2
+    sessions = learner_sessions()
+    learner_id = sessions.id_for(legacy)
+    assert learner_id is not None
+    assert sessions.id_for(legacy) == learner_id
+    assert db.session.get(LearnerSession, learner_id).legacy_id == legacy
+
+    # The browser's legacy cookie is upgraded to an id token on its next API call
+    client.set_cookie(COOKIE_NAME, legacy)
+    assert post_progress(client, legacy).status_code == 200
+    assert client.get_cookie(COOKIE_NAME).value == sessions.token_for(learner_id)
+    assert learner_rows() == 1
+
+    assert sessions.id_for("f" * 65) is None
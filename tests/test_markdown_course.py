@@ -0,0 +1,122 @@
+import pytest
+
+from app.content import markdown_course
+from app.content.types import CourseMeta, Module, QuizQuestion
+
+COURSE_YAML = """\
+slug: md-course
+title: Markdown Course
+summary: Written in Markdown.
+duration: 1h
+level: Beginner
+hero_image: hero.png
+thumbnail: thumb.png
+og_image: og.png
+tags: [markdown]
+"""
+
+INTRO_MD = """\
+---
+title: Introduction
+summary: Where to start.
+resources:
+  - {label: Docs, url: "https://example.com/docs"}
+---
+A lead-in paragraph.
+
+## First steps
+
+Some *emphasis* and a list:
+
+1. one
+2. two
+
+## Raw HTML ##
+
+<div class="note">kept as is</div>
+"""
+
+QUIZZES_YAML = """\
+intro:
+  - id: q1
+    prompt: Pick a
+    options: {a: A, b: B}
+    correct: a
+"""
+
+
+@pytest.fixture
+def course_dir(tmp_path):
+    root = tmp_path / "md_course"
+    (root / markdown_course.MODULES_DIR).mkdir(parents=True)
+    (root / markdown_course.COURSE_FILE).write_text(COURSE_YAML)
+    (root / markdown_course.MODULES_DIR / "01-intro.md").write_text(INTRO_MD)
+    (root / markdown_course.MODULES_DIR / "02-next.md").write_text("---\nslug: custom-slug\n---\n## Only\n\nBody.\n")
+    (root / markdown_course.QUIZZES_FILE).write_text(QUIZZES_YAML)
+    return root
+
+
+def test_compiles_meta_modules_and_quizzes(course_dir):
+    cache = markdown_course.CompileCache()
+    assert markdown_course.is_course_dir(str(course_dir))
+
+    meta = markdown_course.read_course_meta(str(course_dir), cache)
+    assert isinstance(meta, CourseMeta)
+    assert (meta.slug, meta.tags) == ("md-course", ("markdown",))
+
+    modules, quizzes = markdown_course.read_course_body(str(course_dir), cache)
+    assert all(isinstance(m, Module) for m in modules)
+    intro, nxt = modules
+    assert (intro.slug, intro.title, intro.summary) == ("intro", "Introduction", "Where to start.")
+    assert [s.title for s in intro.sections] == ["", "First steps", "Raw HTML"]
+    assert intro.sections[0].content == "<p>A lead-in paragraph.</p>"
+    assert "<em>emphasis</em>" in intro.sections[1].content
+    assert "<ol>" in intro.sections[1].content
+    assert intro.sections[2].content == '<div class="note">kept as is</div>'
+    assert intro.resources[0].url == "https://example.com/docs"
+    assert (nxt.slug, nxt.title, [s.title for s in nxt.sections]) == ("custom-slug", "custom-slug", ["Only"])
+
+    (question,) = quizzes["intro"]
+    assert isinstance(question, QuizQuestion)
+    assert (question.id, question.options, question.correct) == ("q1", (("a", "A"), ("b", "B")), "a")
+
+
+def test_quizzes_file_is_optional(course_dir):
+    (course_dir / markdown_course.QUIZZES_FILE).unlink()
+    _, quizzes = markdown_course.read_course_body(str(course_dir), markdown_course.CompileCache())
+    assert quizzes == {}
+
+
+@pytest.mark.parametrize("filename, content, message", [
+    (markdown_course.COURSE_FILE, "title: [unclosed", "invalid YAML"),
+    (markdown_course.COURSE_FILE, "- a list", "expected a mapping of course fields"),
+    (markdown_course.COURSE_FILE, COURSE_YAML + "colour: red\n", "colour"),
+    (markdown_course.QUIZZES_FILE, "- q1", "expected a mapping of module slug -> questions"),
+    (markdown_course.QUIZZES_FILE, "intro:\n  - {id: q1}\n", "prompt"),
+    ("modules/03-bad.md", "---\n- not a mapping\n---\nBody\n", "front matter must be a mapping"),
+])
+def test_invalid_files_name_the_file(course_dir, filename, content, message):
+    (course_dir / filename).write_text(content)
+    cache = markdown_course.CompileCache()
+    with pytest.raises(ValueError, match=message) as excinfo:
+        markdown_course.read_course_meta(str(course_dir), cache)
+        markdown_course.read_course_body(str(course_dir), cache)
+    assert str(course_dir / filename) in str(excinfo.value)
+
+
+def test_compile_cache_only_recompiles_changed_files(course_dir, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = markdown_course.CompileCache(cache_dir)
+    modules, _ = markdown_course.read_course_body(str(course_dir), first)
+    assert (first.hits, first.misses) == (0, 3)
+
+    (course_dir / markdown_course.MODULES_DIR / "02-next.md").write_text("## Edited\n\nNew body.\n")
+    second = markdown_course.CompileCache(cache_dir)
+    edited, _ = markdown_course.read_course_body(str(course_dir), second)
+    assert (second.hits, second.misses) == (2, 1)
+    assert edited[0] == modules[0]
+    assert (edited[1].slug, edited[1].sections[0].title) == ("next", "Edited")
+
+    # The entry for the old 02-next.md is no longer used
+    assert second.prune() == 1
+    assert second.prune() == 0
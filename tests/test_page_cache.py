@@ -0,0 +1,91 @@
+import pytest
+
+from app.content import loader
+from app.utils import page_cache
+from app.utils.page_cache import INDEX_TAG, PageCache, get_page_cache
+
+ENCODINGS = ["gzip", pytest.param("br", marks=pytest.mark.skipif(page_cache.brotli is None, reason="brotli not installed"))]
+
+
+def test_lru_evicts_least_recently_used_pages_by_bytes():
+    cache = PageCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a").body == b"aaaa"  # b is now the oldest
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert [cache.get(k).body for k in ("a", "c")] == [b"aaaa", b"cccc"]
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+    # Replacing a page accounts the new size; a page larger than the cache isn't stored
+    cache.put("a", b"aa")
+    assert cache.stats()["bytes"] == 6
+    assert cache.put("big", b"x" * 11).body == b"x" * 11
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_compressed_variants_count_towards_the_bound():
+    cache = PageCache(max_bytes=250)
+    body = b"<p>" + b"repetitive text " * 8 + b"</p>"
+    page = cache.put("a", body)
+    cache.put("b", b"b" * 40)
+    compressed = cache.variant("a", page, "gzip")
+    assert cache.variant("a", page, "gzip") is compressed
+    assert cache.stats()["bytes"] == len(body) + 40 + len(compressed)
+
+    cache.get("a")
+    cache.put("c", b"c" * (250 - cache.stats()["bytes"] + 1))
+    assert cache.get("b") is None
+    assert cache.get("a") is page
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_invalidating_a_course_drops_all_its_representations(encoding):
+    cache = PageCache(max_bytes=1 << 20)
+    pages = {
+        key: cache.put(key, f"<html>{key}</html>".encode() * 20, tags)
+        for key, tags in [("course-a", ("a",)), ("module-a", ("a",)), ("course-b", ("b",)), ("index", (INDEX_TAG,))]
+    }
+    for key, page in pages.items():
+        cache.variant(key, page, encoding)
+    kept = pages["course-b"].size
+
+    cache.invalidate({"a"})
+    assert {key for key in pages if cache.get(key) is not None} == {"course-b"}
+    assert cache.get("course-b").variants.keys() == {encoding}
+    assert cache.stats()["bytes"] == kept
+    assert cache.stats()["invalidations"] == 3
+
+    cache.invalidate(None)
+    assert cache.stats()["entries"] == cache.stats()["bytes"] == 0
+
+
+def test_loader_changes_invalidate_the_app_cache(client):
+    course_a, course_b = [c["slug"] for c in loader.discover_courses()[:2]]
+    for slug in (course_a, course_b):
+        client.get(f"/courses/{slug}")
+        client.get(f"/courses/{slug}", headers={"Accept-Encoding": "gzip"})
+    cache = get_page_cache()
+    assert cache.stats()["entries"] == 2
+
+    loader._notify({course_a})
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["invalidations"] == 1
+    assert client.get(f"/courses/{course_b}").status_code == 200
+    assert cache.stats()["misses"] == 2  # course_b was still cached
+
+
+def test_health_reports_page_cache_hits_and_misses(client):
+    url = f"/courses/{loader.discover_courses()[0]['slug']}"
+    first = client.get(url)
+    client.get(url)
+    client.get(url, headers={"Accept-Encoding": "gzip"})
+    # A revalidation is answered from the ETag alone and isn't a cache lookup
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    stats = client.get("/api/health").get_json()["page_cache"]
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (2, 1, round(2 / 3, 4))
+    assert stats["entries"] == 1
+    assert stats["bytes"] > len(first.data)  # identity body plus the gzip variant
@@ -0,0 +1,61 @@
+from sqlalchemy import select
+
+from app import db
+from app.models.analytics import ModuleStats
+from app.models.progress import ModuleProgress
+from app.utils.dimensions import module_keys
+from app.utils.learner_sessions import learner_sessions
+
+from tests.conftest import new_learner
+
+MODULE = "course-1:intro"
+
+
+def row(learner_id, module_key_id):
+    return db.session.execute(
+        select(ModuleProgress).filter_by(learner_id=learner_id, module_key_id=module_key_id)
+    ).scalar_one()
+
+
+def test_record_reports_start_and_first_completion_once(app):
+    learner_id, key_id = new_learner(), module_keys().id_for(MODULE)
+    transitions = [ModuleProgress.record(learner_id, key_id, completed) for completed in (False, False, True, True, False)]
+    assert transitions == [(True, False), (False, False), (False, True), (False, False), (False, False)]
+
+    progress = row(learner_id, key_id)
+    assert progress.completed is True
+    assert (progress.visits, progress.completed_on_visit) == (5, 3)
+
+
+def test_record_completed_on_first_visit(app):
+    learner_id, key_id = new_learner(), module_keys().id_for(MODULE)
+    assert ModuleProgress.record(learner_id, key_id, True) == (True, True)
+    assert ModuleProgress.record(learner_id, key_id, False) == (False, False)
+    assert row(learner_id, key_id).completed is True
+
+
+def test_rows_are_per_learner(app):
+    key_id = module_keys().id_for(MODULE)
+    first, second = new_learner(), new_learner()
+    assert ModuleProgress.record(first, key_id, True) == (True, True)
+    assert ModuleProgress.record(second, key_id, False) == (True, False)
+    assert row(second, key_id).completed is False
+
+
+def test_post_progress_keeps_completion_and_counts_it_once(client):
+    token = learner_sessions().new_key_token()
+    for completed in (False, True, False, True):
+        response = client.post("/api/progress", json={"session_id": token, "module_slug": MODULE, "completed": completed})
+        assert response.status_code == 200
+
+    data = client.get("/api/progress", query_string={"session_id": token}).get_json()["data"]
+    assert data[MODULE]["completed"] is True
+
+    stats = db.session.get(ModuleStats, module_keys().id_for(MODULE))
+    assert (stats.started, stats.completed) == (1, 1)
+
+
+def test_post_progress_rejects_bad_sessions(client):
+    response = client.post("/api/progress", json={"session_id": "k00.forged", "module_slug": MODULE})
+    assert response.status_code == 400
+    assert client.post("/api/progress", json={"module_slug": MODULE}).status_code == 400
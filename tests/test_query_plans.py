@@ -0,0 +1,59 @@
+import os
+
+import flask_migrate
+import pytest
+from sqlalchemy import select
+
+from app import create_app, db
+from app.models.progress import ProgressEvent
+from app.models.queries import HOT_QUERIES
+from app.utils.query_plans import check_plans
+
+from tests.conftest import MIGRATIONS, make_config
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+def explain(name):
+    with db.engine.connect() as conn:
+        (result,) = check_plans(conn, {name: HOT_QUERIES[name]})
+        conn.rollback()
+    return result
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_sqlite_plan_uses_indexes(app, name):
+    result = explain(name)
+    assert result.plan
+    assert result.ok, "\n".join([f"{name} needs a scan or temp sort:"] + result.plan)
+
+
+def test_sqlite_check_flags_full_scans_and_temp_sorts(app):
+    # No index leads with event_type, so this reads the whole table and sorts it
+    with db.engine.connect() as conn:
+        (result,) = check_plans(conn, {"unindexed": lambda: select(ProgressEvent.id).order_by(ProgressEvent.event_type)})
+    assert any(line.startswith("SCAN ") for line in result.problems)
+    assert any("USE TEMP B-TREE" in line for line in result.problems)
+
+
+@pytest.fixture(scope="module")
+def postgres_app():
+    if not POSTGRES_URL:
+        pytest.skip("set TEST_POSTGRES_URL to a scratch Postgres database to run the Postgres plan checks")
+    pytest.importorskip("psycopg2")
+    app = create_app(make_config(":memory:", SQLALCHEMY_DATABASE_URI=POSTGRES_URL))
+    with app.app_context():
+        try:
+            flask_migrate.upgrade(directory=MIGRATIONS)
+        except Exception as e:  # pragma: no cover - depends on the environment
+            pytest.skip(f"Postgres at TEST_POSTGRES_URL is not usable: {e}")
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_postgres_plan_uses_indexes(postgres_app, name):
+    result = explain(name)
+    assert result.plan
+    assert result.ok, "\n".join([f"{name} needs a Seq Scan or Sort:"] + result.plan)
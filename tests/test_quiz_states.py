@@ -0,0 +1,70 @@
+from sqlalchemy import select
+
+from app import db
+from app.models.analytics import ModuleStats
+from app.models.quiz import QuizState
+from app.utils.dimensions import module_keys
+from app.utils.learner_sessions import learner_sessions
+
+from tests.conftest import new_learner, quiz_module
+
+
+def stored(learner_id, key_id):
+    return db.session.execute(
+        select(QuizState.solved).filter_by(learner_id=learner_id, module_key_id=key_id)
+    ).scalar()
+
+
+def test_parse_solved():
+    assert QuizState.parse_solved(None) == set()
+    assert QuizState.parse_solved(",") == set()
+    assert QuizState.parse_solved(",q1,q3,q1,") == {"q1", "q3"}
+
+
+def test_mark_solved_returns_the_set_only_when_it_changes(app):
+    learner_id, key_id = new_learner(), module_keys().id_for("course-1:intro")
+    assert QuizState.mark_solved(learner_id, key_id) is None
+    assert QuizState.mark_solved(learner_id, key_id, "q1") == {"q1"}
+    assert QuizState.mark_solved(learner_id, key_id, "q1") is None
+    assert QuizState.mark_solved(learner_id, key_id, "q2", "q2") == {"q1", "q2"}
+    assert QuizState.mark_solved(learner_id, key_id, "q1", "q2") is None
+    assert stored(learner_id, key_id) == ",q1,q2,"
+
+    # A partial overlap appends the whole chunk; the duplicate is harmless
+    assert QuizState.mark_solved(learner_id, key_id, "q2", "q3") == {"q1", "q2", "q3"}
+    assert QuizState.solved_ids(learner_id, key_id) == {"q1", "q2", "q3"}
+
+
+def test_membership_is_exact_and_escapes_like_wildcards(app):
+    learner_id, key_id = new_learner(), module_keys().id_for("course-1:intro")
+    QuizState.mark_solved(learner_id, key_id, "q_1", "q10")
+    assert QuizState.mark_solved(learner_id, key_id, "qx1") == {"q_1", "q10", "qx1"}
+    assert QuizState.mark_solved(learner_id, key_id, "q1") == {"q_1", "q10", "qx1", "q1"}
+    assert QuizState.mark_solved(learner_id, key_id, "q%") == {"q_1", "q10", "qx1", "q1", "q%"}
+
+
+def test_quiz_submits_track_solved_questions_and_count_a_pass_once(client):
+    course_slug, module_slug, questions = quiz_module()
+    token = learner_sessions().new_key_token()
+    url = f"/api/quiz/{course_slug}/{module_slug}"
+
+    first, rest = questions[0], questions[1:]
+    wrong = next(key for key, _ in first.options if key != first.correct)
+    assert not client.post(url, json={"session_id": token, "question_id": first.id, "selected": wrong}).get_json()["data"]["correct"]
+    for _ in range(2):
+        client.post(url, json={"session_id": token, "question_id": first.id, "selected": first.correct})
+    quiz = client.get(url, query_string={"session_id": token}).get_json()
+    assert (quiz["completed"], quiz["remaining"]) == (False, len(rest))
+    assert quiz["data"]["id"] == rest[0].id
+
+    response = client.post(f"{url}/batch", json={"session_id": token, "answers": [
+        {"question_id": q.id, "selected": q.correct} for q in rest
+    ]})
+    assert response.get_json()["data"]["completed"] is True
+    client.post(url, json={"session_id": token, "question_id": first.id, "selected": first.correct})
+
+    learner_id = learner_sessions().id_for(token)
+    key_id = module_keys().id_for(f"{course_slug}:{module_slug}")
+    assert QuizState.solved_ids(learner_id, key_id) == {q.id for q in questions}
+    stats = db.session.get(ModuleStats, key_id)
+    assert (stats.quiz_attempts, stats.quiz_correct, stats.quiz_passed) == (len(questions) + 3, len(questions) + 2, 1)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+from app import db
+from app.models.analytics import EventDailyCount, JobWatermark
+from app.models.progress import ProgressEvent
+from app.utils import rollups
+from app.utils.dimensions import module_keys
+
+from tests.conftest import new_learner
+
+NOW = datetime(2026, 3, 10, 12, 0)
+
+
+def add_events(*events):
+    """Insert (created_at, module key or None, event_type) events and commit."""
+    learner_id = new_learner()
+    db.session.execute(insert(ProgressEvent), [
+        {"learner_id": learner_id, "created_at": created_at, "event_type": event_type,
+         "module_key_id": module_keys().id_for(key) if key else None}
+        for created_at, key, event_type in events
+    ])
+    db.session.commit()
+
+
+def daily_counts():
+    with db.session.begin():
+        return {
+            (row.day, row.module_key_id, row.event_type): row.count
+            for row in db.session.execute(select(EventDailyCount)).scalars()
+        }
+
+
+def event_times():
+    with db.session.begin():
+        return sorted(db.session.execute(select(ProgressEvent.created_at)).scalars())
+
+
+def test_roll_up_counts_settled_events_incrementally(app):
+    intro = module_keys().id_for("course-1:intro")
+    db.session.commit()
+    add_events(
+        (NOW - timedelta(days=2, hours=1), "course-1:intro", "view"),
+        (NOW - timedelta(days=2), "course-1:intro", "view"),
+        (NOW - timedelta(days=2), None, "page"),
+        (NOW - timedelta(days=1), "course-1:intro", "complete"),
+        (NOW - timedelta(seconds=30), "course-1:intro", "view"),  # not settled yet
+    )
+
+    assert rollups.roll_up_events(batch_size=2, settle_seconds=300, now=NOW) == 4
+    day2, day1 = (NOW - timedelta(days=2)).date(), (NOW - timedelta(days=1)).date()
+    assert daily_counts() == {(day2, intro, "view"): 2, (day2, None, "page"): 1, (day1, intro, "complete"): 1}
+    with db.session.begin():
+        assert rollups.rolled_up_until() == NOW - timedelta(days=1)
+
+    # Nothing new: a second run counts nothing
+    assert rollups.roll_up_events(settle_seconds=300, now=NOW) == 0
+
+    # Later runs add to the existing rows, including the one with a NULL module key
+    add_events((NOW + timedelta(minutes=1), None, "page"))
+    assert rollups.roll_up_events(settle_seconds=300, now=NOW + timedelta(hours=1)) == 2
+    counts = daily_counts()
+    assert counts[(NOW.date(), intro, "view")] == 1
+    assert counts[(NOW.date(), None, "page")] == 1
+    assert sum(counts.values()) == 6
+
+
+def test_watermark_row_is_created_once(app):
+    with db.session.begin():
+        first = rollups._watermark(db.session, "job")
+        first.position_at, first.position_id = NOW, 7
+    with db.session.begin():
+        again = rollups._watermark(db.session, "job")
+        assert (again.position_at, again.position_id) == (NOW, 7)
+    with db.session.begin():
+        assert db.session.execute(select(func.count()).select_from(JobWatermark)).scalar() == 1
+
+
+def test_prune_waits_for_the_first_rollup(app):
+    add_events((NOW - timedelta(days=30), None, "page"))
+    assert rollups.prune_events(7, now=NOW) == 0
+    assert len(event_times()) == 1
+
+
+def test_prune_never_deletes_past_the_watermark(app):
+    old = [NOW - timedelta(days=d) for d in (40, 35, 30)]
+    add_events(*((t, None, "page") for t in old))
+    # The rollup has only counted the first two events
+    rollups.roll_up_events(settle_seconds=0, now=old[1] + timedelta(seconds=1))
+
+    before = daily_counts()
+    assert rollups.prune_events(7, batch_size=1, pause=0, now=NOW) == 1
+    # The event at the watermark's own timestamp is kept too
+    assert event_times() == old[1:]
+    assert daily_counts() == before
+
+    rollups.roll_up_events(settle_seconds=0, now=NOW)
+    assert rollups.prune_events(7, batch_size=1, pause=0, now=NOW) == 1
+    assert event_times() == old[2:]
+    assert daily_counts() == {(t.date(), None, "page"): 1 for t in old}
@@ -0,0 +1,109 @@
+from collections import Counter
+from types import SimpleNamespace
+
+from app.content import loader
+from app.content.search import SearchIndex, _course_docs, strip_html, tokenize
+
+
+def make_course(slug, *modules, quizzes=None):
+    return {
+        "slug": slug,
+        "meta": SimpleNamespace(title=slug.title()),
+        "modules": [
+            SimpleNamespace(slug=m_slug, title=title, summary=summary,
+                            sections=[SimpleNamespace(title=s_title, content=body) for s_title, body in sections])
+            for m_slug, title, summary, sections in modules
+        ],
+        "quizzes": quizzes or {},
+    }
+
+
+def index_of(*courses):
+    index = SearchIndex()
+    index._dirty = set()
+    for course in courses:
+        index._add_course(course["slug"], _course_docs(course))
+    return index
+
+
+def ranked(index, query, limit=20):
+    return [(hit["course_slug"], hit["module_slug"], hit["kind"], hit["score"]) for hit in index.search(query, limit)]
+
+
+ALPHA = make_course(
+    "alpha",
+    ("tokens", "Tokens", "How text becomes tokens", [("Intro", "<p>Models read <b>tokens</b>, not words.</p>")]),
+    ("sampling", "Sampling", "Temperature and top-p", [("Temperature", "<p>Higher temperature flattens the distribution.</p>")]),
+)
+BETA = make_course(
+    "beta",
+    ("prompts", "Prompts", "Writing prompts", [("Examples", "<p>Show the model a few examples of tokens in context.</p>")]),
+    quizzes={"prompts": [SimpleNamespace(prompt="Which prompt style uses examples?")]},
+)
+
+
+def test_tokenize_drops_stopwords_and_folds_plurals():
+    assert tokenize("The prompts are in the Class") == ["prompt", "class"]
+    assert strip_html("<script>x()</script><p>a &amp; b</p>") == "a & b"
+
+
+def test_title_matches_rank_above_body_matches():
+    hits = ranked(index_of(ALPHA, BETA), "tokens")
+    assert hits[0][:3] == ("alpha", "tokens", "module")
+    assert ("beta", "prompts", "section") in [h[:3] for h in hits]
+    assert [h[3] for h in hits] == sorted((h[3] for h in hits), reverse=True)
+
+
+def test_all_terms_matches_come_before_partial_matches():
+    hits = ranked(index_of(ALPHA, BETA), "examples tokens")
+    assert hits[0][:3] == ("beta", "prompts", "section")
+    assert len(hits) > 1
+
+
+def test_quiz_prompts_are_searchable():
+    hits = ranked(index_of(ALPHA, BETA), "style")
+    assert [h[:3] for h in hits] == [("beta", "prompts", "quiz")]
+
+
+def test_incremental_reindex_matches_a_fresh_index():
+    edited = make_course(
+        "alpha",
+        ("tokens", "Tokens", "How text becomes tokens and tokens again",
+         [("Intro", "<p>Tokens, tokens, tokens.</p>"), ("More", "<p>A much longer section about temperature.</p>")]),
+    )
+    index = index_of(ALPHA, BETA)
+    index.search("tokens")  # build impact lists against the old lengths
+    index._remove_course("alpha")
+    index._add_course("alpha", _course_docs(edited))
+
+    fresh = index_of(edited, BETA)
+    for query in ("tokens", "temperature", "examples tokens", "prompt"):
+        assert ranked(index, query) == ranked(fresh, query)
+    assert index.stats() == fresh.stats()
+
+
+def test_removing_a_course_drops_its_documents_and_terms():
+    index = index_of(ALPHA, BETA)
+    index._remove_course("alpha")
+    assert ranked(index, "temperature") == []
+    assert index.stats() == index_of(BETA).stats()
+    assert index._total_length == sum(sum(tf.values()) for _, tf in _course_docs(BETA))
+
+
+def test_invalidate_reindexes_only_the_changed_course(app, monkeypatch):
+    index = SearchIndex()
+    index.search("model")
+    slug = loader.discover_courses()[0]["slug"]
+    before = {s: list(ids) for s, ids in index._course_docs.items()}
+
+    read = []
+    real_read = loader.read_course
+    monkeypatch.setattr(loader, "read_course", lambda s: read.append(s) or real_read(s))
+    index.invalidate({slug})
+    results = ranked(index, "model", limit=1000)
+
+    assert read == [slug]
+    assert index._course_docs[slug] != before[slug]
+    assert all(index._course_docs[s] == ids for s, ids in before.items() if s != slug)
+    # Same scores as a fresh build; only the order among equal scores may differ
+    assert Counter(results) == Counter(ranked(SearchIndex(), "model", limit=1000))